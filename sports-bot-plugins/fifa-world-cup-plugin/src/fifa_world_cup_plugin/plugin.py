@@ -1,16 +1,20 @@
 from datetime import datetime
+import asyncio
 import os
-from typing import Dict, Sequence, Optional, Type
+from typing import Dict, Hashable, List, Sequence, Optional, Type
 import re
 import logging
 from telegram import BotCommand
 from telegram.ext import CommandHandler, BaseHandler
-from sports_bot_telegram_plugin import SportsBotPlugin
+from sports_bot_telegram_plugin import SportsBotPlugin, ScoreboardPoller, CacheBackend, metrics
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from sports_bot_telegram_plugin.types.RequestContext import RequestContext
 from .services.espn.live_score_service import LiveScoreService as ESPNLiveScoreService
 from .services.espn.team_service import TeamService as ESPNTeamService
 from .services.football_api.live_score_service import LiveScoreService as FootballAPILiveScoreService
 from .services.football_api.team_service import TeamService as FootballAPITeamService
+from .util.common import upstream_single_flight, set_api_cache
+from .util.football_api.quota import quota as football_api_quota
 
 class FifaWorldCupPlugin(SportsBotPlugin):
   def __init__(self):
@@ -23,14 +27,41 @@ class FifaWorldCupPlugin(SportsBotPlugin):
 
     fifa_api = os.getenv('FIFA_API', 'ESPN')
 
+    self.quota = None
     if fifa_api == 'ESPN':
-        self.live_score_service = ESPNLiveScoreService()
-        self.team_service = ESPNTeamService()
+        self.live_score_service = ESPNLiveScoreService(self.get_http_client)
+        self.team_service = ESPNTeamService(self.get_http_client)
     else:
-       self.live_score_service = FootballAPILiveScoreService()
-       self.team_service = FootballAPITeamService()
+       self.live_score_service = FootballAPILiveScoreService(self.get_http_client)
+       self.team_service = FootballAPITeamService(self.get_http_client)
+       # Football-API is metered, so track its budget
+       self.quota = football_api_quota
+       self.quota.register_gauges(metrics)
 
-  async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> MatchScores | None:
+    self.scoreboard_poller = None
+    if os.getenv('FIFA_SCOREBOARD_POLLER', '').lower() in ('1', 'true', 'yes'):
+        self.scoreboard_poller = ScoreboardPoller(
+            "FIFA",
+            self.live_score_service.get_snapshot,
+            live_interval=float(os.getenv('FIFA_POLL_LIVE_INTERVAL', '15')),
+            idle_interval=float(os.getenv('FIFA_POLL_IDLE_INTERVAL', '300')),
+        )
+
+  def set_cache_backend(self, cache_backend: CacheBackend) -> None:
+      super().set_cache_backend(cache_backend)
+      set_api_cache(cache_backend)
+
+  async def start(self) -> None:
+      """Start the scoreboard poller, if enabled."""
+      if self.scoreboard_poller:
+          self.scoreboard_poller.start()
+
+  async def shutdown(self) -> None:
+      if self.scoreboard_poller:
+          await self.scoreboard_poller.stop()
+      await super().shutdown()
+
+  async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None, request_context: Optional[RequestContext] = None) -> MatchScores | None:
       """
       Get live scores for a specific FIFA World Cup team.
       
@@ -38,11 +69,72 @@ class FifaWorldCupPlugin(SportsBotPlugin):
           team: Team name or identifier
           game_date: Optional date to get scores for. If None, gets current/most recent game.
           extra_params: Optional plugin-specific parameters (currently unused).
+          request_context: Optional context carrying the team id, if the bot already resolved ``team``.
           
       Returns:
           MatchScores object containing game scores and details, or None if no match is found
       """
-      return await self.live_score_service.get_scores(team, extra_params=extra_params)
+      team_id = request_context.team_id if request_context else None
+
+      # Matches in progress are served from the poller's snapshot while it's fresh
+      if self.scoreboard_poller and not (extra_params and 'next' in extra_params):
+          if team_id is None:
+              team_id = await self.live_score_service.fifa_utils.find_team_id(team)
+          match_scores = self.scoreboard_poller.get(team_id)
+          if match_scores:
+              return match_scores
+
+      return await self.live_score_service.get_scores(team, extra_params=extra_params, team_id=team_id)
+
+  async def get_live_scores_batch(self, teams: Optional[List[str]], game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> List[MatchScores]:
+      """
+      Get scores for several FIFA World Cup teams, or every current match, from one scoreboard fetch.
+
+      Args:
+          teams: Team names or identifiers, or None for every current match
+          game_date: Optional date to get scores for (currently unused).
+          extra_params: Optional plugin-specific parameters. With ``next``, each
+              team's next match is looked up individually.
+
+      Returns:
+          One MatchScores per match. Requested teams without a current match
+          get their previous match instead.
+      """
+      if extra_params and 'next' in extra_params:
+          return await super().get_live_scores_batch(teams, game_date, extra_params)
+
+      snapshot, _ = await self.live_score_service.get_snapshot()
+      if teams is None:
+          matches = list(snapshot.values())
+      else:
+          fifa_utils = self.live_score_service.fifa_utils
+          team_ids = await asyncio.gather(*(fifa_utils.find_team_id(team) for team in teams))
+          matches = [snapshot[team_id] for team_id in team_ids if team_id in snapshot]
+
+          missing = [(team, team_id) for team, team_id in zip(teams, team_ids) if team_id is not None and team_id not in snapshot]
+          previous_matches = await asyncio.gather(
+              *(self.live_score_service.get_scores(team, team_id=team_id) for team, team_id in missing),
+              return_exceptions=True,
+          )
+          matches.extend(match for match in previous_matches if isinstance(match, MatchScores))
+
+      results = []
+      seen = set()
+      for match in matches:
+          matchup = (match.home_team, match.away_team)
+          if matchup not in seen:
+              seen.add(matchup)
+              results.append(match)
+      return results
+
+  async def get_team_aliases(self) -> Dict[str, Hashable]:
+      """
+      Get every World Cup team name and code mapped to its team id.
+
+      Returns:
+          Dict mapping team names and codes to team ids
+      """
+      return await self.live_score_service.fifa_utils.get_team_aliases()
 
 
   async def is_team_supported(self, team: str) -> bool:
@@ -58,6 +150,35 @@ class FifaWorldCupPlugin(SportsBotPlugin):
       return await self.team_service.is_team_supported(team)
 
 
+  def get_single_flight_stats(self) -> Dict[str, int]:
+      """
+      Get stats for upstream request deduplication.
+
+      Returns:
+          Dict with the number of upstream calls requested, actually executed,
+          and deduplicated onto a request already in flight
+      """
+      return upstream_single_flight.stats()
+
+  def get_poller_stats(self) -> Dict[str, object] | None:
+      """
+      Get scoreboard poller stats (snapshot age, refreshes, hits and misses).
+
+      Returns:
+          Dict of stats, or None if the poller is disabled
+      """
+      return self.scoreboard_poller.stats() if self.scoreboard_poller else None
+
+  def get_quota_stats(self) -> Dict[str, object] | None:
+      """
+      Get Football-API budget stats (quota mode, requests left today and this minute).
+
+      Returns:
+          Dict of stats, or None when using ESPN, which isn't metered
+      """
+      return self.quota.stats() if self.quota else None
+
+
 def register_plugin() -> Type[SportsBotPlugin]:
     """Register the FIFA World Cup plugin."""
     return FifaWorldCupPlugin
\ No newline at end of file
@@ -1,25 +1,28 @@
+from typing import Dict, Tuple
 from ...util.espn.fifa_utils import FifaUtils
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
 from ...util.common import timestamp_to_eastern
 
 class LiveScoreService():
-  def __init__(self):
-      self.fifa_utils = FifaUtils()
+  def __init__(self, get_http_client):
+      self.fifa_utils = FifaUtils(get_http_client)
 
-  async def get_scores(self, team, extra_params=None) -> MatchScores | None:
+  async def get_scores(self, team, extra_params=None, team_id=None) -> MatchScores | None:
       """
       Get live scores for a specific FIFA World Cup team
       
       Args:
           team: Team name or identifier
           extra_params: Additional parameters for the API call (optional)
+          team_id: Optional team id, if already resolved
           
       Returns:
           MatchScores object containing game scores and details
       """
 
-      # Find team_id
-      team_id = await self.fifa_utils.find_team_id(team)
+      # Find team_id, unless the caller already resolved it
+      if team_id is None:
+        team_id = await self.fifa_utils.find_team_id(team)
 
       if extra_params and 'next' in extra_params:
         match = await self.fifa_utils.get_next_match_by_team(team_id)
@@ -34,7 +37,31 @@ class LiveScoreService():
 
       if not match:
          return None
-         
+
+      return self._to_match_scores(match)
+
+  async def get_snapshot(self) -> Tuple[Dict[str, MatchScores], bool]:
+      """
+      Build a per-team snapshot of the current scoreboard.
+
+      Returns:
+          Dict mapping each playing team's id to its match's scores, and
+          whether any match is in progress
+      """
+      scoreboard = await self.fifa_utils.get_live_scores()
+
+      snapshot = {}
+      has_live_games = False
+      for event in scoreboard.get('events', []):
+        for competition in event.get('competitions', []):
+          match_scores = self._to_match_scores(competition)
+          for competitor in competition.get('competitors', []):
+            snapshot[competitor.get('id')] = match_scores
+          has_live_games = has_live_games or competition.get('status', {}).get('type', {}).get('state') == 'in'
+
+      return snapshot, has_live_games
+
+  def _to_match_scores(self, match) -> MatchScores:
       home_team = match.get('competitors')[0]
       away_team = match.get('competitors')[1]
 
@@ -62,5 +89,3 @@ class LiveScoreService():
         home_team_logo_url=home_team.get('team').get('logo'),
         away_team_logo_url=away_team.get('team').get('logo'),
       )
-
-  
\ No newline at end of file
@@ -1,8 +1,8 @@
 from ...util.espn.fifa_utils import FifaUtils
 
 class TeamService():
-    def __init__(self):
-        self.fifa_utils = FifaUtils()
+    def __init__(self, get_http_client):
+        self.fifa_utils = FifaUtils(get_http_client)
 
     async def is_team_supported(self, team: str) -> bool:
         """
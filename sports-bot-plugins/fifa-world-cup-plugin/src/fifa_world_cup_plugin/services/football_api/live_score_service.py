@@ -1,24 +1,28 @@
+import asyncio
+from typing import Dict, Tuple
 from ...util.football_api.fifa_utils import FifaUtils
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
 from ...util.common import timestamp_to_eastern
 
 class LiveScoreService():
-  def __init__(self):
-      self.fifa_utils = FifaUtils()
+  def __init__(self, get_http_client):
+      self.fifa_utils = FifaUtils(get_http_client)
 
-  async def get_scores(self, team, extra_params=None) -> MatchScores | None:
+  async def get_scores(self, team, extra_params=None, team_id=None) -> MatchScores | None:
       """
       Get live scores for a specific FIFA World Cup team
       
       Args:
           team: Team name or identifier
+          team_id: Optional team id, if already resolved
           
       Returns:
           MatchScores object containing game scores and details
       """
 
-      # Find team_id
-      team_id = await self.fifa_utils.find_team_id(team)
+      # Find team_id, unless the caller already resolved it
+      if team_id is None:
+        team_id = await self.fifa_utils.find_team_id(team)
 
       # Check if team is currently playing
       live_scores = await self.fifa_utils.get_live_scores()
@@ -30,6 +34,35 @@ class LiveScoreService():
          if not match:
             return
 
+      return await self._to_match_scores(match)
+
+  async def get_snapshot(self) -> Tuple[Dict[int, MatchScores], bool]:
+      """
+      Build a per-team snapshot of the fixtures currently in progress.
+
+      Returns:
+          Dict mapping each playing team's id to its fixture's scores, and
+          whether any fixture is in progress
+      """
+      live_scores = await self.fifa_utils.get_live_scores()
+      fixtures = live_scores.get('response', [])
+      all_match_scores = await asyncio.gather(*(self._to_match_scores(fixture) for fixture in fixtures))
+
+      snapshot = {}
+      for fixture, match_scores in zip(fixtures, all_match_scores):
+        teams = fixture.get('teams', {})
+        snapshot[teams.get('home', {}).get('id')] = match_scores
+        snapshot[teams.get('away', {}).get('id')] = match_scores
+
+      # The fixtures endpoint is queried for in-progress statuses only
+      return snapshot, len(fixtures) > 0
+
+  async def _to_match_scores(self, match) -> MatchScores:
+      home_team_record, away_team_record = await asyncio.gather(
+        self.fifa_utils.get_team_standings(match.get('teams', {}).get('home', {}).get('id')),
+        self.fifa_utils.get_team_standings(match.get('teams', {}).get('away', {}).get('id')),
+      )
+
       return MatchScores(
         home_team=match.get('teams', {}).get('home', {}).get('name'),
         away_team=match.get('teams', {}).get('away', {}).get('name'),
@@ -38,8 +71,8 @@ class LiveScoreService():
         game_curr_time=self.fifa_utils.get_match_time(match),
         game_status=self.fifa_utils.get_match_status(match),
         game_start_time=timestamp_to_eastern(match.get('fixture', {}).get('timestamp')),
-        home_team_record=await self.fifa_utils.get_team_standings(match.get('teams', {}).get('home', {}).get('id')),
-        away_team_record=await self.fifa_utils.get_team_standings(match.get('teams', {}).get('away', {}).get('id')),
+        home_team_record=home_team_record,
+        away_team_record=away_team_record,
         home_team_logo_url=match.get('teams', {}).get('home', {}).get('logo'),
         away_team_logo_url=match.get('teams', {}).get('away', {}).get('logo')
       )
@@ -2,20 +2,45 @@ import difflib
 import re
 from functools import wraps
 from datetime import datetime
+from typing import Optional
 from zoneinfo import ZoneInfo
+from sports_bot_telegram_plugin import SingleFlight, CacheBackend, DiskCacheBackend, Resilience
 
+# Shared by every FifaApi instance so concurrent identical upstream requests
+# (e.g. many chats asking for the same live scores) cost one call
+upstream_single_flight = SingleFlight()
 
-def cached(key, expire=None):
-  """Decorator to cache async function results by key."""
+# Circuit breaker per endpoint, hedging and retries for ESPN calls
+upstream_resilience = Resilience.from_env()
+
+# Cache for slow-changing responses (teams, schedules, standings). Defaults to a
+# local diskcache directory; the bot replaces it with its configured backend
+_api_cache: Optional[CacheBackend] = None
+
+def get_api_cache() -> CacheBackend:
+  global _api_cache
+  if _api_cache is None:
+    _api_cache = DiskCacheBackend('bot-api-cache')
+  return _api_cache
+
+def set_api_cache(cache_backend: CacheBackend):
+  global _api_cache
+  _api_cache = cache_backend
+
+def cached(key, expire=None, stale_while_revalidate=30):
+  """
+  Decorator to cache async FifaApi method results by key and arguments in the API cache.
+
+  Expired results are served for ``stale_while_revalidate`` more seconds while
+  they're refreshed in the background, and kept as a fallback for when
+  upstream fails.
+  """
   def decorator(func):
     @wraps(func)
     async def wrapper(self, *args, **kwargs):
-      if key in self.cache:
-        return self.cache[key]
-
-      result = await func(self, *args, **kwargs)
-      self.cache.set(key, result, expire=expire)
-      return result
+      arguments = [str(value) for value in (*args, *(kwargs[name] for name in sorted(kwargs))) if value is not None]
+      cache_key = ':'.join([f"fifa:{self.base_url}:{key}", *arguments])
+      return await get_api_cache().get_or_revalidate(cache_key, lambda: func(self, *args, **kwargs), expire, stale_while_revalidate=stale_while_revalidate)
     return wrapper
   return decorator
 
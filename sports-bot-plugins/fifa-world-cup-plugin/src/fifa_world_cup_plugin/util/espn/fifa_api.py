@@ -1,12 +1,11 @@
 import os
-import httpx
-from diskcache import Cache
-from ..common import cached
+from sports_bot_telegram_plugin import span
+from ..common import cached, upstream_single_flight, upstream_resilience
 
 class FifaApi():
-    def __init__(self):
-        self.base_url = 'https://site.api.espn.com/apis/site/v2/sports/soccer/fifa.world'
-        self.cache = Cache('bot-api-cache')
+    def __init__(self, get_http_client):
+        self.get_http_client = get_http_client
+        self.base_url = os.getenv('FIFA_ESPN_BASE_URL', 'https://site.api.espn.com/apis/site/v2/sports/soccer/fifa.world').rstrip('/')
     
     async def _call(self, endpoint, params=None):
         headers = {
@@ -20,26 +19,34 @@ class FifaApi():
         if params:
             default_params.update(params)
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/{endpoint}", headers=headers, params=default_params)
+        key = (self.base_url, endpoint, tuple(sorted(default_params.items())))
+        return await upstream_single_flight.do(key, lambda: upstream_resilience.call(endpoint.split('/')[0], lambda: self._fetch(endpoint, headers, default_params)))
 
-            response.raise_for_status()
+    async def _fetch(self, endpoint, headers, params):
+        with span('fifa_api.fetch', endpoint=endpoint.split('/')[0]):
+            response = await self.get_http_client().get(f"{self.base_url}/{endpoint}", headers=headers, params=params, timeout=10.0)
 
-            return response.json()
+        response.raise_for_status()
+
+        return response.json()
         
     @cached('teams')
     async def get_teams(self):
         return await self._call('teams', params={'limit': '50'})
         
+    # Live scores, so only briefly served stale
+    @cached('scoreboard', 10, stale_while_revalidate=10)
     async def get_scoreboard(self, date=None):
         params = {}
         if date:
             params['dates'] = date
         return await self._call('scoreboard', params=params)
     
+    @cached('standings', 3600)
     async def get_standings(self):
         return await self._call('standings')
     
+    @cached('schedule', 300)
     async def get_schedule(self, team_id):
         return await self._call(f'teams/{team_id}/schedule')
 
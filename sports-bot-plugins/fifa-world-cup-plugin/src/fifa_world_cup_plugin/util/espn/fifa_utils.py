@@ -6,8 +6,8 @@ from ..common import find_team_id_with_match_fallback
 from ..common import timestamp_to_eastern as format_timestamp_to_eastern
 
 class FifaUtils():
-    def __init__(self):
-        self.fifa_api = FifaApi()
+    def __init__(self, get_http_client):
+        self.fifa_api = FifaApi(get_http_client)
 
     async def find_team_id(self, team_name):
         teams = await self.fifa_api.get_teams()
@@ -24,6 +24,20 @@ class FifaUtils():
             code_key='abbreviation',
         )
     
+    async def get_team_aliases(self):
+        teams = await self.fifa_api.get_teams()
+        response = teams.get('sports', [])
+        if len(response) == 0:
+            return {}
+
+        aliases = {}
+        for entry in response[0].get('leagues', [])[0].get("teams", []):
+            team = entry.get('team', {})
+            for key in ('displayName', 'shortDisplayName', 'abbreviation'):
+                if team.get(key):
+                    aliases[team[key]] = team.get('id')
+        return aliases
+
     def get_match_by_team(self, scoreboard, team_id):
         if len(scoreboard) == 0:
             return None
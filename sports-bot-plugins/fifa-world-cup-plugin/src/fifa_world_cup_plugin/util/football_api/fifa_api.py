@@ -1,14 +1,22 @@
 import os
-import httpx
-from diskcache import Cache
-from ..common import cached
+from sports_bot_telegram_plugin import Resilience, span
+from ..common import get_api_cache, upstream_single_flight
+from .quota import quota, QuotaExhaustedError, CACHED_ONLY
+
+# Base TTLs, stretched by the quota manager as the budget drains (None keeps a response forever)
+LIVE_FIXTURES_TTL = 15
+FINISHED_FIXTURES_TTL = 300
+STANDINGS_TTL = 21600
+
+# Every attempt is metered, so requests aren't hedged
+resilience = Resilience.from_env(hedge_after=None)
 
 class FifaApi():
-    def __init__(self):
-        self.base_url = 'https://v3.football.api-sports.io'
+    def __init__(self, get_http_client):
+        self.get_http_client = get_http_client
+        self.base_url = os.getenv('FOOTBALL_API_BASE_URL', 'https://v3.football.api-sports.io').rstrip('/')
         self.league = '1'
         self.season = '2026'
-        self.cache = Cache('bot-api-cache')
     
     async def _call(self, endpoint, params=None):
         headers = {
@@ -23,24 +31,66 @@ class FifaApi():
         if params:
             default_params.update(params)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/{endpoint}", headers=headers, params=default_params)
-            return response.json()
+        key = (self.base_url, endpoint, tuple(sorted(default_params.items())))
+        return await upstream_single_flight.do(key, lambda: resilience.call(endpoint.split('/')[0], lambda: self._fetch(endpoint, headers, default_params)))
+
+    async def _fetch(self, endpoint, headers, params):
+        quota.note_request()
+        with span('fifa_api.fetch', endpoint=endpoint.split('/')[0]):
+            response = await self.get_http_client().get(f"{self.base_url}/{endpoint}", headers=headers, params=params)
+        body = response.json()
+        quota.record_response(response.headers, response.status_code, body.get('errors') if isinstance(body, dict) else None)
+        return body
+
+    async def _budgeted_call(self, key, base_ttl, endpoint, params=None):
+        """
+        Call an endpoint through the API cache, for a TTL the quota manager
+        stretches as the budget drains. The last good response is kept so it
+        can be served, however old, when the budget runs out or upstream
+        fails.
+        """
+        cache = get_api_cache()
+        cache_key = f"fifa:{self.base_url}:{key}"
+        last_key = f"{cache_key}:last"
+
+        if quota.mode == CACHED_ONLY:
+            for candidate_key in (cache_key, last_key):
+                value = await cache.get(candidate_key)
+                if value is not None:
+                    quota.note_cached_only_serve()
+                    return value
+            if not quota.can_call():
+                raise QuotaExhaustedError(f"Football-API budget exhausted and {endpoint} isn't cached")
+
+        async def fetch():
+            try:
+                value = await self._call(endpoint, params)
+            except Exception:
+                last = await cache.get(last_key)
+                if last is None:
+                    raise
+                return last
+            if value.get('errors'):
+                last = await cache.get(last_key)
+                return last if last is not None else value
+            if base_ttl is not None:
+                await cache.set(last_key, value)
+            return value
+
+        # Error responses aren't cached, so the next call retries
+        return await cache.get_or_fetch(cache_key, fetch, lambda value: 0 if value.get('errors') else quota.ttl(base_ttl))
         
-    @cached('match_schedule')
     async def get_match_schedule(self):
-        return await self._call('fixtures')
+        return await self._budgeted_call('match_schedule', None, 'fixtures')
 
-    @cached('teams')
     async def get_teams(self):
-        return await self._call('teams')
+        return await self._budgeted_call('teams', None, 'teams')
     
     async def get_fixtures(self):
-        return await self._call('fixtures', {'status': '1H-HT-2H-ET-P-BT-LIVE'})
+        return await self._budgeted_call('live_fixtures', LIVE_FIXTURES_TTL, 'fixtures', {'status': '1H-HT-2H-ET-P-BT-LIVE'})
 
     async def get_finished_fixtures(self):
-        return await self._call('fixtures', {'status': 'FT'})
+        return await self._budgeted_call('finished_fixtures', FINISHED_FIXTURES_TTL, 'fixtures', {'status': 'FT'})
     
-    @cached('standings', 21600)
     async def get_standings(self):
-        return await self._call('standings')
\ No newline at end of file
+        return await self._budgeted_call('standings', STANDINGS_TTL, 'standings')
\ No newline at end of file
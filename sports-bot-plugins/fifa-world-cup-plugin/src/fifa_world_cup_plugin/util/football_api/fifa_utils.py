@@ -2,8 +2,8 @@ from .fifa_api import FifaApi
 from ..common import find_team_id_with_match_fallback
 
 class FifaUtils():
-    def __init__(self):
-        self.fifa_api = FifaApi()
+    def __init__(self, get_http_client):
+        self.fifa_api = FifaApi(get_http_client)
 
     async def find_team_id(self, team_name):
         teams = await self.fifa_api.get_teams()
@@ -14,6 +14,16 @@ class FifaUtils():
             extract_team=lambda entry: entry.get('team', {}),
         )
     
+    async def get_team_aliases(self):
+        teams = await self.fifa_api.get_teams()
+        aliases = {}
+        for entry in teams.get('response', []):
+            team = entry.get('team', {})
+            for key in ('name', 'code'):
+                if team.get(key):
+                    aliases[team[key]] = team.get('id')
+        return aliases
+
     async def get_live_scores(self):
         return await self.fifa_api.get_fixtures()
 
@@ -35,10 +45,14 @@ class FifaUtils():
         elapsed = match['fixture']['status']['elapsed']
         extra = match['fixture']['status']['extra']
 
+        # Not kicked off yet
+        if elapsed is None:
+            return ''
+
         if extra is not None:
             return f"{elapsed}+{extra}'"
         
-        return elapsed
+        return f"{elapsed}'"
     
     async def get_team_standings(self, team_id):
         standings = await self.fifa_api.get_standings()
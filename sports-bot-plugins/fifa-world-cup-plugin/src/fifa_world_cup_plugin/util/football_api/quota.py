@@ -0,0 +1,227 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+from sports_bot_telegram_plugin import Metrics
+
+logger = logging.getLogger(__name__)
+
+NORMAL = 'normal'
+CONSERVE = 'conserve'
+CACHED_ONLY = 'cached_only'
+MODES = (NORMAL, CONSERVE, CACHED_ONLY)
+
+# API-Football resets the per-minute budget within a minute of the last response
+MINUTE_WINDOW = 60
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when Football-API has no budget left and there is no cached response to serve instead."""
+
+
+class QuotaManager():
+    """
+    Tracks the Football-API request budget and decides how hard to lean on the cache.
+
+    API-Football reports the daily budget (reset at 00:00 UTC) in the
+    ``x-ratelimit-requests-limit``/``x-ratelimit-requests-remaining`` headers
+    and the per-minute budget in ``X-RateLimit-Limit``/``X-RateLimit-Remaining``.
+    Every request counts down the last reported values until its own response
+    arrives, so concurrent requests don't all see the same budget. Until a
+    response has been seen, the daily budget is counted down from
+    ``daily_limit``, if configured.
+
+    The budget is per API key, so replicas sharing a key see each other's use
+    through the headers.
+
+    Modes:
+    - ``normal``: responses are cached for their base TTL.
+    - ``conserve``: with less than ``conserve_fraction`` of the daily budget
+      left, TTLs grow in proportion to how little is left, up to
+      ``max_ttl_multiplier`` times the base TTL.
+    - ``cached_only``: with ``reserve`` requests or fewer left today, or none
+      left this minute, cached responses are served however old they are.
+      The reserve is spent only on responses that were never cached.
+    """
+
+    def __init__(self, daily_limit: Optional[int] = None, conserve_fraction: float = 0.25, reserve: int = 5, max_ttl_multiplier: float = 20.0, clock=time.time):
+        self.daily_limit = daily_limit
+        self.conserve_fraction = conserve_fraction
+        self.reserve = reserve
+        self.max_ttl_multiplier = max_ttl_multiplier
+        self._clock = clock
+
+        self._daily_remaining = daily_limit
+        self._day = self._today()
+        self._minute_limit = None
+        self._minute_remaining = None
+        self._minute_seen_at = 0.0
+        self.requests_today = 0
+        self.cached_only_serves = 0
+
+    def _today(self):
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc).date()
+
+    def _roll_over(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._daily_remaining = self.daily_limit
+            self.requests_today = 0
+        if self._minute_remaining is not None and self._clock() - self._minute_seen_at >= MINUTE_WINDOW:
+            self._minute_remaining = None
+
+    @property
+    def daily_remaining(self) -> Optional[int]:
+        """Requests left today, or None if the budget is unknown"""
+        self._roll_over()
+        return self._daily_remaining
+
+    @property
+    def minute_remaining(self) -> Optional[int]:
+        """Requests left this minute, or None if the budget is unknown"""
+        self._roll_over()
+        return self._minute_remaining
+
+    @property
+    def mode(self) -> str:
+        daily_remaining = self.daily_remaining
+        minute_remaining = self.minute_remaining
+
+        if minute_remaining is not None and minute_remaining <= 0:
+            return CACHED_ONLY
+        if daily_remaining is None:
+            return NORMAL
+        if daily_remaining <= self.reserve:
+            return CACHED_ONLY
+        if self.daily_limit and daily_remaining < self.daily_limit * self.conserve_fraction:
+            return CONSERVE
+        return NORMAL
+
+    def can_call(self) -> bool:
+        """Whether any budget is left for a request right now."""
+        daily_remaining = self.daily_remaining
+        minute_remaining = self.minute_remaining
+        return (daily_remaining is None or daily_remaining > 0) and (minute_remaining is None or minute_remaining > 0)
+
+    def ttl(self, base_ttl: Optional[float]) -> Optional[float]:
+        """
+        Scale a response's TTL to the remaining budget.
+
+        Args:
+            base_ttl: Seconds to cache the response for with a healthy budget,
+                or None to keep it forever
+
+        Returns:
+            ``base_ttl`` in normal mode, stretched by up to ``max_ttl_multiplier``
+            in conserve mode, and the longest TTL in cached-only mode
+        """
+        if base_ttl is None:
+            return None
+
+        mode = self.mode
+        if mode == NORMAL:
+            return base_ttl
+        if mode == CACHED_ONLY:
+            return base_ttl * self.max_ttl_multiplier
+
+        remaining_fraction = max(self._daily_remaining / self.daily_limit, 1e-6)
+        return base_ttl * min(self.max_ttl_multiplier, max(1.0, self.conserve_fraction / remaining_fraction))
+
+    def note_request(self) -> None:
+        """Count a request against the budget before it is sent."""
+        self._roll_over()
+        self.requests_today += 1
+        if self._daily_remaining is not None:
+            self._daily_remaining = max(0, self._daily_remaining - 1)
+        if self._minute_remaining is not None:
+            self._minute_remaining = max(0, self._minute_remaining - 1)
+
+    def note_cached_only_serve(self) -> None:
+        self.cached_only_serves += 1
+
+    def record_response(self, headers: Mapping[str, str], status_code: int = 200, errors=None) -> None:
+        """
+        Update the budget from a response.
+
+        Args:
+            headers: Response headers
+            status_code: Response status; 429 means the minute budget is spent
+            errors: The response body's ``errors`` field. API-Football answers
+                an exhausted budget with 200 and a ``requests`` or ``rateLimit`` error.
+        """
+        previous_mode = self.mode
+        headers = {name.lower(): value for name, value in headers.items()}
+
+        daily_limit = _parse_int(headers.get('x-ratelimit-requests-limit'))
+        daily_remaining = _parse_int(headers.get('x-ratelimit-requests-remaining'))
+        minute_limit = _parse_int(headers.get('x-ratelimit-limit'))
+        minute_remaining = _parse_int(headers.get('x-ratelimit-remaining'))
+
+        if daily_limit is not None:
+            self.daily_limit = daily_limit
+        if daily_remaining is not None:
+            self._daily_remaining = daily_remaining
+        if minute_limit is not None:
+            self._minute_limit = minute_limit
+        if minute_remaining is not None:
+            self._minute_remaining = minute_remaining
+            self._minute_seen_at = self._clock()
+
+        if isinstance(errors, dict):
+            if 'requests' in errors:
+                self._daily_remaining = 0
+            if 'rateLimit' in errors:
+                status_code = 429
+        if status_code == 429:
+            self._minute_remaining = 0
+            self._minute_seen_at = self._clock()
+
+        mode = self.mode
+        if mode != previous_mode:
+            logger.warning(f"Football-API quota mode {previous_mode} -> {mode} ({self._daily_remaining} requests left today, {self._minute_remaining} this minute)")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "mode": self.mode,
+            "daily_limit": self.daily_limit,
+            "daily_remaining": self.daily_remaining,
+            "minute_limit": self._minute_limit,
+            "minute_remaining": self.minute_remaining,
+            "requests_today": self.requests_today,
+            "cached_only_serves": self.cached_only_serves,
+        }
+
+    def register_gauges(self, metrics: Metrics) -> None:
+        """Export the remaining budget and current mode."""
+        metrics.register_gauge(
+            "sports_bot_football_api_quota_remaining",
+            "Football-API requests left, by window (unknown windows are omitted)",
+            lambda: [({"window": window}, remaining) for window, remaining in (("day", self.daily_remaining), ("minute", self.minute_remaining)) if remaining is not None],
+        )
+        metrics.register_gauge(
+            "sports_bot_football_api_quota_mode",
+            "1 for the current Football-API quota mode, 0 for the others",
+            lambda: [({"mode": mode}, int(mode == self.mode)) for mode in MODES],
+        )
+        metrics.register_gauge(
+            "sports_bot_football_api_requests_today",
+            "Football-API requests sent by this process since 00:00 UTC",
+            lambda: self.stats()["requests_today"],
+        )
+
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# One budget per API key, shared by every FifaApi instance
+quota = QuotaManager(
+    daily_limit=int(os.environ['FOOTBALL_API_DAILY_LIMIT']) if os.getenv('FOOTBALL_API_DAILY_LIMIT') else None,
+    conserve_fraction=float(os.getenv('FOOTBALL_API_CONSERVE_FRACTION', '0.25')),
+    reserve=int(os.getenv('FOOTBALL_API_QUOTA_RESERVE', '5')),
+)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# The plugin and the plugin interface, straight from the source tree
+sys.path.insert(0, os.path.join(PROJECT_DIR, "src"))
+sys.path.append(os.path.join(PROJECT_DIR, "..", "..", "sports-bot-telegram-plugin", "src"))
@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from fifa_world_cup_plugin.util.football_api.quota import CACHED_ONLY, CONSERVE, MINUTE_WINDOW, NORMAL, QuotaManager
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(datetime(2026, 6, 14, 12, 0, tzinfo=timezone.utc).timestamp())
+
+
+def daily_headers(limit, remaining):
+    return {"x-ratelimit-requests-limit": str(limit), "x-ratelimit-requests-remaining": str(remaining)}
+
+
+def test_mode_follows_daily_budget(clock):
+    quota = QuotaManager(daily_limit=100, conserve_fraction=0.25, reserve=5, max_ttl_multiplier=20, clock=clock)
+    assert quota.mode == NORMAL
+    assert quota.ttl(60) == 60
+
+    quota.record_response(daily_headers(100, 20))
+    assert quota.mode == CONSERVE
+    # 20% left of a 25% threshold stretches the TTL by 1.25
+    assert quota.ttl(60) == pytest.approx(75)
+
+    quota.record_response(daily_headers(100, 10))
+    assert quota.mode == CONSERVE
+    assert quota.ttl(60) == pytest.approx(150)
+
+    quota.record_response(daily_headers(100, 5))
+    assert quota.mode == CACHED_ONLY
+    assert quota.ttl(60) == 60 * 20
+    assert quota.ttl(None) is None
+    assert quota.can_call()
+
+    quota.record_response(daily_headers(100, 0))
+    assert not quota.can_call()
+
+
+def test_unknown_budget_is_normal(clock):
+    quota = QuotaManager(clock=clock)
+    assert quota.daily_remaining is None
+    assert quota.mode == NORMAL
+    quota.note_request()
+    assert quota.mode == NORMAL
+    assert quota.can_call()
+
+
+def test_requests_count_down_until_response(clock):
+    quota = QuotaManager(daily_limit=10, reserve=5, clock=clock)
+    for _ in range(4):
+        quota.note_request()
+    assert quota.daily_remaining == 6
+    assert quota.requests_today == 4
+    assert quota.mode == NORMAL
+
+    quota.note_request()
+    assert quota.mode == CACHED_ONLY
+
+
+def test_headers_are_case_insensitive_and_malformed_values_ignored(clock):
+    quota = QuotaManager(daily_limit=100, clock=clock)
+    quota.record_response({
+        "X-RateLimit-Requests-Limit": "7500",
+        "X-RateLimit-Requests-Remaining": "not a number",
+        "X-RateLimit-Limit": "300",
+        "X-RateLimit-Remaining": "299",
+    })
+    assert quota.daily_limit == 7500
+    assert quota.daily_remaining == 100
+    assert quota.minute_remaining == 299
+    assert quota.stats()["minute_limit"] == 300
+
+
+def test_minute_budget_spent_is_cached_only(clock):
+    quota = QuotaManager(clock=clock)
+    quota.record_response({"X-RateLimit-Limit": "10", "X-RateLimit-Remaining": "1"})
+    assert quota.mode == NORMAL
+
+    quota.note_request()
+    assert quota.minute_remaining == 0
+    assert quota.mode == CACHED_ONLY
+    assert not quota.can_call()
+
+
+def test_429_spends_minute_budget_until_window_passes(clock):
+    quota = QuotaManager(daily_limit=100, clock=clock)
+    quota.record_response({}, status_code=429)
+    assert quota.mode == CACHED_ONLY
+    assert not quota.can_call()
+
+    clock.now += MINUTE_WINDOW - 1
+    assert quota.mode == CACHED_ONLY
+
+    clock.now += 1
+    assert quota.minute_remaining is None
+    assert quota.mode == NORMAL
+    assert quota.can_call()
+
+
+def test_errors_body(clock):
+    quota = QuotaManager(daily_limit=100, clock=clock)
+    quota.record_response({}, errors={"rateLimit": "Too many requests"})
+    assert quota.minute_remaining == 0
+    assert quota.daily_remaining == 100
+
+    clock.now += MINUTE_WINDOW
+    quota.record_response({}, errors={"requests": "You have reached the request limit for the day"})
+    assert quota.daily_remaining == 0
+    assert quota.minute_remaining is None
+    assert quota.mode == CACHED_ONLY
+
+    # API-Football sends an empty list when there are no errors
+    quota = QuotaManager(daily_limit=100, clock=clock)
+    quota.record_response({}, errors=[])
+    assert quota.mode == NORMAL
+
+
+def test_daily_budget_resets_at_midnight_utc(clock):
+    quota = QuotaManager(daily_limit=100, clock=clock)
+    quota.note_request()
+    quota.record_response(daily_headers(100, 0))
+    assert quota.mode == CACHED_ONLY
+    assert quota.requests_today == 1
+
+    clock.now = datetime(2026, 6, 14, 23, 59, 59, tzinfo=timezone.utc).timestamp()
+    assert quota.daily_remaining == 0
+
+    clock.now = datetime(2026, 6, 15, 0, 0, tzinfo=timezone.utc).timestamp()
+    assert quota.daily_remaining == 100
+    assert quota.requests_today == 0
+    assert quota.mode == NORMAL
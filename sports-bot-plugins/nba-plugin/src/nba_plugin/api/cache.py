@@ -0,0 +1,131 @@
+import time
+from datetime import date, datetime
+from functools import wraps
+from sports_bot_telegram_plugin import CacheBackend, MemoryCacheBackend, Resilience, span
+
+class EndpointStats:
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.stale_errors = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetch_count = 0
+        self.fetch_seconds_total = 0.0
+        self.fetch_seconds_max = 0.0
+
+    def record_fetch(self, seconds):
+        self.fetch_count += 1
+        self.fetch_seconds_total += seconds
+        self.fetch_seconds_max = max(self.fetch_seconds_max, seconds)
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "stale_errors": self.stale_errors,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "fetches": self.fetch_count,
+            "fetch_avg_ms": round(self.fetch_seconds_total / self.fetch_count * 1000, 1) if self.fetch_count else 0.0,
+            "fetch_max_ms": round(self.fetch_seconds_max * 1000, 1),
+        }
+
+
+class EndpointCache:
+    """
+    Response cache for the NBA stats endpoints.
+
+    Each endpoint has its own TTL, which may depend on the response (e.g. a
+    scoreboard expires faster while games are live). Responses live in a
+    ``CacheBackend``: in memory by default, or the bot's shared backend once
+    ``set_backend`` is called, so replicas reuse each other's responses.
+    Concurrent requests for the same uncached key share a single upstream fetch
+    through the backend's ``SingleFlight``, and across replicas through its lock.
+    ``None`` responses are treated as failures and never cached.
+
+    Expired responses are served stale while they are refreshed in the
+    background, and kept as a fallback for when upstream fails (see
+    ``CacheBackend.get_or_revalidate``). Upstream calls go through
+    ``resilience``, which keeps a circuit breaker per endpoint.
+    """
+
+    def __init__(self, max_entries=2048, resilience=None):
+        self.backend: CacheBackend = MemoryCacheBackend(max_entries=max_entries)
+        # A hedge can't cancel the blocking nba_api call it races, so it would
+        # only hold another executor thread while stats.nba.com is slow
+        self.resilience = resilience or Resilience.from_env(hedge_after=None)
+        self._stats = {}
+
+    @property
+    def single_flight(self):
+        return self.backend.single_flight
+
+    def set_backend(self, backend: CacheBackend):
+        self.backend = backend
+
+    def _get_stats(self, endpoint):
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = EndpointStats()
+            self._stats[endpoint] = stats
+        return stats
+
+    async def get_or_fetch(self, endpoint, key, fetch, ttl):
+        stats = self._get_stats(endpoint)
+        if self.single_flight.is_in_flight(key):
+            stats.coalesced += 1
+
+        async def resilient_fetch():
+            start = time.perf_counter()
+            try:
+                return await self.resilience.call(endpoint, fetch)
+            finally:
+                stats.record_fetch(time.perf_counter() - start)
+
+        return await self.backend.get_or_revalidate(key, resilient_fetch, ttl, stats=stats)
+
+    def clear(self):
+        if isinstance(self.backend, MemoryCacheBackend):
+            self.backend.clear()
+
+    def stats(self):
+        resilience_stats = self.resilience.stats()
+        return {endpoint: {**stats.as_dict(), "upstream": resilience_stats.get(endpoint)} for endpoint, stats in self._stats.items()}
+
+
+def _key_part(value):
+    # Arguments such as the HTTP client differ per process but not per response
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (tuple, list)):
+        return "(" + ",".join(_key_part(item) for item in value) + ")"
+    return type(value).__name__
+
+
+endpoint_cache = EndpointCache()
+
+
+def cached_endpoint(endpoint, ttl):
+    """
+    Decorator to cache an async NBA endpoint call in ``endpoint_cache``.
+
+    Args:
+        endpoint: Name the endpoint's stats are reported under
+        ttl: Seconds to keep a response, or a callable taking the response and returning seconds
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = f"nba:{endpoint}:{_key_part(args)}:{_key_part(sorted(kwargs.items()))}"
+
+            async def fetch():
+                # Only upstream calls are timed here, cache hits never reach this
+                with span("nba_api.fetch", endpoint=endpoint):
+                    return await func(*args, **kwargs)
+
+            return await endpoint_cache.get_or_fetch(endpoint, key, fetch, ttl)
+        return wrapper
+    return decorator
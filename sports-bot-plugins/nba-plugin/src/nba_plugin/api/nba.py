@@ -1,62 +1,113 @@
-from urllib.request import Request, urlopen
-import json
+import asyncio
 import uuid
 from datetime import datetime
-from nba_plugin.util.utils import get_current_eastern_time
+from nba_plugin.util.utils import get_current_eastern_time, fetch_endpoint_dict, NBA_STATS_BASE_URL
 from nba_api.live.nba.endpoints import ScoreBoard, BoxScore
 from nba_api.stats.endpoints import ScoreboardV2, LeagueStandingsV3, TeamGameLog, PlayerGameLog, PlayerProfileV2
 from ..util.nba_utils import get_headers
+from .cache import cached_endpoint
 import socket
 
-def create_request(url, host='stats.nba.com', referer='https://stats.nba.com/'):
-    req = Request(url)
-    req.add_header('User-Agent', 'PostmanRuntime/7.24.0')
-    req.add_header('Host', host)
-    req.add_header('Referer', referer)
-    req.add_header('Accept', '*/*')
-    req.add_header('x-nba-stats-origin', 'stats')
-    req.add_header('x-nba-stats-token', 'true')
-    return req
-
-def get_player_career_stats(player_id):
-    req = create_request(f"https://stats.nba.com/stats/playercareerstats?LeagueID=&PerMode=Totals&PlayerID={player_id}")
-    player_career_stats = urlopen(req).read()
-
-    return json.loads(player_career_stats)
-
-def get_live_scoreboard(date=None):
+LIVE_GAME_STATUS = 2
+
+def _scoreboard_ttl(score_board):
+    """Scoreboards change every few seconds while games are live, and rarely otherwise."""
+    for result_set in score_board.get("resultSets", []):
+        if result_set.get("name") == "GameHeader" and "GAME_STATUS_ID" in result_set.get("headers", []):
+            status_index = result_set["headers"].index("GAME_STATUS_ID")
+            if any(game[status_index] == LIVE_GAME_STATUS for game in result_set.get("rowSet", [])):
+                return 10
+    return 60
+
+def _live_scoreboard_ttl(score_board):
+    games = score_board.get("scoreboard", {}).get("games", [])
+    return 10 if any(game.get("gameStatus") == LIVE_GAME_STATUS for game in games) else 60
+
+def _boxscore_ttl(box_score):
+    game_status = box_score.get("game", {}).get("gameStatus")
+    if game_status == LIVE_GAME_STATUS:
+        return 10
+    # Final box scores don't change
+    return 3600 if game_status == 3 else 60
+
+def create_headers(host='stats.nba.com', referer='https://stats.nba.com/'):
+    return {
+        'User-Agent': 'PostmanRuntime/7.24.0',
+        'Host': host,
+        'Referer': referer,
+        'Accept': '*/*',
+        'x-nba-stats-origin': 'stats',
+        'x-nba-stats-token': 'true',
+    }
+
+@cached_endpoint('playercareerstats', ttl=3600)
+async def get_player_career_stats(http_client, player_id):
+    response = await http_client.get(
+        f"{NBA_STATS_BASE_URL}/playercareerstats",
+        params={'LeagueID': '', 'PerMode': 'Totals', 'PlayerID': player_id},
+        headers=create_headers(),
+    )
+    response.raise_for_status()
+
+    return response.json()
+
+# The fetches below raise, so the endpoint cache can retry them, count them
+# against the circuit breaker and fall back to a stale response. Their public
+# wrappers return None once all of that has failed.
+
+@cached_endpoint('scoreboard_live', ttl=_live_scoreboard_ttl)
+async def _fetch_live_scoreboard():
+    return await fetch_endpoint_dict(ScoreBoard, headers={'Referer': 'https://www.nba.com/'})
+
+async def get_live_scoreboard(date=None):
     try:
-        score_board = ScoreBoard(headers={'Referer': 'https://www.nba.com/'})
-        return score_board.get_dict()
+        return await _fetch_live_scoreboard()
     except Exception as e:
         print(f"Error fetching live scoreboard: {e}")
         return None
 
-def get_scoreboard(date=None):
+@cached_endpoint('scoreboardv2', ttl=_scoreboard_ttl)
+async def _fetch_scoreboard(game_date):
+    return await fetch_endpoint_dict(ScoreboardV2, game_date=game_date)
+
+async def get_scoreboard(date=None):
     curr_date = date if date is not None else str(get_current_eastern_time()).split()[0]
     try:
-        score_board = ScoreboardV2(game_date=curr_date)
-        return score_board.get_dict()
-    except socket.timeout:
+        return await _fetch_scoreboard(curr_date)
+    except (socket.timeout, asyncio.TimeoutError):
         print("Timeout when connecting to NBA stats API")
         return None
     except Exception as e:
         print(f"Error fetching scoreboard: {e}")
         return None
-    
-def get_boxscore(game_id):
+
+@cached_endpoint('boxscore', ttl=_boxscore_ttl)
+async def _fetch_boxscore(game_id):
+    return await fetch_endpoint_dict(BoxScore, game_id=game_id, headers={'Referer': 'https://www.nba.com/'})
+
+async def get_boxscore(game_id):
     try:
-        box_score = BoxScore(game_id=game_id, headers={'Referer': 'https://www.nba.com/'})
+        return await _fetch_boxscore(game_id)
     except Exception as e:
         print(f"Error fetching boxscore: {e}")
         return None
 
-    return box_score.get_dict()
+
+@cached_endpoint('leaguestandingsv3', ttl=300)
+async def _fetch_standings():
+    return await fetch_endpoint_dict(LeagueStandingsV3)
+
+async def get_standings():
+    try:
+        return await _fetch_standings()
+    except Exception as e:
+        print(f"Error fetching league standings: {e}")
+        return None
 
 
-def get_team_record(team_id):
+async def get_team_record(team_id):
     try:
-        data = LeagueStandingsV3().get_dict()
+        data = await get_standings()
         teams = data['resultSets'][0]['rowSet']
         wins = 0
         losses = 0
@@ -74,9 +125,12 @@ def get_team_record(team_id):
         return None
 
 
-def get_most_recent_game(team_id):
-    reg_log = TeamGameLog(team_id=team_id, season_type_all_star="Regular Season", league_id_nullable="00").get_dict()
-    post_log = TeamGameLog(team_id=team_id, season_type_all_star="Playoffs", league_id_nullable="00").get_dict()
+@cached_endpoint('teamgamelog', ttl=300)
+async def get_most_recent_game(team_id):
+    reg_log, post_log = await asyncio.gather(
+        fetch_endpoint_dict(TeamGameLog, team_id=team_id, season_type_all_star="Regular Season", league_id_nullable="00"),
+        fetch_endpoint_dict(TeamGameLog, team_id=team_id, season_type_all_star="Playoffs", league_id_nullable="00"),
+    )
 
     headers = []
     def extract_latest(gamelog):
@@ -104,7 +158,7 @@ def get_most_recent_game(team_id):
         reg_date = datetime.strptime(last_reg[headers['GAME_DATE']], '%b %d, %Y')
         post_date = datetime.strptime(last_post[headers['GAME_DATE']], '%b %d, %Y')
         
-        return last_post[headers['Game_ID']] if post_date > reg_date else last_reg[header['Game_ID']]
+        return last_post[headers['Game_ID']] if post_date > reg_date else last_reg[headers['Game_ID']]
     
     # Fallbacks
     if last_post: return last_post[headers['Game_ID']]
@@ -113,8 +167,9 @@ def get_most_recent_game(team_id):
     return None
 
 
-def get_player_gamelog(player_id, season_type="Regular Season"):
-    log = PlayerGameLog(player_id=player_id, season_type_all_star=season_type, league_id_nullable="00").get_dict()
+@cached_endpoint('playergamelog', ttl=300)
+async def get_player_gamelog(player_id, season_type="Regular Season"):
+    log = await fetch_endpoint_dict(PlayerGameLog, player_id=player_id, season_type_all_star=season_type, league_id_nullable="00")
 
     return log
 
@@ -129,5 +184,6 @@ def get_player_gamelog(player_id, season_type="Regular Season"):
 #     box_score = urlopen(req).read()
 #     return json.loads(box_score)
 
-def get_player_profile(player_id):
-    return PlayerProfileV2(player_id=player_id, per_mode36="PerGame", league_id_nullable="00").get_dict()
\ No newline at end of file
+@cached_endpoint('playerprofilev2', ttl=3600)
+async def get_player_profile(player_id):
+    return await fetch_endpoint_dict(PlayerProfileV2, player_id=player_id, per_mode36="PerGame", league_id_nullable="00")
\ No newline at end of file
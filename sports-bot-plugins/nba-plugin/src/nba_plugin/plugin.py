@@ -1,14 +1,20 @@
 from datetime import datetime
-from typing import Dict, Sequence, Optional, Type
+import os
+from typing import Dict, Hashable, List, Sequence, Optional, Type
 import re
 import logging
 from telegram import BotCommand
 from telegram.ext import CommandHandler, BaseHandler
-from sports_bot_telegram_plugin import SportsBotPlugin
+from sports_bot_telegram_plugin import SportsBotPlugin, ScoreboardPoller, CacheBackend
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from sports_bot_telegram_plugin.types.RequestContext import RequestContext
 from .services.live_score_service import LiveScoreService
 from .services.player_service import PlayerService
 from .services.team_service import TeamService
+from .api.cache import endpoint_cache
+from .util.nba_utils import find_team_id, get_team_name_map
+from .util.player_index import get_player_index
+from .util.utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +29,34 @@ class NBAPlugin(SportsBotPlugin):
         self.commands = [
             BotCommand("fts", "Get player free throw stats"),
         ]
-        self.player_service = PlayerService(self.handle_none_or_mult_players_found)
+        self.player_service = PlayerService(self.handle_none_or_mult_players_found, self.get_http_client)
         self.live_score_service = LiveScoreService()
         self.team_service = TeamService()
+        self.scoreboard_poller = None
+        if os.getenv('NBA_SCOREBOARD_POLLER', '').lower() in ('1', 'true', 'yes'):
+            self.scoreboard_poller = ScoreboardPoller(
+                "NBA",
+                self.live_score_service.get_snapshot,
+                live_interval=float(os.getenv('NBA_POLL_LIVE_INTERVAL', '10')),
+                idle_interval=float(os.getenv('NBA_POLL_IDLE_INTERVAL', '300')),
+            )
 
-    async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> MatchScores:
+    def set_cache_backend(self, cache_backend: CacheBackend) -> None:
+        super().set_cache_backend(cache_backend)
+        endpoint_cache.set_backend(cache_backend)
+
+    async def start(self) -> None:
+        """Build the player search index and start the scoreboard poller, if enabled."""
+        await run_blocking(get_player_index)
+        if self.scoreboard_poller:
+            self.scoreboard_poller.start()
+
+    async def shutdown(self) -> None:
+        if self.scoreboard_poller:
+            await self.scoreboard_poller.stop()
+        await super().shutdown()
+
+    async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None, request_context: Optional[RequestContext] = None) -> MatchScores:
         """
         Get live scores for a specific NBA team on a given date.
         
@@ -35,13 +64,45 @@ class NBAPlugin(SportsBotPlugin):
             team: Team name or identifier
             game_date: Optional date to get scores for. If None, gets current/most recent game.
             extra_params: Optional plugin-specific parameters (currently unused).
+            request_context: Optional context carrying the NBA team id, if the bot already resolved ``team``.
             
         Returns:
             MatchScores object containing game scores and details
         """
-        return await self.live_score_service.get_scores(team, game_date)
+        team_id = request_context.team_id if request_context else None
+
+        # Today's games are served from the poller's snapshot while it's fresh
+        if game_date is None and self.scoreboard_poller:
+            match_scores = self.scoreboard_poller.get(team_id if team_id is not None else find_team_id(team))
+            if match_scores:
+                return match_scores
+
+        return await self.live_score_service.get_scores(team, game_date, team_id)
+
+    async def get_live_scores_batch(self, teams: Optional[List[str]], game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> List[MatchScores]:
+        """
+        Get scores for several NBA teams, or every game, from one scoreboard fetch.
+
+        Args:
+            teams: Team names or identifiers, or None for every game
+            game_date: Optional date to get scores for. If None, uses today's live scoreboard.
+            extra_params: Optional plugin-specific parameters (currently unused).
+
+        Returns:
+            One MatchScores per game
+        """
+        return await self.live_score_service.get_scores_batch(teams, game_date)
+
+    async def get_team_aliases(self) -> Dict[str, Hashable]:
+        """
+        Get every NBA team name variation mapped to its team id.
+
+        Returns:
+            Dict mapping full names, nicknames, abbreviations and cities to team ids
+        """
+        return {alias: team["id"] for alias, team in get_team_name_map().items()}
 
-    async def get_player_career_stats(self, player_name: str, update=None, context=None) -> str:
+    async def get_player_career_stats(self, player_name: str, update=None, context=None, request_context: Optional[RequestContext] = None) -> str:
         """
         Get career stats for a specific NBA player.
         
@@ -49,25 +110,27 @@ class NBAPlugin(SportsBotPlugin):
             player_name: Name of the player to get stats for
             update: Optional telegram update object
             context: Optional telegram callback context
+            request_context: Optional context from ``resolve_player``
             
         Returns:
             String containing formatted career statistics
         """
-        return await self.player_service.get_player_career_stats(player_name, update, context)
+        return await self.player_service.get_player_career_stats(player_name, update, context, request_context)
 
-    async def get_player_live_stats(self, player_name: str, update, context) -> str:
+    async def get_player_live_stats(self, player_name: str, update, context, request_context: Optional[RequestContext] = None) -> str:
         """
         Get current/live stats for a specific NBA player.
         
         Args:
             player_name: Name of the player to get stats for
+            request_context: Optional context from ``resolve_player``
             
         Returns:
             Dictionary containing player's current statistics
         """
-        return await self.player_service.get_player_live_stats(player_name, update, context)
+        return await self.player_service.get_player_live_stats(player_name, update, context, request_context)
 
-    async def get_player_season_stats(self, player_name: str, update, context, start_year: Optional[str] = None, end_year: Optional[str] = None) -> str:
+    async def get_player_season_stats(self, player_name: str, update, context, start_year: Optional[str] = None, end_year: Optional[str] = None, request_context: Optional[RequestContext] = None) -> str:
         """
         Get season stats for a specific NBA player.
         
@@ -75,11 +138,12 @@ class NBAPlugin(SportsBotPlugin):
             player_name: Name of the player to get stats for
             start_year: Optional start year for stats range
             end_year: Optional end year for stats range
+            request_context: Optional context from ``resolve_player``
             
         Returns:
             String containing formatted season statistics
         """
-        return await self.player_service.get_player_season_stats(player_name, update, context, start_year, end_year)
+        return await self.player_service.get_player_season_stats(player_name, update, context, start_year, end_year, request_context)
 
     async def is_team_supported(self, team: str) -> bool:
         """
@@ -104,10 +168,42 @@ class NBAPlugin(SportsBotPlugin):
             True if the player is supported, False otherwise
         """
         return self.player_service.is_player_supported(player_name)
+
+    async def resolve_player(self, player_name: str, request_context: RequestContext) -> bool:
+        """
+        Check if an NBA player is supported, keeping the match when it's unambiguous.
+
+        Args:
+            player_name: Name of the player to check
+            request_context: Context for the current command
+
+        Returns:
+            True if the player is supported, False otherwise
+        """
+        return self.player_service.resolve_player(player_name, request_context)
     
+    def get_cache_stats(self) -> Dict[str, Dict]:
+        """
+        Get hit/miss/latency stats for the NBA stats endpoint cache.
+
+        Returns:
+            Dict mapping each endpoint name to its cache stats, including
+            upstream retries, hedges and circuit breaker state. The
+            ``single_flight`` entry reports how many callers were deduplicated
+            onto an in-flight upstream request, ``backend`` reports how often
+            another replica's fetch was reused, and ``scoreboard_poller`` (when
+            enabled) reports snapshot age and hits.
+        """
+        stats = endpoint_cache.stats()
+        stats["single_flight"] = endpoint_cache.single_flight.stats()
+        stats["backend"] = endpoint_cache.backend.stats()
+        if self.scoreboard_poller:
+            stats["scoreboard_poller"] = self.scoreboard_poller.stats()
+        return stats
+
     async def ft_command_handler(self, update, context, player_id=""):
         player_name = player_id if player_id else ' '.join(update.message.text.split(' ')[1:])
-        player_fts_msg = await self.player_service.get_player_fts(player_name, update, context)
+        player_fts_msg = await self.player_service.get_player_fts(player_name, update, context, RequestContext(query=player_name))
 
         if player_fts_msg:
             await context.bot.send_message(chat_id=update.message.chat_id, text=player_fts_msg)
@@ -1,40 +1,117 @@
-from typing import Dict, Optional, List
+import asyncio
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
-from nba_plugin.api.nba import get_scoreboard, get_boxscore, get_team_record, get_most_recent_game
-from nba_plugin.util.nba_utils import game_et_to_hh_mm, game_clock_to_mm_ss, get_headers, get_current_teams_data, get_game_header_set_data, find_team_id, get_team_by_id, format_game_status
+from nba_plugin.api.nba import get_scoreboard, get_live_scoreboard, get_boxscore, get_team_record, get_most_recent_game, LIVE_GAME_STATUS
+from nba_plugin.util.nba_utils import game_et_to_hh_mm, game_clock_to_mm_ss, get_headers, get_current_teams_data, get_game_header_set_data, find_team_id, get_team_by_id, format_game_status, get_gameheader, get_linescore
 
 
 class LiveScoreService:
-  async def get_scores(self, team: str, game_date: Optional[datetime] = None) -> MatchScores:
-    score_board = get_scoreboard(date=game_date)
+  async def get_scores(self, team: str, game_date: Optional[datetime] = None, team_id: Optional[int] = None) -> MatchScores:
+    score_board = await get_scoreboard(date=game_date)
+
+    # The scoreboard is unavailable and nothing is cached
+    if not score_board:
+       return None
+
     resultSets = score_board["resultSets"]
 
     if not resultSets or len(resultSets) == 0:
        return None
     
     gameheader = resultSets[0]
-    boxscore_id_result = LiveScoreService._get_game_id(team, gameheader)
+    boxscore_id_result = await LiveScoreService._get_game_id(team, gameheader, team_id)
 
     if not boxscore_id_result:
        return None
     
     game, boxscore_id = boxscore_id_result
 
-    box_score = get_boxscore(boxscore_id)
+    box_score = await get_boxscore(boxscore_id)
 
     # There's a chance the box score for today's game isn't live yet
     # In this case, just generate a dummy score
     if not box_score:
-       return LiveScoreService._get_not_started_team_scores(game, gameheader)
+       return await LiveScoreService._get_not_started_team_scores(game, gameheader)
     
-    match_score = LiveScoreService._get_team_scores_from_boxscore(boxscore=box_score)
+    match_score = await LiveScoreService._get_team_scores_from_boxscore(boxscore=box_score)
     return match_score
 
+  async def get_scores_batch(self, teams: Optional[List[str]], game_date: Optional[datetime] = None) -> List[MatchScores]:
+    """
+    Get scores for several teams, or every game, from a single scoreboard fetch.
+
+    Args:
+        teams: Team names or identifiers, or None for every game on the scoreboard
+        game_date: Optional date to get scores for. If None, uses today's live scoreboard.
+
+    Returns:
+        One MatchScores per game, in scoreboard order. Requested teams that aren't
+        on the scoreboard get their most recent game instead.
+    """
+    # The scoreboard helpers match on team nickname (e.g. "Lakers"); an empty
+    # query matches every game. Unknown teams get None and match nothing.
+    queries = [""] if teams is None else [get_team_by_id(find_team_id(team)) or None for team in teams]
+    matches_per_query = []
+
+    if game_date is None:
+      score_board = await get_live_scoreboard()
+      games = score_board.get("scoreboard", {}).get("games", []) if score_board else []
+      for query in queries:
+        matches_per_query.append(LiveScoreService._get_live_team_scores_from_scoreboard(games, query) if query is not None else [])
+    else:
+      score_board = await get_scoreboard(date=game_date)
+      gameheader = get_gameheader(score_board) if score_board else {"empty": True}
+      linescore = get_linescore(score_board) if score_board else {"empty": True}
+      for query in queries:
+        if query is None or gameheader.get("empty") or linescore.get("empty"):
+          matches_per_query.append([])
+          continue
+        matches_per_query.append(LiveScoreService._get_past_team_scores(gameheader, linescore["linescore"], linescore["linescore_headers"], query))
+
+    # Teams not playing on that day fall back to the single-team lookup
+    if teams is not None:
+      missing = [team for team, matches in zip(teams, matches_per_query) if not matches]
+      fallback_scores = await asyncio.gather(*(self.get_scores(team, game_date) for team in missing), return_exceptions=True)
+      matches_per_query.extend([match_score] for match_score in fallback_scores if isinstance(match_score, MatchScores))
+
+    results = []
+    seen = set()
+    for matches in matches_per_query:
+      for match_score in matches:
+        matchup = (match_score.home_team, match_score.away_team)
+        if matchup not in seen:
+          seen.add(matchup)
+          results.append(match_score)
+    return results
+
+  async def get_snapshot(self) -> Tuple[Dict[int, MatchScores], bool]:
+    """
+    Build a per-team snapshot of today's games from the live scoreboard.
+
+    Returns:
+        Dict mapping each playing team's id to its game's scores, and whether
+        any game is in progress
+    """
+    score_board = await get_live_scoreboard()
+    if not score_board:
+       raise RuntimeError("Live scoreboard unavailable")
+
+    snapshot = {}
+    has_live_games = False
+    for game in score_board.get("scoreboard", {}).get("games", []):
+       match_scores = LiveScoreService._get_team_scores_from_live_game(game)
+       snapshot[game["homeTeam"]["teamId"]] = match_scores
+       snapshot[game["awayTeam"]["teamId"]] = match_scores
+       has_live_games = has_live_games or game.get("gameStatus") == LIVE_GAME_STATUS
+
+    return snapshot, has_live_games
+
   @staticmethod
-  def _get_game_id(team, gameheader):
-     # Get the id of the team query
-    team_id = find_team_id(team)
+  async def _get_game_id(team, gameheader, team_id=None):
+     # Get the id of the team query, unless the caller already resolved it
+    if team_id is None:
+      team_id = find_team_id(team)
 
     gameheader_headers = get_headers(gameheader)
     game_header_set = get_game_header_set_data(gameheader)
@@ -48,7 +125,7 @@ class LiveScoreService:
          return game, game[gameheader_headers["GAME_ID"]]
       
     # Couldn't find a game today for matched team, try to find most recent game
-    last_game_id = get_most_recent_game(team_id) 
+    last_game_id = await get_most_recent_game(team_id)
 
     if last_game_id:
        return None, last_game_id
@@ -56,7 +133,7 @@ class LiveScoreService:
     return None
   
   @staticmethod
-  def _get_not_started_team_scores(game, gameheader) -> List[MatchScores]:
+  async def _get_not_started_team_scores(game, gameheader) -> MatchScores:
     gameheader_headers = get_headers(gameheader)
 
     home_team_id = game[gameheader_headers["HOME_TEAM_ID"]]
@@ -65,8 +142,10 @@ class LiveScoreService:
     home_team = get_team_by_id(home_team_id)
     away_team = get_team_by_id(away_team_id)
 
-    home_team_record = get_team_record(home_team_id)
-    away_team_record = get_team_record(away_team_id)
+    home_team_record, away_team_record = await asyncio.gather(
+       get_team_record(home_team_id),
+       get_team_record(away_team_id),
+    )
 
     game_start_time = game[gameheader_headers["GAME_STATUS_TEXT"]]
     game_curr_time = game[gameheader_headers["LIVE_PC_TIME"]]
@@ -84,7 +163,7 @@ class LiveScoreService:
        )
   
   @staticmethod
-  def _get_team_scores_from_boxscore(boxscore) -> MatchScores:
+  async def _get_team_scores_from_boxscore(boxscore) -> MatchScores:
     game = boxscore["game"]
     home_team = game["homeTeam"]
     away_team = game["awayTeam"]
@@ -94,12 +173,14 @@ class LiveScoreService:
 
     home_team_name = home_team["teamName"]
     home_team_score = home_team["score"]
-    home_team_record = get_team_record(home_team_id)
-
 
     away_team_name = away_team["teamName"]
     away_team_score = away_team["score"]
-    away_team_record = get_team_record(away_team_id)
+
+    home_team_record, away_team_record = await asyncio.gather(
+       get_team_record(home_team_id),
+       get_team_record(away_team_id),
+    )
 
     game_status = game["gameStatusText"]
     game_start_time = game_et_to_hh_mm(game["gameEt"])
@@ -117,6 +198,37 @@ class LiveScoreService:
        game_curr_time=game_curr_time
     )
   
+  @staticmethod
+  def _get_team_scores_from_live_game(game) -> MatchScores:
+    home_team = game["homeTeam"]
+    away_team = game["awayTeam"]
+    game_status = game["gameStatusText"].strip()
+
+    # Formatted the same way as the box score and not-started paths
+    if game["gameStatus"] == 1:
+       home_score = None
+       away_score = None
+       game_curr_time = ""
+       game_start_time = game_status
+    else:
+       home_score = home_team["score"]
+       away_score = away_team["score"]
+       game_curr_time = game_clock_to_mm_ss(game["gameClock"])
+       game_start_time = game_et_to_hh_mm(game["gameEt"])
+       game_status = format_game_status(game_status.split(' ')[0])
+
+    return MatchScores(
+       home_team=home_team["teamName"],
+       home_score=home_score,
+       home_team_record=f"{home_team['wins']}-{home_team['losses']}",
+       away_team=away_team["teamName"],
+       away_score=away_score,
+       away_team_record=f"{away_team['wins']}-{away_team['losses']}",
+       game_status=game_status,
+       game_start_time=game_start_time,
+       game_curr_time=game_curr_time
+    )
+
   @staticmethod
   def _get_live_team_scores_from_scoreboard(games, query) -> List[MatchScores]:
       results = list()
@@ -129,23 +241,7 @@ class LiveScoreService:
           away_team_name = away_team["teamName"]
 
           if query.lower() in home_team_name.lower() or query.lower() in away_team_name.lower():
-              # Time format is like "PT10M11.00S"
-              current_game_time = game["gameClock"]
-              # Extract to MM:SS, two numbers after PT and 2 numbers after M
-              current_game_time = current_game_time.replace("PT", "").replace("M", ":")[:5]
-
-              team_compare_data = MatchScores(
-                home_team=home_team_name,
-                home_score=home_team["score"],
-                home_team_record=f"{home_team['wins']}-{home_team['losses']}",
-                away_team=away_team_name,
-                away_score=away_team["score"],
-                away_team_record=f"{away_team['wins']}-{away_team['losses']}",
-                game_status=game["gameStatusText"].strip(),
-                game_start_time=game["gameEt"],
-                game_curr_time=current_game_time
-              )
-              results.append(team_compare_data)
+              results.append(LiveScoreService._get_team_scores_from_live_game(game))
 
       return results
 
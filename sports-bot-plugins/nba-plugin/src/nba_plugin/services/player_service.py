@@ -1,30 +1,19 @@
+import asyncio
 from datetime import datetime
 from logging import log
 from typing import List, Dict, Optional, Callable
-from nba_api.stats.static import players
+from sports_bot_telegram_plugin.types.RequestContext import RequestContext
 from ..api.nba import get_player_career_stats, get_player_gamelog, get_scoreboard, get_boxscore, get_player_profile
 from ..util.nba_utils import get_player_team, find_players, get_headers, get_formatted_player_career_stats, get_player_stats_from_gamelog, get_game_header_set_data, get_player_stats_from_boxscore
 
 class PlayerService:
-    def __init__(self, handle_multiple_players: Callable):
+    def __init__(self, handle_multiple_players: Callable, get_http_client: Callable):
         self.handle_multiple_players = handle_multiple_players
+        self.get_http_client = get_http_client
 
     def find_players(self, player_query: str):
-        """Find players using fuzzy partial match."""
-        if player_query.isdigit():
-            player = players.find_player_by_id(player_query)
-            return [player] if player else []
-
-        all_players = players.get_players()
-        query_lower = player_query.lower()
-
-        # Simple partial match
-        matched_players = [
-            p for p in all_players
-            if query_lower in p["full_name"].lower()
-        ]
-
-        return matched_players
+        """Find players by id or partial name."""
+        return find_players(player_query)
 
     
     def is_player_supported(self, player_name: str) -> bool:
@@ -32,19 +21,30 @@ class PlayerService:
         players = find_players(player_name)
         return len(players) > 0
 
-    async def get_player_career_stats(self, player_name: str, update, context) -> str:
+    def resolve_player(self, player_name: str, request_context: RequestContext) -> bool:
+        """Check if a player is supported, recording the player in the context when exactly one matches."""
         players_found = find_players(player_name)
+        if len(players_found) == 1:
+            request_context.entity = players_found[0]
+            request_context.entity_id = players_found[0]["id"]
+        return len(players_found) > 0
+
+    async def get_player_career_stats(self, player_name: str, update, context, request_context: Optional[RequestContext] = None) -> str:
+        if request_context and request_context.entity:
+            player = request_context.entity
+        else:
+            players_found = find_players(player_name)
 
-        if len(players_found) != 1:
-            await self.handle_multiple_players(players_found, update, context, "career_stats", "nba")
-            return None
+            if len(players_found) != 1:
+                await self.handle_multiple_players(players_found, update, context, "career_stats", "nba")
+                return None
 
-        player = players_found[0]
+            player = players_found[0]
         player_id = player["id"]
         player_name = player["full_name"]
         career_totals = {}
 
-        player_career_stats = get_player_career_stats(player_id)
+        player_career_stats = await get_player_career_stats(self.get_http_client(), player_id)
 
         for result_set in player_career_stats["resultSets"]:
             if result_set["name"] == "CareerTotalsRegularSeason":
@@ -56,12 +56,12 @@ class PlayerService:
         msg = get_formatted_player_career_stats(dict(headers=headers, data=career_totals["rowSet"][0]), player_name)
         return msg
 
-    async def get_player_season_stats(self, player_name: str, update, context, start_year: Optional[str] = None, end_year: Optional[str] = None) -> Dict:
-        player = await self.get_player(player_name, update, context, "season_stats")
+    async def get_player_season_stats(self, player_name: str, update, context, start_year: Optional[str] = None, end_year: Optional[str] = None, request_context: Optional[RequestContext] = None) -> Dict:
+        player = await self.get_player(player_name, update, context, "season_stats", request_context)
         if not player:
             return player
 
-        player_profile = get_player_profile(player_id=player["id"])
+        player_profile = await get_player_profile(player_id=player["id"])
         # TODO: Implement the stats parsing
         return {}
 
@@ -70,9 +70,9 @@ class PlayerService:
         # TODO: Implement formatting logic
         return f"Stats for {player_name}"
 
-    async def get_player_live_stats(self, player_name: str, update, context) -> str:
+    async def get_player_live_stats(self, player_name: str, update, context, request_context: Optional[RequestContext] = None) -> str:
         """Get current/live stats for a specific NBA player."""
-        player = await self.get_player(player_name, update, context, "current_stats")
+        player = await self.get_player(player_name, update, context, "current_stats", request_context)
         if not player:
             return player
 
@@ -80,12 +80,12 @@ class PlayerService:
         player_name = player["full_name"].strip()
 
         # Then, check if player is currently playing
-        _, game_id = PlayerService._find_boxscore_id(player_id)
-        boxscore = get_boxscore(game_id) if game_id else None
+        _, game_id = await PlayerService._find_boxscore_id(player_id, request_context)
+        boxscore = await get_boxscore(game_id) if game_id else None
         stats = {}
 
         if boxscore:
-            stats = await PlayerService._get_stats_from_boxscore(player_id, boxscore)
+            stats = await PlayerService._get_stats_from_boxscore(player_id, boxscore, request_context)
         else:
             # If not, check their game log and report last game
             stats = await PlayerService._get_stats_from_gamelog_game(player_id)
@@ -104,20 +104,20 @@ class PlayerService:
 
         return formatted_msg
     
-    async def get_player_fts(self, player_name, update, context):
-        player = await self.get_player(player_name, update, context, "fts")
+    async def get_player_fts(self, player_name, update, context, request_context: Optional[RequestContext] = None):
+        player = await self.get_player(player_name, update, context, "fts", request_context)
         if not player:
             return player
         
         player_id = player["id"]
         player_name = player["full_name"].strip()
 
-        _, game_id = PlayerService._find_boxscore_id(player_id)
-        boxscore = get_boxscore(game_id) if game_id else None
+        _, game_id = await PlayerService._find_boxscore_id(player_id, request_context)
+        boxscore = await get_boxscore(game_id) if game_id else None
         stats = {}
 
         if boxscore:
-            stats = await PlayerService._get_stats_from_boxscore(player_id, boxscore)
+            stats = await PlayerService._get_stats_from_boxscore(player_id, boxscore, request_context)
         else:
             # If not, check their game log and report last game
             stats = await PlayerService._get_stats_from_gamelog_game(player_id)
@@ -129,7 +129,11 @@ class PlayerService:
         return formatted_msg
 
     
-    async def get_player(self, player_name, update, context, requesting_command_name):
+    async def get_player(self, player_name, update, context, requesting_command_name, request_context: Optional[RequestContext] = None):
+        # The router may have already found the player
+        if request_context and request_context.entity:
+            return request_context.entity
+
         # First, find the correct player
         players_found = find_players(player_name)
 
@@ -138,13 +142,27 @@ class PlayerService:
             return ""
         
         player = players_found[0]
+        if request_context:
+            request_context.entity = player
+            request_context.entity_id = player["id"]
 
         return player
+
+    @staticmethod
+    async def _get_player_team(player_id, request_context: Optional[RequestContext] = None):
+        if not request_context:
+            return await get_player_team(player_id)
+
+        if request_context.team_id is None:
+            request_context.team_id = await request_context.memoize(("commonplayerinfo", player_id), lambda: get_player_team(player_id))
+        return request_context.team_id
         
     @staticmethod
     async def _get_stats_from_gamelog_game(player_id):
-        reg_log = get_player_gamelog(player_id=player_id)
-        post_log = get_player_gamelog(player_id=player_id, season_type="Playoffs")
+        reg_log, post_log = await asyncio.gather(
+            get_player_gamelog(player_id=player_id),
+            get_player_gamelog(player_id=player_id, season_type="Playoffs"),
+        )
         headers = []
 
         def extract_latest(log):
@@ -154,6 +172,11 @@ class PlayerService:
         
             resultSet = log["resultSets"][0]
             headers = get_headers(resultSet)
+
+            # No games, e.g. the playoff log of a team that didn't make the playoffs
+            if not resultSet["rowSet"]:
+                return
+
             game = resultSet["rowSet"][0]
 
             return game
@@ -176,9 +199,14 @@ class PlayerService:
         return stats 
 
     @staticmethod
-    def _find_boxscore_id(player_id):
-        team_id = get_player_team(player_id)
-        score_board = get_scoreboard()
+    async def _find_boxscore_id(player_id, request_context: Optional[RequestContext] = None):
+        team_id, score_board = await asyncio.gather(
+            PlayerService._get_player_team(player_id, request_context),
+            get_scoreboard(),
+        )
+        if not score_board:
+            return None, None
+
         resultSets = score_board["resultSets"]
 
         if not resultSets or len(resultSets) == 0:
@@ -199,8 +227,9 @@ class PlayerService:
         
         return None, None
     
-    async def _get_stats_from_boxscore(player_id, boxscore):
-        team_id = get_player_team(player_id)
+    @staticmethod
+    async def _get_stats_from_boxscore(player_id, boxscore, request_context: Optional[RequestContext] = None):
+        team_id = await PlayerService._get_player_team(player_id, request_context)
 
         game = boxscore["game"]
         team_data = game["homeTeam"] if game["homeTeam"]["teamId"] == team_id else game["awayTeam"]
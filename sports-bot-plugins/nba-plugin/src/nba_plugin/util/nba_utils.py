@@ -1,8 +1,11 @@
 from datetime import datetime, date
-from nba_api.stats.static import players, teams
+from nba_api.stats.static import teams
 from nba_api.stats.endpoints import CommonPlayerInfo
 from functools import lru_cache
 from rapidfuzz import process
+from .utils import run_blocking, NBA_API_TIMEOUT
+from .player_index import get_player_index
+from ..api.cache import cached_endpoint
 
 def get_headers(result_set):
     headers = {}
@@ -99,13 +102,7 @@ def get_formatted_player_season_stats(player_season_stats, player_name):
     return formatted_msg
 
 def find_players(player_name):
-    found_players = {}
-    if player_name.isdigit():
-        found_players = [players.find_player_by_id(player_name)]
-    else:
-        found_players = players.find_players_by_full_name(player_name)
-
-    return found_players
+    return get_player_index().find(player_name)
 
 @lru_cache(maxsize=1)
 def get_team_name_map():
@@ -126,15 +123,15 @@ def get_team_name_map():
 
     return team_name_map
 
-def get_player_team(player_id):
+@cached_endpoint('commonplayerinfo', ttl=6 * 3600)
+async def get_player_team(player_id):
     """
     Fetches the team name for a given player ID.
     """
     if player_id is None:
         return None
         
-    player_info = CommonPlayerInfo(player_id=player_id)
-    player_info_dict = player_info.get_normalized_dict()
+    player_info_dict = await run_blocking(lambda: CommonPlayerInfo(player_id=player_id, timeout=NBA_API_TIMEOUT).get_normalized_dict())
     
     team_name = player_info_dict['CommonPlayerInfo'][0]['TEAM_ID']
     return team_name
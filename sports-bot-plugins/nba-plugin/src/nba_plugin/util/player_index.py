@@ -0,0 +1,135 @@
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from nba_api.stats.static import players
+from rapidfuzz import fuzz, process
+
+
+def normalize_player_name(value: str) -> str:
+    """Lowercase and strip accents, so "Jokić" matches "jokic"."""
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize_player_name(value: str) -> List[str]:
+    return [token for token in re.split(r'[^a-z0-9]+', normalize_player_name(value)) if token]
+
+
+class _TrieNode:
+    __slots__ = ('children', 'player_indexes')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.player_indexes: Set[int] = set()
+
+
+class PlayerIndex:
+    """
+    In-memory index over nba_api's static player list, built once.
+
+    Every token of every player's name (split on spaces, hyphens, periods, ...)
+    is inserted in a prefix trie, so a query matches the players that have a
+    name token starting with each query token, e.g. "lebron", "james lebron"
+    and "gilgeous alex" all work. Players whose normalized name merely contains
+    the query (e.g. LeBron James for "bron") match too, listed after the prefix
+    matches. Queries matching neither fall back to rapidfuzz scoring if
+    ``fuzzy`` is set. Within each group, active players are listed first.
+    Results are memoized per query.
+    """
+
+    def __init__(self, player_list: Optional[List[Dict]] = None, fuzzy: bool = False, fuzzy_min_score: float = 85, fuzzy_limit: int = 5, memo_size: int = 1024):
+        self.fuzzy = fuzzy
+        self.fuzzy_min_score = fuzzy_min_score
+        self.fuzzy_limit = fuzzy_limit
+        self.memo_size = memo_size
+
+        # Active players first, otherwise keep nba_api's order
+        player_list = player_list if player_list is not None else players.get_players()
+        self._players = sorted(player_list, key=lambda player: not player['is_active'])
+        self._by_id = {player['id']: player for player in self._players}
+        self._names = [normalize_player_name(player['full_name']) for player in self._players]
+        self._trie = _TrieNode()
+        self._memo: OrderedDict = OrderedDict()
+
+        for player_index, player in enumerate(self._players):
+            for token in tokenize_player_name(player['full_name']):
+                node = self._trie
+                for char in token:
+                    node = node.children.setdefault(char, _TrieNode())
+                    node.player_indexes.add(player_index)
+
+    def get_by_id(self, player_id) -> Optional[Dict]:
+        try:
+            return self._by_id.get(int(player_id))
+        except (TypeError, ValueError):
+            return None
+
+    def find(self, player_query: str) -> List[Dict]:
+        """
+        Find players by id or (partial) name.
+
+        Args:
+            player_query: A player id, or any part of a player's name
+
+        Returns:
+            Matching player dicts, active players first
+        """
+        query = normalize_player_name(player_query.strip())
+        if not query:
+            return []
+
+        memoized = self._memo.get(query)
+        if memoized is not None:
+            self._memo.move_to_end(query)
+            return list(memoized)
+
+        if query.isdigit():
+            player = self.get_by_id(query)
+            found = [player] if player else []
+        else:
+            found = [self._players[player_index] for player_index in self._search(query)]
+
+        self._memo[query] = tuple(found)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return found
+
+    def _search(self, query: str) -> List[int]:
+        prefix_matches = self._prefix_search(tokenize_player_name(query))
+        substring_matches = [player_index for player_index, name in enumerate(self._names) if query in name and player_index not in prefix_matches]
+        if prefix_matches or substring_matches or not self.fuzzy:
+            return sorted(prefix_matches) + substring_matches
+
+        ranked = process.extract(query, self._names, scorer=fuzz.WRatio, score_cutoff=self.fuzzy_min_score, limit=self.fuzzy_limit)
+        # Highest score first; ties go to active players since they are indexed first
+        return [player_index for _, _, player_index in sorted(ranked, key=lambda match: (-match[1], match[2]))]
+
+    def _prefix_search(self, tokens: List[str]) -> Set[int]:
+        if not tokens:
+            return set()
+
+        result = None
+        for token in tokens:
+            node = self._trie
+            for char in token:
+                node = node.children.get(char)
+                if node is None:
+                    return set()
+            result = set(node.player_indexes) if result is None else result & node.player_indexes
+            if not result:
+                return set()
+        return result
+
+
+_player_index: Optional[PlayerIndex] = None
+
+
+def get_player_index() -> PlayerIndex:
+    """Get the shared player index, building it on first use."""
+    global _player_index
+    if _player_index is None:
+        _player_index = PlayerIndex(fuzzy=os.getenv('NBA_PLAYER_FUZZY_SEARCH', '').lower() in ('1', 'true', 'yes'))
+    return _player_index
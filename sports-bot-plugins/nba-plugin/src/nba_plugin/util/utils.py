@@ -1,4 +1,10 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pytz import timezone
+from nba_api.stats.library.http import NBAStatsHTTP
+from nba_api.live.nba.library.http import NBALiveHTTP
 from datetime import datetime
 
 def get_formatted_input_message(self, msg):
@@ -8,4 +14,32 @@ def get_formatted_input_message(self, msg):
 def get_current_eastern_time():
     eastern = timezone('US/Eastern')
     time = datetime.now(eastern)
-    return time
\ No newline at end of file
+    return time
+
+# Where the NBA stats and live data APIs are reached; point these at a mirror
+# or a local fixture server (see the benchmarks) to run without stats.nba.com
+NBA_STATS_BASE_URL = os.getenv('NBA_STATS_BASE_URL', 'https://stats.nba.com/stats').rstrip('/')
+NBA_LIVE_BASE_URL = os.getenv('NBA_LIVE_BASE_URL', 'https://cdn.nba.com/static/json/liveData').rstrip('/')
+NBAStatsHTTP.base_url = NBA_STATS_BASE_URL + '/{endpoint}'
+NBALiveHTTP.base_url = NBA_LIVE_BASE_URL + '/{endpoint}'
+
+# nba_api is synchronous, so its calls run on this bounded pool to keep the
+# event loop free. The pool size caps concurrent requests to stats.nba.com.
+# A timed-out call can't be cancelled and holds its thread until the request
+# itself times out, so requests get the same timeout as an upstream attempt
+# instead of nba_api's 30 seconds.
+NBA_API_TIMEOUT = float(os.getenv('UPSTREAM_TIMEOUT', '6'))
+_nba_api_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('NBA_API_MAX_WORKERS', '8')),
+    thread_name_prefix='nba-api',
+)
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking nba_api call on the bounded executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_nba_api_executor, functools.partial(func, *args, **kwargs))
+
+async def fetch_endpoint_dict(endpoint_cls, **kwargs):
+    """Instantiate an nba_api endpoint (which performs the request) off the event loop and return its dict."""
+    kwargs.setdefault('timeout', NBA_API_TIMEOUT)
+    return await run_blocking(lambda: endpoint_cls(**kwargs).get_dict())
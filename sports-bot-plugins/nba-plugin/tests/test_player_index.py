@@ -0,0 +1,38 @@
+import pytest
+from nba_api.stats.static import players
+
+from nba_plugin.util.player_index import PlayerIndex
+
+PLAYERS = [
+    {"id": 1, "full_name": "Bronny James", "is_active": True},
+    {"id": 2, "full_name": "LeBron James", "is_active": True},
+    {"id": 3, "full_name": "Dereon Seabron", "is_active": False},
+    {"id": 4, "full_name": "Nikola Jokić", "is_active": True},
+    {"id": 5, "full_name": "Shai Gilgeous-Alexander", "is_active": True},
+]
+
+
+def names(found):
+    return [player["full_name"] for player in found]
+
+
+def test_prefix_matches_rank_ahead_of_substring_matches():
+    index = PlayerIndex(PLAYERS)
+    assert names(index.find("bron")) == ["Bronny James", "LeBron James", "Dereon Seabron"]
+    assert names(index.find("james lebron")) == ["LeBron James"]
+    assert names(index.find("gilgeous alex")) == ["Shai Gilgeous-Alexander"]
+    assert names(index.find("JOKIC")) == ["Nikola Jokić"]
+    assert names(index.find("4")) == ["Nikola Jokić"]
+    assert index.find("kobe") == []
+
+
+def test_fuzzy_search_only_when_nothing_else_matches():
+    index = PlayerIndex(PLAYERS, fuzzy=True)
+    assert names(index.find("lebrn james")) == ["LeBron James"]
+    assert names(index.find("bron")) == ["Bronny James", "LeBron James", "Dereon Seabron"]
+
+
+@pytest.mark.parametrize("query", ["bron", "curry", "james", "lebron james", "jokic", "gilgeous"])
+def test_finds_every_player_nba_api_finds(query):
+    found = PlayerIndex().find(query)
+    assert {player["id"] for player in found} >= {player["id"] for player in players.find_players_by_full_name(query)}
@@ -6,6 +6,29 @@ This package provides the interface for creating plugins for the sports-bot-tele
 """
 
 from .plugin import SportsBotPlugin
+from .http import HttpClient
+from .singleflight import SingleFlight
+from .poller import ScoreboardPoller
+from .cache import CacheBackend, MemoryCacheBackend, DiskCacheBackend, RedisCacheBackend, create_cache_backend
+from .tracing import Metrics, metrics, span, traced
+from .resilience import Resilience, CircuitBreaker, CircuitOpenError
 
 __version__ = "1.2.0"
-__all__ = ["SportsBotPlugin"] 
\ No newline at end of file
+__all__ = [
+    "SportsBotPlugin",
+    "HttpClient",
+    "SingleFlight",
+    "ScoreboardPoller",
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "DiskCacheBackend",
+    "RedisCacheBackend",
+    "create_cache_backend",
+    "Metrics",
+    "metrics",
+    "span",
+    "traced",
+    "Resilience",
+    "CircuitBreaker",
+    "CircuitOpenError",
+] 
\ No newline at end of file
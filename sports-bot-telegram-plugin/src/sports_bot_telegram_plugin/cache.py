@@ -0,0 +1,458 @@
+import asyncio
+import logging
+import pickle
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from urllib.parse import urlparse
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+Ttl = Union[None, float, Callable[[Any], Optional[float]]]
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.lock_waits = 0
+        self.shared_hits = 0
+        self.stale_hits = 0
+        self.stale_errors = 0
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "lock_waits": self.lock_waits,
+            "shared_hits": self.shared_hits,
+            "stale_hits": self.stale_hits,
+            "stale_errors": self.stale_errors,
+        }
+
+
+class CacheBackend(ABC):
+    """
+    Key-value cache with locks, shared by the bot and every plugin.
+
+    Backends store arbitrary picklable values under string keys with an
+    optional TTL, and provide a lock per key. A shared backend (disk or Redis)
+    lets several processes or bot replicas reuse each other's upstream
+    responses and rendered stickers.
+
+    ``get_or_fetch`` is a single-flight across replicas: concurrent callers in
+    this process share one call, and across processes only the holder of the
+    key's lock fetches while the others wait for the value to show up.
+    ``None`` is never cached.
+    """
+
+    # Whether other processes see what this backend stores
+    shared = False
+
+    def __init__(self, lock_ttl: float = 30, lock_poll_interval: float = 0.05):
+        self.lock_ttl = lock_ttl
+        self.lock_poll_interval = lock_poll_interval
+        self.single_flight = SingleFlight()
+        self._stats = CacheStats()
+        self._revalidations = set()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds, or forever if ``ttl`` is None."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """
+        Try to take the lock on ``key`` without waiting.
+
+        Returns:
+            A token to release the lock with, or None if someone else holds it
+        """
+
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with ``acquire_lock``, unless it has expired and been taken by someone else."""
+
+    async def aclose(self) -> None:
+        pass
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Ttl = None) -> Any:
+        """
+        Return the cached value for ``key``, fetching and caching it on a miss.
+
+        Args:
+            key: Cache key, namespaced by the caller (e.g. ``"nba:scoreboard:..."``)
+            fetch: Zero-argument coroutine function producing the value
+            ttl: Seconds to keep the value, None to keep it forever, or a callable
+                taking the value and returning either
+
+        Returns:
+            The cached or fetched value
+        """
+        value = await self.get(key)
+        if value is not None:
+            self._stats.hits += 1
+            return value
+
+        self._stats.misses += 1
+        return await self.single_flight.do(key, lambda: self.fetch_shared(key, fetch, ttl))
+
+    async def fetch_shared(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Ttl = None,
+        is_fresh: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Fetch and cache ``key`` while holding its lock, or wait for the replica that holds it.
+
+        If the lock holder takes longer than the lock TTL, the value is fetched
+        anyway rather than waiting forever.
+
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine function producing the value
+            ttl: As for ``get_or_fetch``
+            is_fresh: Whether a stored value may be returned; values it rejects
+                (e.g. the stale entry being refreshed) count as not stored yet
+        """
+        lock_key = f"lock:{key}"
+        deadline = time.monotonic() + self.lock_ttl
+        waited = False
+
+        async def get_stored():
+            value = await self.get(key)
+            if value is None or (is_fresh is not None and not is_fresh(value)):
+                return None
+            self._stats.shared_hits += 1
+            return value
+
+        while True:
+            token = await self.acquire_lock(lock_key, self.lock_ttl)
+            if token is not None:
+                try:
+                    if waited:
+                        # The previous holder may have stored it just before releasing
+                        value = await get_stored()
+                        if value is not None:
+                            return value
+                    return await self._fetch_and_store(key, fetch, ttl)
+                finally:
+                    await self.release_lock(lock_key, token)
+
+            if not waited:
+                self._stats.lock_waits += 1
+                waited = True
+            await asyncio.sleep(self.lock_poll_interval)
+
+            value = await get_stored()
+            if value is not None:
+                return value
+            if time.monotonic() >= deadline:
+                return await self._fetch_and_store(key, fetch, ttl)
+
+    async def _fetch_and_store(self, key, fetch, ttl):
+        self._stats.fetches += 1
+        value = await fetch()
+        if value is None:
+            return None
+        expire_seconds = ttl(value) if callable(ttl) else ttl
+        if expire_seconds is None or expire_seconds > 0:
+            await self.set(key, value, expire_seconds)
+        return value
+
+    async def get_or_revalidate(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Ttl = None,
+        stale_while_revalidate: float = 30,
+        stale_if_error: float = 86400,
+        stats: Optional[CacheStats] = None,
+    ) -> Any:
+        """
+        Like ``get_or_fetch``, but keeps serving a value for a while after its TTL.
+
+        For ``stale_while_revalidate`` seconds after the TTL, the stale value is
+        returned at once and refreshed in the background. After that it is
+        refreshed before returning, but if the refresh fails (or returns None)
+        the stale value is still returned for up to ``stale_if_error`` seconds
+        after the TTL, so an upstream outage doesn't take answers down with it.
+
+        Values are stored along with their expiry time, so keys written by
+        this method should only be read with it. Anything else stored under
+        the key (e.g. by ``get_or_fetch``) counts as a miss.
+
+        Args:
+            key: Cache key, namespaced by the caller
+            fetch: Zero-argument coroutine function producing the value
+            ttl: Seconds the value is fresh for, None for forever, or a callable
+                taking the value and returning either
+            stale_while_revalidate: Seconds after the TTL to serve the value while refreshing it
+            stale_if_error: Seconds after the TTL to fall back to the value if refreshing fails
+            stats: Stats to count hits and misses in instead of the backend's own
+
+        Returns:
+            The fresh, stale or fetched value
+        """
+        stats = stats or self._stats
+        keep = max(stale_while_revalidate, stale_if_error)
+        stale_value = None
+
+        entry = await self.get(key)
+        if isinstance(entry, tuple) and len(entry) == 2:
+            value, fresh_until = entry
+            expired_for = time.time() - fresh_until
+            if expired_for < 0:
+                stats.hits += 1
+                return value
+            if expired_for < stale_while_revalidate:
+                stats.stale_hits += 1
+                self._revalidate_in_background(key, fetch, ttl, keep)
+                return value
+            if expired_for < stale_if_error:
+                stale_value = value
+
+        stats.misses += 1
+        try:
+            entry = await self.single_flight.do(key, lambda: self._refresh(key, fetch, ttl, keep))
+        except Exception as e:
+            if stale_value is None:
+                raise
+            stats.stale_errors += 1
+            logger.warning(f"Serving stale {key} after refreshing it failed: {str(e)}")
+            return stale_value
+
+        if entry is None:
+            return stale_value
+        return entry[0]
+
+    async def _refresh(self, key, fetch, ttl, keep):
+        async def fetch_entry():
+            value = await fetch()
+            if value is None:
+                return None
+            expire_seconds = ttl(value) if callable(ttl) else ttl
+            return value, time.time() + expire_seconds if expire_seconds is not None else float("inf")
+
+        def entry_ttl(entry):
+            fresh_for = entry[1] - time.time()
+            if fresh_for == float("inf"):
+                return None
+            # Values that shouldn't be cached at all stay that way
+            return fresh_for + keep if fresh_for > 0 else 0
+
+        def is_fresh(entry):
+            # The stale entry stays stored while another replica refreshes it
+            return isinstance(entry, tuple) and len(entry) == 2 and entry[1] > time.time()
+
+        return await self.fetch_shared(key, fetch_entry, entry_ttl, is_fresh)
+
+    def _revalidate_in_background(self, key, fetch, ttl, keep):
+        if self.single_flight.is_in_flight(key):
+            return
+        task = asyncio.get_running_loop().create_task(self.single_flight.do(key, lambda: self._refresh(key, fetch, ttl, keep)))
+        self._revalidations.add(task)
+        task.add_done_callback(lambda task: self._finish_revalidation(key, task))
+
+    def _finish_revalidation(self, key, task):
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Refreshing stale {key} in the background failed: {str(task.exception())}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats.as_dict(), "single_flight": self.single_flight.stats()}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU cache. The default; nothing is shared between replicas.
+
+    Values are stored as-is, not copied, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 4096, **kwargs):
+        super().__init__(**kwargs)
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._locks: Dict[str, tuple] = {}
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value, ttl=None):
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key):
+        self._entries.pop(key, None)
+
+    async def acquire_lock(self, key, ttl):
+        held = self._locks.get(key)
+        if held is not None and time.monotonic() < held[1]:
+            return None
+        token = uuid.uuid4().hex
+        self._locks[key] = (token, time.monotonic() + ttl)
+        return token
+
+    async def release_lock(self, key, token):
+        held = self._locks.get(key)
+        if held is not None and held[0] == token:
+            del self._locks[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    Cache in a ``diskcache`` directory, shared by every process on the same host.
+
+    Requires the ``diskcache`` package. Locks use ``Cache.add``, which is atomic
+    across processes. diskcache is synchronous (SQLite), so every call runs in
+    a worker thread.
+    """
+
+    shared = True
+
+    def __init__(self, directory: str, **kwargs):
+        super().__init__(**kwargs)
+        try:
+            from diskcache import Cache
+        except ImportError as e:
+            raise ImportError("DiskCacheBackend requires the diskcache package") from e
+        self.directory = directory
+        self.cache = Cache(directory)
+
+    async def get(self, key):
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def set(self, key, value, ttl=None):
+        await asyncio.to_thread(self.cache.set, key, value, expire=ttl)
+
+    async def delete(self, key):
+        await asyncio.to_thread(self.cache.delete, key)
+
+    async def acquire_lock(self, key, ttl):
+        token = uuid.uuid4().hex
+        return token if await asyncio.to_thread(self.cache.add, key, token, expire=ttl) else None
+
+    async def release_lock(self, key, token):
+        await asyncio.to_thread(self._release_lock, key, token)
+
+    def _release_lock(self, key, token):
+        if self.cache.get(key) == token:
+            self.cache.delete(key)
+
+    async def aclose(self):
+        await asyncio.to_thread(self.cache.close)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache in Redis (or any Redis-compatible store), shared by every replica.
+
+    Requires the ``redis`` package, unless a ready client is passed in, e.g.
+    ``fakeredis.FakeAsyncRedis()`` in tests. Values are pickled, so only point
+    this at a store the bot can trust. Locks are ``SET NX PX`` keys.
+
+    Args:
+        url: Redis URL, e.g. ``redis://localhost:6379/0``
+        client: Async Redis client to use instead of connecting to ``url``
+        prefix: Prepended to every key, so several bots can share one store
+    """
+
+    shared = True
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "sports-bot:", **kwargs):
+        super().__init__(**kwargs)
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise ImportError("RedisCacheBackend requires the redis package") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key):
+        payload = await self.client.get(self.prefix + key)
+        return pickle.loads(payload) if payload is not None else None
+
+    async def set(self, key, value, ttl=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if ttl is None:
+            await self.client.set(self.prefix + key, payload)
+        else:
+            await self.client.set(self.prefix + key, payload, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key):
+        await self.client.delete(self.prefix + key)
+
+    async def acquire_lock(self, key, ttl):
+        token = uuid.uuid4().hex
+        acquired = await self.client.set(self.prefix + key, token, nx=True, px=max(1, int(ttl * 1000)))
+        return token if acquired else None
+
+    async def release_lock(self, key, token):
+        # Not atomic, but the worst case is one extra upstream fetch by another replica
+        held = await self.client.get(self.prefix + key)
+        if held is not None and (held.decode() if isinstance(held, bytes) else held) == token:
+            await self.client.delete(self.prefix + key)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_cache_backend(url: str) -> CacheBackend:
+    """
+    Create a cache backend from a URL.
+
+    Supported URLs:
+        ``memory://`` - per-process memory
+        ``disk:///path/to/dir`` or ``disk://relative-dir`` - a diskcache directory
+        ``redis://host:port/db`` or ``rediss://...`` - Redis
+        ``fakeredis://`` - in-process fakeredis, for tests and local runs
+
+    Raises:
+        ValueError: If the URL scheme isn't supported
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryCacheBackend()
+    if parsed.scheme == "disk":
+        return DiskCacheBackend(parsed.netloc + parsed.path)
+    if parsed.scheme in ("redis", "rediss"):
+        return RedisCacheBackend(url)
+    if parsed.scheme == "fakeredis":
+        try:
+            import fakeredis
+        except ImportError as e:
+            raise ImportError("fakeredis:// requires the fakeredis package") from e
+        return RedisCacheBackend(client=fakeredis.FakeAsyncRedis())
+    raise ValueError(f"Unsupported cache URL {url!r}, expected memory://, disk://, redis:// or fakeredis://")
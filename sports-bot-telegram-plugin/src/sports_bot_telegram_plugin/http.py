@@ -0,0 +1,67 @@
+import asyncio
+import importlib.util
+from typing import Dict, Optional
+
+import httpx
+
+
+class HttpClient:
+    """
+    Pooled async HTTP client shared by the bot and every plugin.
+
+    One instance lives as long as the application, so outbound calls reuse warm
+    keep-alive connections instead of paying DNS, TCP and TLS setup each time.
+    HTTP/2 is used when the ``h2`` package is installed (``httpx[http2]``).
+    On top of the pool-wide connection limit, at most
+    ``max_connections_per_host`` requests run against a single host at once.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        http2: Optional[bool] = None,
+    ):
+        if http2 is None:
+            http2 = importlib.util.find_spec("h2") is not None
+
+        self.max_connections_per_host = max_connections_per_host
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_host_slots(self, url) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_slots[host] = slots
+        return slots
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool. Accepts the same kwargs as ``httpx.AsyncClient.request``."""
+        async with self._get_host_slots(url):
+            return await self.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
@@ -1,10 +1,28 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, Hashable, List, Optional, Sequence
 from datetime import datetime
 import telegram
 from telegram.ext import BaseHandler, CallbackContext
 from telegram import Update, BotCommand
 from .types.MatchScores import MatchScores
+from .types.RequestContext import RequestContext
+from .http import HttpClient
+from .cache import CacheBackend, MemoryCacheBackend
+from .tracing import traced
+
+# Plugin methods recorded as spans (``plugin.<method>``, labelled with the plugin class)
+TRACED_METHODS = (
+    "get_live_scores",
+    "get_live_scores_batch",
+    "get_player_career_stats",
+    "get_player_season_stats",
+    "get_player_live_stats",
+    "is_team_supported",
+    "is_player_supported",
+    "resolve_player",
+    "get_team_aliases",
+)
 
 class SportsBotPlugin(ABC):
     """
@@ -34,6 +52,16 @@ class SportsBotPlugin(ABC):
                 return []
     """
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Time every plugin's implementation of the core methods, so plugins need no instrumentation of their own
+        for method_name in TRACED_METHODS:
+            method = cls.__dict__.get(method_name)
+            if method is not None and callable(method) and not getattr(method, "__traced__", False):
+                traced_method = traced(f"plugin.{method_name}", plugin=cls.__name__)(method)
+                traced_method.__traced__ = True
+                setattr(cls, method_name, traced_method)
+
     def __init__(self):
         """Initialize the plugin."""
         self.name = ''
@@ -41,6 +69,67 @@ class SportsBotPlugin(ABC):
         self.description = ''
         self.version = ''
         self.commands: list[BotCommand] = []
+        self._http_client: Optional[HttpClient] = None
+        self._owns_http_client = False
+        self._cache_backend: Optional[CacheBackend] = None
+
+    def set_http_client(self, http_client: HttpClient) -> None:
+        """
+        Give the plugin the application-wide pooled HTTP client.
+
+        Called by the core bot at startup. The bot owns the client and closes it
+        on shutdown.
+        """
+        self._http_client = http_client
+        self._owns_http_client = False
+
+    def get_http_client(self) -> HttpClient:
+        """
+        Get the shared pooled HTTP client for outbound calls.
+
+        Plugins should make every HTTP request through this client so they reuse
+        warm connections. If the bot hasn't provided one (e.g. the plugin is used
+        standalone), the plugin creates its own and closes it in ``shutdown``.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = HttpClient()
+            self._owns_http_client = True
+        return self._http_client
+
+    def set_cache_backend(self, cache_backend: CacheBackend) -> None:
+        """
+        Give the plugin the application-wide cache backend.
+
+        Called by the core bot at startup when a cache is configured
+        (``SPORTS_BOT_CACHE_URL``). The bot owns the backend and closes it on
+        shutdown. Plugins that cache upstream responses somewhere else should
+        override this to move that cache onto the backend.
+        """
+        self._cache_backend = cache_backend
+
+    def get_cache_backend(self) -> CacheBackend:
+        """
+        Get the cache backend shared with the bot (and, if it is Redis, with other replicas).
+
+        If the bot hasn't provided one, the plugin gets its own in-memory cache.
+        """
+        if self._cache_backend is None:
+            self._cache_backend = MemoryCacheBackend()
+        return self._cache_backend
+
+    async def start(self) -> None:
+        """
+        Start background work such as pollers. Called by the core bot once the
+        application is running, after ``set_http_client``.
+        """
+        pass
+
+    async def shutdown(self) -> None:
+        """Release resources held by the plugin. Called by the core bot on shutdown."""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._owns_http_client = False
 
     async def handle_none_or_mult_players_found(self, players_found, update, context, requesting_command_name, plugin, year=None):
         """Handle cases where no players or multiple players are found."""
@@ -72,7 +161,7 @@ class SportsBotPlugin(ABC):
         await context.bot.send_message(chat_id=update.message.chat_id, text="Sorry, I could not find a player with that name")
 
     @abstractmethod
-    async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> MatchScores | None:
+    async def get_live_scores(self, team: str, game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None, request_context: Optional[RequestContext] = None) -> MatchScores | None:
         """
         Get live scores for a specific team on a given date.
         
@@ -83,30 +172,59 @@ class SportsBotPlugin(ABC):
                 user's command. Reserved flags (``-d``, ``-plugin``) are stripped out
                 by the core bot; all other ``-flag value`` pairs are passed here for
                 the plugin to interpret as it sees fit.
+            request_context: Set when the core bot already resolved ``team``
+                through its alias index; ``request_context.team_id`` is the id
+                from ``get_team_aliases``. Only passed to plugins that return aliases.
             
         Returns:
             MatchScores object containing game scores and details
         """
         pass
         
-    async def get_player_career_stats(self, player_name: str, update=None, context=None) -> str:
+    async def get_live_scores_batch(self, teams: Optional[List[str]], game_date: Optional[datetime] = None, extra_params: Optional[Dict[str, str]] = None) -> List[MatchScores]:
+        """
+        Get live scores for several teams at once.
+
+        Override this to serve every team from a single scoreboard fetch. The
+        default looks each team up with ``get_live_scores`` concurrently and
+        doesn't support listing every game.
+
+        Args:
+            teams: Team names or identifiers, or None for every game the plugin can list
+            game_date: Optional date to get scores for. If None, gets current/most recent games.
+            extra_params: Optional dict of plugin-specific parameters, as in ``get_live_scores``
+
+        Returns:
+            One MatchScores per game found. Teams without a game are left out.
+        """
+        if teams is None:
+            return []
+
+        results = await asyncio.gather(*(self.get_live_scores(team, game_date, extra_params) for team in teams), return_exceptions=True)
+        return [match_scores for match_scores in results if isinstance(match_scores, MatchScores)]
+
+    async def get_player_career_stats(self, player_name: str, update=None, context=None, request_context: Optional[RequestContext] = None) -> str:
         """
         Get career stats for a specific player.
+
+        ``request_context`` (like in the other player methods) is the context
+        this plugin filled in ``resolve_player``, and is only passed when it did.
         """
         return "This plugin does not support player career stats."
 
-    async def get_player_season_stats(self, player_name: str, update: Optional[Update], context: Optional[CallbackContext], start_year: Optional[str] = None, end_year: Optional[str] = None) -> str:
+    async def get_player_season_stats(self, player_name: str, update: Optional[Update], context: Optional[CallbackContext], start_year: Optional[str] = None, end_year: Optional[str] = None, request_context: Optional[RequestContext] = None) -> str:
         """
         Get season stats for a specific player.
         """
         return "This plugin does not support player season stats."
 
-    async def get_player_live_stats(self, player_name: str, update: Optional[Update], context: Optional[CallbackContext]) -> str:
+    async def get_player_live_stats(self, player_name: str, update: Optional[Update], context: Optional[CallbackContext], request_context: Optional[RequestContext] = None) -> str:
         """
         Get current/live stats for a specific player.
         
         Args:
             player_name: Name of the player to get stats for
+            request_context: The context filled in ``resolve_player``, if any
             
         Returns:
             string containing player's current statistics
@@ -126,6 +244,19 @@ class SportsBotPlugin(ABC):
         """
         pass
 
+    async def get_team_aliases(self) -> Dict[str, Hashable]:
+        """
+        Get every name a team can be looked up by, for the core bot's routing index.
+
+        Called once at startup. Plugins that return aliases are routed to without
+        calling ``is_team_supported``, and receive a ``RequestContext`` carrying
+        the resolved ``team_id`` in ``get_live_scores``.
+
+        Returns:
+            Dict mapping each alias (full name, nickname, code, ...) to the team's id
+        """
+        return {}
+
     async def is_player_supported(self, player_name: str) -> bool:
         """
         Check if a player is supported by this plugin.
@@ -138,6 +269,24 @@ class SportsBotPlugin(ABC):
         """
         return False
 
+    async def resolve_player(self, player_name: str, request_context: RequestContext) -> bool:
+        """
+        Check if a player is supported, recording what was resolved on the way.
+
+        Called by the core bot when routing player commands. Override it to set
+        ``request_context.entity``/``entity_id`` (and ``team_id`` if known) so
+        the stats methods don't have to look the player up again; they then
+        receive the same context as ``request_context``.
+
+        Args:
+            player_name: Name of the player to check
+            request_context: Context for the current command
+
+        Returns:
+            True if the player is supported, False otherwise
+        """
+        return await self.is_player_supported(player_name)
+
     async def handle_callback_query(self, update, context, data_dict: Dict[str, str]):
         """
         Handle callback query from keyboard interactions.
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .types.MatchScores import MatchScores
+
+logger = logging.getLogger(__name__)
+
+# Refresh callback: returns the per-team snapshot and whether any game is in progress
+SnapshotRefresh = Callable[[], Awaitable[Tuple[Dict[Hashable, MatchScores], bool]]]
+
+
+class ScoreboardPoller:
+    """
+    Keeps a per-team ``MatchScores`` snapshot of a live scoreboard in memory.
+
+    A background task calls ``refresh`` every ``live_interval`` seconds while
+    games are in progress and every ``idle_interval`` seconds otherwise, backing
+    off after failures. ``get`` only returns scores from a snapshot younger than
+    ``max_staleness`` seconds, so callers fall back to their regular upstream
+    path when the poller is idle or behind.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        refresh: SnapshotRefresh,
+        live_interval: float = 10.0,
+        idle_interval: float = 300.0,
+        max_staleness: float = 30.0,
+    ):
+        self.name = name
+        self.refresh = refresh
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.max_staleness = max_staleness
+
+        self._snapshot: Dict[Hashable, MatchScores] = {}
+        self._refreshed_at: Optional[float] = None
+        self._has_live_games = False
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> None:
+        """Start polling in the background. Must be called from a running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name=f"{self.name}-scoreboard-poller")
+
+    async def stop(self) -> None:
+        """Stop polling and wait for the background task to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get(self, team_key: Hashable) -> Optional[MatchScores]:
+        """
+        Look up a team in the current snapshot.
+
+        Args:
+            team_key: Plugin-specific team identifier the snapshot is keyed by
+
+        Returns:
+            The team's scores, or None if the team isn't in the snapshot or the
+            snapshot is older than ``max_staleness``
+        """
+        if self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.max_staleness:
+            self.misses += 1
+            return None
+
+        match_scores = self._snapshot.get(team_key)
+        if match_scores is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match_scores
+
+    async def refresh_now(self) -> None:
+        """Fetch a new snapshot and replace the current one."""
+        snapshot, has_live_games = await self.refresh()
+        self._snapshot = snapshot
+        self._has_live_games = has_live_games
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+
+    async def _run(self) -> None:
+        consecutive_failures = 0
+        while True:
+            try:
+                await self.refresh_now()
+                consecutive_failures = 0
+                interval = self.live_interval if self._has_live_games else self.idle_interval
+            except Exception as e:
+                self.failures += 1
+                consecutive_failures += 1
+                interval = min(self.live_interval * 2 ** consecutive_failures, self.idle_interval)
+                logger.warning(f"{self.name} scoreboard refresh failed, retrying in {interval:.0f}s: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self.is_running,
+            "teams": len(self._snapshot),
+            "live_games": self._has_live_games,
+            "age_seconds": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at is not None else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
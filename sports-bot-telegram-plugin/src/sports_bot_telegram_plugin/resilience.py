@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed call is worth retrying and counts against the endpoint's health.
+
+    HTTP errors other than 408 and 429 in the 4xx range mean the request itself
+    is wrong (e.g. an unknown team id), so they are neither.
+    """
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int) and 400 <= status_code < 500:
+        return status_code in (408, 429)
+    return True
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint is down.
+
+    After ``failure_threshold`` calls in a row fail, the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. Then a single trial call
+    is let through (half open): success closes the circuit, failure opens it
+    again for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go through now. In half open state, only the trial call may."""
+        if self.state == OPEN:
+            if self._clock() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opens += 1
+            self.state = OPEN
+            self.opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give up a trial call that ended without telling anything about the endpoint's health."""
+        self._trial_in_flight = False
+
+
+class ResilienceStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.short_circuits = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "short_circuits": self.short_circuits,
+        }
+
+
+class Resilience:
+    """
+    Wraps upstream calls with a circuit breaker per endpoint, hedged attempts
+    and retries with jittered exponential backoff.
+
+    Each attempt gets ``timeout`` seconds. If it hasn't answered after
+    ``hedge_after`` seconds, a second identical request is sent and whichever
+    succeeds first wins, which cuts tail latency from slow upstream servers.
+    Failed attempts are retried up to ``retries`` times after a random delay
+    of up to ``backoff_base * 2 ** attempt`` seconds (at most ``backoff_cap``),
+    so replicas don't retry in lockstep. The whole call gives up after
+    ``deadline`` seconds, which bounds latency while an upstream is down; once
+    the breaker opens, calls fail immediately with ``CircuitOpenError``.
+
+    Callers that can serve a cached response instead (see
+    ``CacheBackend.get_or_revalidate``) keep answering during an outage.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 6.0,
+        retries: int = 2,
+        hedge_after: Optional[float] = 2.0,
+        backoff_base: float = 0.2,
+        backoff_cap: float = 2.0,
+        deadline: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.hedge_after = hedge_after
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, ResilienceStats] = {}
+
+    @classmethod
+    def from_env(cls, **overrides) -> "Resilience":
+        """
+        Create a policy from the ``UPSTREAM_*`` settings shared by every plugin.
+
+        Args:
+            overrides: Constructor arguments that take precedence over the
+                environment, e.g. ``hedge_after=None`` for a metered API
+        """
+        hedge_after = os.getenv("UPSTREAM_HEDGE_AFTER", "2")
+        settings = dict(
+            timeout=float(os.getenv("UPSTREAM_TIMEOUT", "6")),
+            retries=int(os.getenv("UPSTREAM_RETRIES", "2")),
+            hedge_after=float(hedge_after) if hedge_after else None,
+            deadline=float(os.getenv("UPSTREAM_DEADLINE", "10")),
+            failure_threshold=int(os.getenv("UPSTREAM_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("UPSTREAM_BREAKER_RESET", "30")),
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def _get_stats(self, endpoint):
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = ResilienceStats()
+            self._stats[endpoint] = stats
+        return stats
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (starting at 0)."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def call(self, endpoint: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Call ``fetch`` under ``endpoint``'s breaker, hedging and retrying it.
+
+        Args:
+            endpoint: Name the breaker and stats are kept under
+            fetch: Zero-argument coroutine function performing one request
+
+        Returns:
+            The first successful result
+
+        Raises:
+            CircuitOpenError: If the endpoint's breaker is open
+            Exception: The last attempt's error, once retries or the deadline run out
+        """
+        breaker = self.breaker(endpoint)
+        stats = self._get_stats(endpoint)
+        stats.calls += 1
+        if not breaker.allow():
+            stats.short_circuits += 1
+            raise CircuitOpenError(f"Circuit breaker for {endpoint} is open")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await self._attempt(endpoint, fetch, min(self.timeout, deadline - loop.time()), stats)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not is_retryable(e):
+                        # The upstream answered, so it's up
+                        breaker.record_success()
+                        raise
+                    delay = self.backoff_delay(attempt)
+                    if attempt >= self.retries or loop.time() + delay >= deadline:
+                        stats.failures += 1
+                        breaker.record_failure()
+                        if breaker.state == OPEN:
+                            logger.warning(f"Circuit breaker for {endpoint} is open after {breaker.consecutive_failures} failures: {str(e)}")
+                        raise
+                    attempt += 1
+                    stats.retries += 1
+                    await asyncio.sleep(delay)
+                else:
+                    breaker.record_success()
+                    return result
+        finally:
+            breaker.release()
+
+    async def _attempt(self, endpoint, fetch, timeout, stats):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        first = asyncio.ensure_future(fetch())
+        pending = {first}
+        hedged = False
+        error = None
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                wait_for = remaining
+                if not hedged and self.hedge_after is not None and self.hedge_after < remaining:
+                    wait_for = self.hedge_after
+                done, pending = await asyncio.wait(pending, timeout=max(0, wait_for), return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+
+                if done:
+                    continue
+                if not hedged and wait_for < remaining:
+                    # Slow to answer, so race it with a second request
+                    hedged = True
+                    stats.hedges += 1
+                    pending.add(asyncio.ensure_future(fetch()))
+                    continue
+
+                stats.timeouts += 1
+                raise asyncio.TimeoutError(f"{endpoint} didn't answer within {timeout:.1f} seconds")
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {**stats.as_dict(), "breaker": self.breaker(endpoint).state}
+            for endpoint, stats in self._stats.items()
+        }
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical upstream calls.
+
+    While a call for ``key`` is in flight, every other caller asking for the
+    same key awaits the same result instead of issuing its own request, so a
+    burst of N identical requests costs one upstream call. Nothing is cached
+    once the call completes.
+
+    The call runs in its own task, so cancelling one caller (e.g. a losing
+    plugin probe) doesn't cancel it for the others. It is only cancelled once
+    every caller waiting for it has been.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` for ``key``, or join the call already in flight for it.
+
+        Args:
+            key: Identifies the upstream request (e.g. endpoint and params)
+            fn: Zero-argument coroutine function performing the request
+
+        Returns:
+            The result of the (possibly shared) call. Exceptions are shared too.
+        """
+        self.calls += 1
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.deduplicated += 1
+        else:
+            self.executions += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled, so nobody needs the result
+                self._land(key, flight)
+                flight.task.cancel()
+
+    def _land(self, key, flight):
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+GaugeValue = Union[float, Iterable[Tuple[Dict[str, str], float]]]
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+                break
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+class Metrics:
+    """
+    Span latency histograms and gauges, exported in Prometheus text format.
+
+    Wrap a stage of request handling in ``span`` (or decorate it with
+    ``traced``) to record its duration in the ``sports_bot_span_seconds``
+    histogram, labelled with the span name and any extra labels. Spans that
+    raise also count towards ``sports_bot_span_errors_total``. Keep label
+    values low-cardinality (endpoint names, not ids).
+
+    Gauges are read when metrics are exported, from callbacks registered with
+    ``register_gauge``.
+
+    If ``enable_opentelemetry`` has been called, every span is also exported as
+    an OpenTelemetry span, nested under the span active when it started.
+
+    Spans recorded in worker processes (e.g. the process render backend) stay
+    in that process and are not exported.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[LabelSet, Histogram] = {}
+        self._errors: Dict[LabelSet, int] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], GaugeValue]]] = {}
+        self._otel_tracer = None
+
+    @contextmanager
+    def span(self, name: str, **labels: str):
+        """
+        Time the enclosed block.
+
+        Args:
+            name: Stage name, e.g. ``"nba_api.boxscore"``
+            labels: Extra labels for the histogram (and OpenTelemetry span attributes)
+        """
+        label_set = (("span", name),) + tuple(sorted((key, str(value)) for key, value in labels.items()))
+        otel_span = None
+        if self._otel_tracer is not None:
+            otel_span = self._otel_tracer.start_as_current_span(name, attributes=dict(labels), record_exception=True)
+            otel_span.__enter__()
+
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            if not isinstance(e, asyncio.CancelledError):
+                self._errors[label_set] = self._errors.get(label_set, 0) + 1
+            if otel_span is not None:
+                otel_span.__exit__(type(e), e, e.__traceback__)
+                otel_span = None
+            raise
+        finally:
+            histogram = self._histograms.get(label_set)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self._histograms[label_set] = histogram
+            histogram.observe(time.perf_counter() - start)
+            if otel_span is not None:
+                otel_span.__exit__(None, None, None)
+
+    def traced(self, name: Optional[str] = None, **labels: str):
+        """
+        Decorator recording every call of a sync or async function as a span.
+
+        Args:
+            name: Span name, defaults to the function's qualified name
+            labels: Extra histogram labels
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            if asyncio.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, **labels):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_gauge(self, name: str, help_text: str, read: Callable[[], GaugeValue]) -> None:
+        """
+        Export a gauge whose value is read at export time.
+
+        Args:
+            name: Prometheus metric name
+            help_text: Metric description
+            read: Returns either a number, or ``(labels, value)`` pairs for a labelled gauge
+        """
+        self._gauges[name] = (help_text, read)
+
+    def enable_opentelemetry(self, service_name: str = "sports-bot-telegram", endpoint: Optional[str] = None) -> None:
+        """
+        Also export spans to an OpenTelemetry collector over OTLP/HTTP.
+
+        Requires the ``opentelemetry-sdk`` and ``opentelemetry-exporter-otlp-proto-http``
+        packages. Without an ``endpoint`` the exporter follows the standard
+        ``OTEL_EXPORTER_OTLP_*`` environment variables.
+        """
+        try:
+            from opentelemetry import trace
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError as e:
+            raise ImportError("OpenTelemetry export requires opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http") from e
+
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        exporter = OTLPSpanExporter(endpoint=endpoint) if endpoint else OTLPSpanExporter()
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+        self._otel_tracer = trace.get_tracer("sports_bot_telegram_plugin")
+        logger.info(f"Exporting spans to OpenTelemetry{f' at {endpoint}' if endpoint else ''}")
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._errors.clear()
+
+    def render_prometheus(self) -> str:
+        """Render every histogram, error counter and gauge in the Prometheus text format."""
+        lines: List[str] = [
+            "# HELP sports_bot_span_seconds Duration of instrumented stages",
+            "# TYPE sports_bot_span_seconds histogram",
+        ]
+        for label_set, histogram in sorted(self._histograms.items()):
+            cumulative = 0
+            for upper_bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"sports_bot_span_seconds_bucket{_format_labels(label_set + (('le', repr(upper_bound)),))} {cumulative}")
+            lines.append(f"sports_bot_span_seconds_bucket{_format_labels(label_set + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"sports_bot_span_seconds_sum{_format_labels(label_set)} {histogram.sum}")
+            lines.append(f"sports_bot_span_seconds_count{_format_labels(label_set)} {histogram.count}")
+
+        lines.append("# HELP sports_bot_span_errors_total Instrumented stages that raised")
+        lines.append("# TYPE sports_bot_span_errors_total counter")
+        for label_set, count in sorted(self._errors.items()):
+            lines.append(f"sports_bot_span_errors_total{_format_labels(label_set)} {count}")
+
+        for name, (help_text, read) in sorted(self._gauges.items()):
+            try:
+                value = read()
+            except Exception as e:
+                logger.warning(f"Could not read gauge {name}: {str(e)}")
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            if isinstance(value, (int, float)):
+                lines.append(f"{name} {value}")
+            else:
+                for labels, labelled_value in value:
+                    lines.append(f"{name}{_format_labels(tuple(sorted((key, str(label)) for key, label in labels.items())))} {labelled_value}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared by the bot and every plugin, so one /metrics endpoint covers everything
+metrics = Metrics()
+span = metrics.span
+traced = metrics.traced
@@ -0,0 +1,44 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+@dataclass
+class RequestContext:
+    """
+    Facts resolved while handling one command, so they are computed once.
+
+    The core bot creates a context while routing a query and hands it to the
+    plugin that matched. The plugin fills in what it resolved (e.g. the player
+    and their team) and can memoize upstream payloads it needs more than once.
+    """
+    query: str
+    entity: Optional[Any] = None
+    entity_id: Optional[Hashable] = None
+    team_id: Optional[Hashable] = None
+    payloads: Dict[Hashable, asyncio.Future] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.entity is not None or self.entity_id is not None
+
+    async def memoize(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Fetch ``key`` once per request. Concurrent callers share the same fetch.
+
+        Args:
+            key: Identifies the payload (e.g. endpoint name and arguments)
+            fetch: Zero-argument coroutine function returning the payload
+
+        Returns:
+            The payload. Failed fetches are not memoized.
+        """
+        future = self.payloads.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self.payloads[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self.payloads.get(key) is future:
+                del self.payloads[key]
+            raise
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The plugin interface, straight from the source tree
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
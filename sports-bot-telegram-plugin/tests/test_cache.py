@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from sports_bot_telegram_plugin import DiskCacheBackend, MemoryCacheBackend, RedisCacheBackend, cache, create_cache_backend
+
+
+@pytest.fixture(params=["memory", "disk", "fakeredis"])
+def make_backend(request, tmp_path):
+    """Creates clients of one store; every client of a shared backend sees the same entries."""
+    if request.param == "memory":
+        backend = create_cache_backend("memory://")
+        return lambda: backend
+    if request.param == "disk":
+        pytest.importorskip("diskcache")
+        return lambda: DiskCacheBackend(str(tmp_path / "cache"), lock_poll_interval=0.01)
+    fakeredis = pytest.importorskip("fakeredis")
+    assert isinstance(create_cache_backend("fakeredis://"), RedisCacheBackend)
+    server = fakeredis.FakeServer()
+    return lambda: RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server), lock_poll_interval=0.01)
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """Fakes the wall clock ``get_or_revalidate`` keeps expiry times in."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+class Upstream:
+    def __init__(self):
+        self.version = 0
+        self.down = False
+
+    async def fetch(self):
+        if self.down:
+            raise ConnectionError("upstream is down")
+        self.version += 1
+        return f"v{self.version}"
+
+
+def test_stale_value_is_served_while_it_revalidates(wall_clock):
+    backend = MemoryCacheBackend()
+    upstream = Upstream()
+
+    async def main():
+        assert await backend.get_or_revalidate("key", upstream.fetch, ttl=10, stale_while_revalidate=5) == "v1"
+        wall_clock[0] += 12
+        # Stale, returned at once and refreshed in the background
+        assert await backend.get_or_revalidate("key", upstream.fetch, ttl=10, stale_while_revalidate=5) == "v1"
+        await asyncio.sleep(0.01)
+        assert await backend.get_or_revalidate("key", upstream.fetch, ttl=10, stale_while_revalidate=5) == "v2"
+
+    asyncio.run(main())
+    assert backend.stats()["stale_hits"] == 1
+    assert backend.stats()["hits"] == 1
+
+
+def test_stale_value_is_served_if_the_refresh_fails(wall_clock):
+    backend = MemoryCacheBackend()
+    upstream = Upstream()
+
+    def get():
+        return backend.get_or_revalidate("key", upstream.fetch, ttl=10, stale_while_revalidate=5, stale_if_error=100)
+
+    async def main():
+        assert await get() == "v1"
+        upstream.down = True
+        wall_clock[0] += 50
+        # Past the revalidation window the refresh comes first, and failing falls back to the stale value
+        assert await get() == "v1"
+        assert backend.stats()["stale_errors"] == 1
+
+        upstream.down = False
+        assert await get() == "v2"
+
+        upstream.down = True
+        wall_clock[0] += 120
+        # Too old to fall back to
+        with pytest.raises(ConnectionError):
+            await get()
+
+    asyncio.run(main())
+
+
+def test_get_set_delete(make_backend):
+    backend = make_backend()
+
+    async def main():
+        assert await backend.get("missing") is None
+        await backend.set("key", {"scores": [1, 2]})
+        assert await backend.get("key") == {"scores": [1, 2]}
+        await backend.delete("key")
+        assert await backend.get("key") is None
+        await backend.aclose()
+
+    asyncio.run(main())
+
+
+def test_values_expire_after_their_ttl(make_backend):
+    backend = make_backend()
+
+    async def main():
+        await backend.set("short", "value", ttl=0.05)
+        await backend.set("forever", "value")
+        assert await backend.get("short") == "value"
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.get("forever") == "value"
+        await backend.aclose()
+
+    asyncio.run(main())
+
+
+def test_lock_is_held_until_released_or_expired(make_backend):
+    backend = make_backend()
+
+    async def main():
+        token = await backend.acquire_lock("lock:key", ttl=5)
+        assert token is not None
+        assert await backend.acquire_lock("lock:key", ttl=5) is None
+        # Only the holder's token releases it
+        await backend.release_lock("lock:key", "someone else")
+        assert await backend.acquire_lock("lock:key", ttl=5) is None
+        await backend.release_lock("lock:key", token)
+        assert await backend.acquire_lock("lock:key", ttl=0.05) is not None
+        await asyncio.sleep(0.1)
+        assert await backend.acquire_lock("lock:key", ttl=5) is not None
+        await backend.aclose()
+
+    asyncio.run(main())
+
+
+def test_replicas_share_one_fetch(make_backend):
+    replica_a, replica_b = make_backend(), make_backend()
+    if not replica_a.shared:
+        pytest.skip("Not shared between clients")
+    fetches = []
+
+    def fetcher(name):
+        async def fetch():
+            fetches.append(name)
+            await asyncio.sleep(0.1)
+            return f"from {name}"
+        return fetch
+
+    async def main():
+        a = asyncio.create_task(replica_a.get_or_fetch("key", fetcher("a"), ttl=60))
+        await asyncio.sleep(0.02)
+        b = await replica_b.get_or_fetch("key", fetcher("b"), ttl=60)
+        results = (await a, b)
+        await replica_a.aclose()
+        await replica_b.aclose()
+        return results
+
+    assert asyncio.run(main()) == ("from a", "from a")
+    assert fetches == ["a"]
+    assert replica_b.stats()["lock_waits"] == 1
+    assert replica_b.stats()["shared_hits"] == 1
+
+
+def test_replicas_wait_for_the_refresh_of_a_stale_value(make_backend, wall_clock):
+    replica_a, replica_b = make_backend(), make_backend()
+    if not replica_a.shared:
+        pytest.skip("Not shared between clients")
+    upstream = Upstream()
+
+    async def slow_fetch():
+        await asyncio.sleep(0.1)
+        return await upstream.fetch()
+
+    def get(replica):
+        return replica.get_or_revalidate("key", slow_fetch, ttl=10, stale_while_revalidate=5, stale_if_error=100)
+
+    async def main():
+        assert await get(replica_a) == "v1"
+        # Past the revalidation window, so both refresh before returning
+        wall_clock[0] += 50
+        a = asyncio.create_task(get(replica_a))
+        await asyncio.sleep(0.02)
+        b = await get(replica_b)
+        results = (await a, b)
+        await replica_a.aclose()
+        await replica_b.aclose()
+        return results
+
+    # Replica B waits for A's refresh instead of returning the stale v1
+    assert asyncio.run(main()) == ("v2", "v2")
+    assert upstream.version == 2
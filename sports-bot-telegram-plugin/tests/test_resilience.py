@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from sports_bot_telegram_plugin import CircuitBreaker, CircuitOpenError, Resilience
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 30
+    # A single trial call goes through
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    # It fails, so the breaker opens for another reset_timeout
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opens == 2
+    clock.now += 29
+    assert not breaker.allow()
+
+    clock.now += 1
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_released_trial_lets_the_next_call_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_failing_endpoint_short_circuits():
+    resilience = Resilience(retries=0, hedge_after=None, failure_threshold=2)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("down")
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await resilience.call("scoreboard", fetch)
+        with pytest.raises(CircuitOpenError):
+            await resilience.call("scoreboard", fetch)
+
+    asyncio.run(main())
+    assert calls == 2
+    stats = resilience.stats()["scoreboard"]
+    assert stats["breaker"] == "open"
+    assert stats["failures"] == 2
+    assert stats["short_circuits"] == 1
+
+
+def test_failures_are_retried():
+    resilience = Resilience(retries=2, hedge_after=None, backoff_base=0.001)
+    errors = [ConnectionError("reset"), asyncio.TimeoutError()]
+
+    async def fetch():
+        if errors:
+            raise errors.pop(0)
+        return "scores"
+
+    assert asyncio.run(resilience.call("scoreboard", fetch)) == "scores"
+    stats = resilience.stats()["scoreboard"]
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
+    assert stats["breaker"] == "closed"
+
+
+def test_client_errors_are_not_retried_and_keep_the_breaker_closed():
+    resilience = Resilience(retries=2, hedge_after=None, failure_threshold=1)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        raise HTTPError(404)
+
+    with pytest.raises(HTTPError):
+        asyncio.run(resilience.call("team", fetch))
+    assert calls == 1
+    assert resilience.stats()["team"]["breaker"] == "closed"
+
+
+def test_hedge_wins_and_cancels_the_slow_attempt():
+    resilience = Resilience(hedge_after=0.05, retries=0)
+    attempts = []
+
+    async def fetch():
+        attempt = len(attempts)
+        attempts.append("started")
+        try:
+            await asyncio.sleep(5 if attempt == 0 else 0.01)
+        except asyncio.CancelledError:
+            attempts[attempt] = "cancelled"
+            raise
+        attempts[attempt] = "answered"
+        return f"attempt {attempt}"
+
+    async def main():
+        result = await resilience.call("boxscore", fetch)
+        # Let the cancellation land
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == "attempt 1"
+    assert attempts == ["cancelled", "answered"]
+    stats = resilience.stats()["boxscore"]
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_slow_attempts_time_out():
+    resilience = Resilience(timeout=0.05, retries=0, hedge_after=None)
+
+    async def fetch():
+        await asyncio.sleep(5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(resilience.call("standings", fetch))
+    assert resilience.stats()["standings"]["timeouts"] == 1
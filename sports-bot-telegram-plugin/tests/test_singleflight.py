@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from sports_bot_telegram_plugin import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return "payload"
+
+    async def main():
+        return await asyncio.gather(*(single_flight.do("key", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["payload"] * 5
+    assert executions == 1
+    assert single_flight.stats() == {"calls": 5, "executions": 1, "deduplicated": 4, "in_flight": 0}
+
+
+def test_exceptions_are_shared():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def main():
+        return await asyncio.gather(single_flight.do("key", fetch), single_flight.do("key", fetch), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not single_flight.is_in_flight("key")
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    single_flight = SingleFlight()
+    release = None
+
+    async def fetch():
+        await release.wait()
+        return "payload"
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        leader = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+
+        # e.g. a losing plugin probe cancelled by first-match-wins probing
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "payload"
+    assert single_flight.stats()["executions"] == 1
+
+
+def test_call_is_cancelled_once_every_caller_is():
+    single_flight = SingleFlight()
+    cancelled = False
+
+    async def fetch():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def retry():
+        return "fresh"
+
+    async def main():
+        callers = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        # A new caller starts a new call rather than joining the cancelled one
+        result = await single_flight.do("key", retry)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == "fresh"
+    assert cancelled
+    assert not single_flight.is_in_flight("key")
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from sports_bot_telegram_plugin import Metrics, tracing
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Makes ``span`` measure whatever durations the test feeds in, instead of wall time."""
+    readings = []
+    monkeypatch.setattr(tracing.time, "perf_counter", lambda: readings.pop(0))
+
+    def take(seconds):
+        readings.extend([0.0, seconds])
+    return take
+
+
+def test_histogram_buckets_are_cumulative(clock):
+    metrics = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.25, 0.5, 5.0, 0.0625):
+        clock(seconds)
+        with metrics.span("nba_api.boxscore", endpoint="boxscore"):
+            pass
+
+    lines = metrics.render_prometheus().splitlines()
+    assert lines[:2] == [
+        "# HELP sports_bot_span_seconds Duration of instrumented stages",
+        "# TYPE sports_bot_span_seconds histogram",
+    ]
+    assert lines[2:7] == [
+        'sports_bot_span_seconds_bucket{span="nba_api.boxscore",endpoint="boxscore",le="0.1"} 1',
+        'sports_bot_span_seconds_bucket{span="nba_api.boxscore",endpoint="boxscore",le="1.0"} 3',
+        'sports_bot_span_seconds_bucket{span="nba_api.boxscore",endpoint="boxscore",le="+Inf"} 4',
+        'sports_bot_span_seconds_sum{span="nba_api.boxscore",endpoint="boxscore"} 5.8125',
+        'sports_bot_span_seconds_count{span="nba_api.boxscore",endpoint="boxscore"} 4',
+    ]
+
+
+def test_errors_are_counted_except_cancellation(clock):
+    metrics = Metrics()
+
+    @metrics.traced("handler.scores")
+    async def handler(error):
+        raise error
+
+    async def main():
+        for error in (ValueError("boom"), ValueError("boom"), asyncio.CancelledError()):
+            clock(0.01)
+            with pytest.raises(type(error)):
+                await handler(error)
+
+    asyncio.run(main())
+    lines = metrics.render_prometheus().splitlines()
+    errors = lines.index("# TYPE sports_bot_span_errors_total counter")
+    assert lines[errors - 1] == "# HELP sports_bot_span_errors_total Instrumented stages that raised"
+    assert lines[errors + 1:] == ['sports_bot_span_errors_total{span="handler.scores"} 2']
+    # Cancelled calls are still timed
+    assert 'sports_bot_span_seconds_count{span="handler.scores"} 3' in lines
+
+
+def test_gauges_are_read_at_render_time():
+    metrics = Metrics()
+    queued = [3]
+    metrics.register_gauge("sports_bot_queued", "Queued updates", lambda: queued[0])
+    metrics.register_gauge("sports_bot_cache_entries", "Cache entries", lambda: [({"cache": 'say "hi"\n'}, 7)])
+    metrics.register_gauge("sports_bot_broken", "Raises", lambda: 1 / 0)
+
+    queued[0] = 5
+    text = metrics.render_prometheus()
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert lines[-6:] == [
+        "# HELP sports_bot_cache_entries Cache entries",
+        "# TYPE sports_bot_cache_entries gauge",
+        'sports_bot_cache_entries{cache="say \\"hi\\"\\n"} 7',
+        "# HELP sports_bot_queued Queued updates",
+        "# TYPE sports_bot_queued gauge",
+        "sports_bot_queued 5",
+    ]
+    assert not any("sports_bot_broken" in line for line in lines)
+
+
+class StubCollector:
+    """An OTLP/HTTP collector that records what it is sent."""
+
+    def __init__(self):
+        self.requests = []
+        self.received = threading.Event()
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                collector.requests.append((self.path, self.headers["Content-Type"], body))
+                collector.received.set()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-protobuf")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_spans_are_exported_over_otlp(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.http")
+    from opentelemetry import trace
+
+    with StubCollector() as collector:
+        monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", collector.url)
+        monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+        metrics = Metrics()
+        metrics.enable_opentelemetry(service_name="sports-bot-test")
+
+        with metrics.span("handler.scores", command="nba"):
+            with metrics.span("nba_api.scoreboard"):
+                pass
+        trace.get_tracer_provider().force_flush()
+        assert collector.received.wait(5)
+
+    path, content_type, body = collector.requests[0]
+    assert path == "/v1/traces"
+    assert content_type == "application/x-protobuf"
+    for expected in (b"sports-bot-test", b"handler.scores", b"nba_api.scoreboard", b"command", b"nba"):
+        assert expected in body
+    # The spans are still timed locally
+    assert 'sports_bot_span_seconds_count{span="nba_api.scoreboard"} 1' in metrics.render_prometheus().splitlines()
@@ -0,0 +1,346 @@
+"""
+Command Path Benchmark
+======================
+
+Drives the real command handlers in ``bot/main.py`` (``/scores``, batch
+``/scores``, ``/stats``, ``/careerstats``) and the NBA plugin's ``/fts`` with
+fake ``Update``/``context`` objects, against a local fixture server replaying
+ESPN, Football-API and NBA stats/live JSON from ``benchmarks/fixtures``. The
+NBA and FIFA plugins are loaded from the source tree and pointed at the fixture
+server through their base URL settings, so nothing touches the network.
+
+For every command it reports throughput, p50/p95/p99 latency, memory allocated
+per request (peak and retained, from ``tracemalloc`` in a separate pass) and
+upstream calls made, by upstream. By default caches stay warm between requests,
+as in production; ``--cold`` clears every cache before each request to measure
+the uncached path (downloaded team logos stay cached either way).
+
+Fixture files are looked up by request path under the upstream's directory,
+preferring a variant named after a query parameter, e.g. a request for
+``fixtures?league=1&status=FT`` is served ``fixtures@status=FT.json`` if it
+exists and ``fixtures.json`` otherwise. ``{{FIXTURE_SERVER}}`` in a fixture is
+replaced by the server's URL (used for team logos, which the server draws).
+
+Run from the ``sports-bot-telegram`` directory:
+
+    python benchmarks/bench_commands.py [-n 200] [-c 8] [--cold] [--fifa-api espn|football-api] [--upstream-latency-ms 20] [--commands scores_nba,fts]
+"""
+
+import argparse
+import asyncio
+import importlib
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+# The plugin interface and both plugins, straight from the source tree
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+for package_src in ("sports-bot-telegram-plugin/src", "sports-bot-plugins/nba-plugin/src", "sports-bot-plugins/fifa-world-cup-plugin/src"):
+    sys.path.append(os.path.join(REPO_DIR, package_src))
+
+from PIL import Image
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+UPSTREAMS = ("nba-stats", "nba-live", "espn", "football-api")
+
+# Benchmarked commands; their handlers are looked up once the bot is imported
+COMMANDS = {
+    "scores_nba": "/scores lakers",
+    "scores_fifa": "/scores argentina",
+    "scores_fifa_previous": "/scores brazil",
+    "scores_batch": "/scores lakers, celtics, argentina, brazil",
+    "stats": "/stats lebron james",
+    "careerstats": "/careerstats lebron james",
+    "fts": "/fts lebron james",
+}
+
+
+class FixtureServer:
+    """Minimal HTTP server replaying the recorded upstream JSON, counting requests per upstream."""
+
+    def __init__(self, fixtures_dir, latency=0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.port = None
+        self.calls = Counter()
+        self.misses = Counter()
+        self._server = None
+        self._connections = set()
+        self._logos = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        # Keep-alive connections from the bot's HTTP clients are still open
+        for connection in self._connections:
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                _, target, _ = lines[0].split(" ", 2)
+                headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:] if line)}
+                if int(headers.get("content-length", "0")):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, content_type, payload = self._respond(target)
+                writer.write((
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n"
+                ).encode("latin-1") + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # Finishing normally when stopped; asyncio.start_server logs cancelled handlers as errors
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    def _respond(self, target):
+        url = urlsplit(target)
+        upstream, _, path = url.path.lstrip("/").partition("/")
+
+        if upstream == "logos":
+            self.calls["logos"] += 1
+            return "200 OK", "image/png", self._logo(path)
+
+        self.calls[upstream] += 1
+        fixture_path = self._find_fixture(upstream, path, parse_qsl(url.query, keep_blank_values=True))
+        if fixture_path is None:
+            self.misses[f"{upstream}/{path}"] += 1
+            return "404 Not Found", "application/json", b"{}"
+        with open(fixture_path, encoding="utf-8") as fixture:
+            return "200 OK", "application/json", fixture.read().replace("{{FIXTURE_SERVER}}", self.url).encode("utf-8")
+
+    def _find_fixture(self, upstream, path, params):
+        if upstream not in UPSTREAMS or ".." in path:
+            return None
+        base = os.path.join(self.fixtures_dir, upstream, path)
+        if base.endswith(".json"):
+            base = base[:-len(".json")]
+        for name, value in params:
+            candidate = f"{base}@{name}={value}.json"
+            if os.path.isfile(candidate):
+                return candidate
+        return f"{base}.json" if os.path.isfile(f"{base}.json") else None
+
+    def _logo(self, name):
+        payload = self._logos.get(name)
+        if payload is None:
+            shade = sum(name.encode("utf-8")) % 200
+            buffer = io.BytesIO()
+            Image.new("RGBA", (256, 256), (shade, 80, 255 - shade, 255)).save(buffer, format="PNG")
+            payload = buffer.getvalue()
+            self._logos[name] = payload
+        return payload
+
+
+class FakeBot:
+    """Stands in for ``telegram.Bot``, recording what would have been sent."""
+
+    def __init__(self):
+        self.sent = Counter()
+        self.last_text = None
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent["message"] += 1
+        self.last_text = text
+        return SimpleNamespace(message_id=1, chat_id=chat_id, sticker=None)
+
+    async def send_sticker(self, chat_id, sticker, **kwargs):
+        self.sent["sticker"] += 1
+        return SimpleNamespace(message_id=1, chat_id=chat_id, sticker=SimpleNamespace(file_id=f"sticker-{self.sent['sticker']}"))
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        self.sent["photo"] += 1
+        return SimpleNamespace(message_id=1, chat_id=chat_id, sticker=None)
+
+    async def delete_message(self, chat_id, message_id, **kwargs):
+        return True
+
+
+def make_update(text, chat_id):
+    chat = SimpleNamespace(id=chat_id, type="private")
+    message = SimpleNamespace(text=text, chat_id=chat_id, chat=chat, message_id=1)
+    return SimpleNamespace(message=message, effective_chat=chat, callback_query=None)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def setup_bot(server, fifa_api):
+    # The plugins read their base URLs and the bot its settings at import time
+    os.environ["NBA_STATS_BASE_URL"] = f"{server.url}/nba-stats"
+    os.environ["NBA_LIVE_BASE_URL"] = f"{server.url}/nba-live"
+    os.environ["FIFA_ESPN_BASE_URL"] = f"{server.url}/espn"
+    os.environ["FOOTBALL_API_BASE_URL"] = f"{server.url}/football-api"
+    os.environ["FIFA_API"] = "ESPN" if fifa_api == "espn" else "FOOTBALL_API"
+    os.environ["FOOTBALL_API_KEY"] = "fixture"
+    os.environ.setdefault("TELEGRAM_TOKEN", "123456:bench")
+    os.environ["LOGO_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-logo-cache-")
+    os.environ["FOLLOW_STORE_PATH"] = os.path.join(os.environ["LOGO_CACHE_DIR"], "subscriptions.json")
+    os.environ["NO_PROXY"] = os.environ["no_proxy"] = "127.0.0.1,localhost"
+
+    bot_main = importlib.import_module("bot.main")
+    from bot.plugin_management import PluginManager
+    from nba_plugin.plugin import NBAPlugin
+    from fifa_world_cup_plugin.plugin import FifaWorldCupPlugin
+    from sports_bot_telegram_plugin import MemoryCacheBackend
+
+    nba_plugin = NBAPlugin()
+    PluginManager.register_plugin("nba", nba_plugin)
+    PluginManager.register_plugin("fifa_world_cup", FifaWorldCupPlugin())
+    # In memory rather than the FIFA plugin's default disk cache, so --cold can clear it
+    cache_backend = MemoryCacheBackend()
+    PluginManager.set_http_client(bot_main.http_client)
+    PluginManager.set_cache_backend(cache_backend)
+    bot_main.logo_registry.load()
+    await PluginManager.build_team_index()
+    await PluginManager.start()
+
+    handlers = {
+        "scores_nba": bot_main.scores_command_handler,
+        "scores_fifa": bot_main.scores_command_handler,
+        "scores_fifa_previous": bot_main.scores_command_handler,
+        "scores_batch": bot_main.scores_command_handler,
+        "stats": bot_main.current_stats_command_handler,
+        "careerstats": bot_main.career_stats_command_handler,
+        "fts": nba_plugin.ft_command_handler,
+    }
+
+    def clear_caches():
+        cache_backend.clear()
+        bot_main.sticker_cache.clear()
+
+    return bot_main, PluginManager, handlers, clear_caches
+
+
+async def run_command(handler, text, requests, concurrency, clear_caches=None):
+    bot = FakeBot()
+    context = SimpleNamespace(bot=bot, bot_data={}, user_data={}, chat_data={})
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with slots:
+            if clear_caches:
+                clear_caches()
+            start = time.perf_counter()
+            await handler(make_update(text, 1000 + index % 50), context)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return time.perf_counter() - start, sorted(latencies), bot
+
+
+async def measure_allocations(handler, text, requests, clear_caches=None):
+    """Run ``requests`` requests one at a time under tracemalloc, returning peak and retained KiB per request."""
+    bot = FakeBot()
+    context = SimpleNamespace(bot=bot, bot_data={}, user_data={}, chat_data={})
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        peaks = []
+        for index in range(requests):
+            if clear_caches:
+                clear_caches()
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await handler(make_update(text, 1000 + index), context)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks) / 1024, (retained - baseline) / requests / 1024
+
+
+async def main_async(args):
+    logging.basicConfig(level=logging.WARNING)
+    server = FixtureServer(FIXTURES_DIR, latency=args.upstream_latency_ms / 1000)
+    await server.start()
+    bot_main, plugin_manager, handlers, clear_caches = await setup_bot(server, args.fifa_api)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    commands = args.commands.split(",") if args.commands else list(COMMANDS)
+    print(f"{args.requests} requests per command, concurrency {args.concurrency}, "
+          f"{'cold' if args.cold else 'warm'} caches, upstream latency {args.upstream_latency_ms:g}ms, FIFA API {args.fifa_api}")
+    print(f"{'command':<22}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}{'kept KiB':>10}  upstream calls/request, replies")
+
+    try:
+        for name in commands:
+            handler, text = handlers[name], COMMANDS[name]
+            # One untimed request, so warm runs measure steady state rather than the first fetch
+            if not args.cold:
+                await handler(make_update(text, 999), SimpleNamespace(bot=FakeBot(), bot_data={}, user_data={}, chat_data={}))
+
+            server.calls.clear()
+            elapsed, latencies, bot = await run_command(handler, text, args.requests, args.concurrency, clear_caches if args.cold else None)
+            calls = dict(server.calls)
+            peak_kib, retained_kib = await measure_allocations(handler, text, args.alloc_requests, clear_caches if args.cold else None)
+
+            upstream = ", ".join(f"{upstream} {count / args.requests:.2f}" for upstream, count in sorted(calls.items())) or "none"
+            print(
+                f"{name:<22}{args.requests / elapsed:>9,.1f}"
+                f"{statistics.median(latencies) * 1000:>9.1f}{percentile(latencies, 0.95) * 1000:>9.1f}{percentile(latencies, 0.99) * 1000:>9.1f}"
+                f"{peak_kib:>10,.0f}{retained_kib:>10,.1f}  {upstream}; {dict(bot.sent)}"
+            )
+            if args.verbose and bot.last_text:
+                print(f"{'':<22}last reply: {bot.last_text}")
+
+        if server.misses:
+            print(f"Requests without a fixture: {dict(server.misses)}")
+    finally:
+        await plugin_manager.shutdown()
+        await bot_main.http_client.aclose()
+        bot_main.render_executor.shutdown()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Requests per command")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--alloc-requests", type=int, default=20, help="Requests per command in the tracemalloc pass")
+    parser.add_argument("--cold", action="store_true", help="Clear every cache before each request")
+    parser.add_argument("--fifa-api", choices=("espn", "football-api"), default="espn", help="Upstream the FIFA plugin uses")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20, help="Delay the fixture server adds to every response")
+    parser.add_argument("--commands", help=f"Comma-separated subset of: {', '.join(COMMANDS)}")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print each command's last text reply")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
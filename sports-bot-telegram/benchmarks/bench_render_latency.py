@@ -0,0 +1,118 @@
+"""
+Render Latency Benchmark
+========================
+
+Measures p50/p99 ``/scores`` latency under concurrent requests when score
+stickers are rendered inline on the event loop ("before") versus through the
+render executor ("after"). Each simulated request waits on a fake upstream call
+and then renders a distinct sticker, so the sticker cache never short-circuits.
+The worst event loop stall seen during each run is reported too, since that is
+the delay every other chat sees while a render blocks the loop.
+
+Run from the ``sports-bot-telegram`` directory:
+
+    python benchmarks/bench_render_latency.py [-c 32] [--upstream-ms 50] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from bot.image_generator import render_score_webp
+from bot.render_executor import RenderExecutor
+
+
+def make_scores(request_id):
+    return MatchScores(
+        home_team="Lakers",
+        home_score=request_id,
+        home_team_record="30-12",
+        away_team="Celtics",
+        away_score=99,
+        away_team_record="33-9",
+        game_status="4th Qtr",
+        game_start_time="19:30 ET",
+        game_curr_time="02:31",
+    )
+
+
+async def simulated_request(request_id, upstream_delay, render):
+    start = time.perf_counter()
+    await asyncio.sleep(upstream_delay)
+    await render(make_scores(request_id))
+    return time.perf_counter() - start
+
+
+async def run_load(concurrency, upstream_delay, render):
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def watch_loop():
+        nonlocal max_stall
+        tick = 0.005
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(tick)
+            max_stall = max(max_stall, time.perf_counter() - before - tick)
+
+    watcher = asyncio.create_task(watch_loop())
+    latencies = await asyncio.gather(*(
+        simulated_request(request_id, upstream_delay, render) for request_id in range(concurrency)
+    ))
+    done.set()
+    await watcher
+    return latencies, max_stall
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label, result):
+    latencies, max_stall = result
+    print(
+        f"{label:<20} p50 {percentile(latencies, 50) * 1000:8.1f} ms"
+        f"  p99 {percentile(latencies, 99) * 1000:8.1f} ms"
+        f"  mean {statistics.mean(latencies) * 1000:8.1f} ms"
+        f"  max loop stall {max_stall * 1000:8.1f} ms"
+    )
+
+
+async def main_async(args):
+    async def render_inline(team_scores):
+        render_score_webp(team_scores)
+
+    # Warm up fonts and logos
+    await render_inline(make_scores(0))
+
+    report("inline (before)", await run_load(args.concurrency, args.upstream_ms / 1000, render_inline))
+
+    for backend in ("thread", "process"):
+        executor = RenderExecutor(backend=backend, max_workers=args.workers, max_pending=args.concurrency)
+
+        async def render_offloaded(team_scores):
+            await executor.submit(render_score_webp, team_scores)
+
+        await render_offloaded(make_scores(0))
+        report(f"{backend} pool (after)", await run_load(args.concurrency, args.upstream_ms / 1000, render_offloaded))
+        executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--upstream-ms", type=float, default=50, help="Simulated upstream latency per request")
+    parser.add_argument("--workers", type=int, default=4)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Score Card Benchmark
+====================
+
+Microbenchmark of score card renders per second: the original from-scratch
+``render_score_img`` (vendored in ``score_card_reference.py``), which loads the
+score font and decodes the team logos on every render, versus
+``ScoreCardCompositor``, which reuses the cached background for a matchup and
+only draws the score, clock and status. WebP encoding is excluded since both
+paths share it.
+
+Run from the ``sports-bot-telegram`` directory:
+
+    python benchmarks/bench_score_card.py [-n 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from bot.image_generator import score_card_compositor
+from score_card_reference import render_score_img
+
+
+def make_scores(tick):
+    # The score and clock change between renders while the matchup stays the same
+    return MatchScores(
+        home_team="Lakers",
+        home_score=80 + tick % 40,
+        home_team_record="30-12",
+        away_team="Celtics",
+        away_score=78 + tick % 37,
+        away_team_record="33-9",
+        game_status="4th Qtr",
+        game_start_time="19:30 ET",
+        game_curr_time=f"{tick % 12:02d}:{tick % 60:02d}",
+    )
+
+
+def measure(label, render, iterations):
+    start = time.perf_counter()
+    for tick in range(iterations):
+        render(make_scores(tick))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {iterations / elapsed:8.1f} renders/s  ({elapsed * 1000 / iterations:.3f} ms/render)")
+    return iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    # Warm up fonts and logos
+    render_score_img(make_scores(0))
+    score_card_compositor.render(make_scores(0))
+
+    baseline = measure("render_score_img", render_score_img, args.iterations)
+    composited = measure("ScoreCardCompositor", score_card_compositor.render, args.iterations)
+    print(f"speedup: {composited / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Startup Benchmark
+=================
+
+Measures how long the bot takes to start, each run in a fresh interpreter,
+with plugins loaded lazily (``PLUGIN_LOADING=lazy``, the default), lazily with
+``PLUGIN_WARMUP`` on and eagerly:
+
+- import: importing ``bot.main``
+- ready: discovering the plugins, registering their handlers and commands and
+  running the rest of ``post_init`` (logos, team index, plugin start), i.e.
+  everything before the bot takes its first update
+- first use: loading, starting and indexing the plugins that aren't yet, plus
+  the fonts (and with warm-up, the team logos), which with lazy loading the
+  first command or the background warm-up pays for
+- max RSS once ready
+
+Then it breaks the lazy startup down ``python -X importtime``-style: the
+slowest imports before the bot is ready and on first use. The NBA and FIFA
+plugins are loaded from the source tree through entry points built on the fly,
+and the FIFA plugin's team list is served from ``benchmarks/fixtures``.
+
+``--max-ready-ms`` exits with status 1 if the lazy import + ready time exceeds
+it, to catch startup regressions.
+
+Run from the ``sports-bot-telegram`` directory:
+
+    python benchmarks/bench_startup.py [-r 5] [--top 15] [--max-ready-ms 1500]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+# The plugin interface and both plugins, straight from the source tree
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+PACKAGE_SRCS = ("sports-bot-telegram-plugin/src", "sports-bot-plugins/nba-plugin/src", "sports-bot-plugins/fifa-world-cup-plugin/src")
+ENTRY_POINTS = {
+    "nba": "nba_plugin.plugin:register_plugin",
+    "fifa_world_cup": "fifa_world_cup_plugin.plugin:register_plugin",
+}
+# PLUGIN_LOADING, with "-warmup" for PLUGIN_WARMUP
+MODES = ("lazy", "lazy-warmup", "eager")
+# Written to stderr between phases, to split the -X importtime report
+FIRST_USE_MARKER = "-- first use"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_child(mode):
+    """Start the bot up to the point it takes updates, and print the timings as JSON."""
+    loading, _, warmup = mode.partition("-")
+    start = time.perf_counter()
+    import bot.main as bot_main
+    import_seconds = time.perf_counter() - start
+
+    import logging
+    import resource
+    from importlib.metadata import EntryPoint
+    from telegram.ext import ApplicationBuilder
+    from bot.plugin_management import PluginManager
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async def start_up():
+        ready_start = time.perf_counter()
+        # What main() and post_init do, short of talking to Telegram
+        PluginManager.configure_loading(loading)
+        for name, value in ENTRY_POINTS.items():
+            PluginManager.register_entry_point(EntryPoint(name, value, "sports_bot_telegram_plugins"))
+        application = ApplicationBuilder().token(os.environ["TELEGRAM_TOKEN"]).build()
+        PluginManager.setup_plugin_handlers(application)
+        PluginManager.set_http_client(bot_main.http_client)
+        commands = [command for plugin in PluginManager.get_all_plugins() for command in plugin.commands]
+        if not warmup:
+            bot_main.logo_registry.load()
+        await PluginManager.build_team_index()
+        await PluginManager.start()
+        ready_seconds = time.perf_counter() - ready_start
+        max_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        print(FIRST_USE_MARKER, file=sys.stderr, flush=True)
+        first_use_start = time.perf_counter()
+        await asyncio.gather(
+            PluginManager.load_plugins(),
+            asyncio.to_thread(bot_main.logo_registry.load),
+            asyncio.to_thread(bot_main.load_fonts),
+        )
+        first_use_seconds = time.perf_counter() - first_use_start
+
+        await PluginManager.shutdown()
+        await bot_main.http_client.aclose()
+        bot_main.render_executor.shutdown()
+        return {
+            "import_ms": import_seconds * 1000,
+            "ready_ms": ready_seconds * 1000,
+            "first_use_ms": first_use_seconds * 1000,
+            "max_rss_mib": max_rss_mib,
+            "commands": len(commands),
+            "team_aliases": len(PluginManager._team_index),
+        }
+
+    print(json.dumps(asyncio.run(start_up())))
+
+
+class BackgroundFixtureServer:
+    """Runs ``bench_commands.FixtureServer`` on its own event loop thread, for the child processes."""
+
+    def __init__(self):
+        from bench_commands import FixtureServer, FIXTURES_DIR
+        self.server = FixtureServer(FIXTURES_DIR)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        return self.server
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def child_env(server, mode):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SRC_DIR] + [os.path.join(REPO_DIR, src) for src in PACKAGE_SRCS] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    env["PLUGIN_LOADING"], _, warmup = mode.partition("-")
+    env["PLUGIN_WARMUP"] = "true" if warmup else "false"
+    env["NBA_STATS_BASE_URL"] = f"{server.url}/nba-stats"
+    env["NBA_LIVE_BASE_URL"] = f"{server.url}/nba-live"
+    env["FIFA_ESPN_BASE_URL"] = f"{server.url}/espn"
+    env["FIFA_API"] = "ESPN"
+    env.setdefault("TELEGRAM_TOKEN", "123456:bench")
+    env["LOGO_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-logo-cache-")
+    env["FOLLOW_STORE_PATH"] = os.path.join(env["LOGO_CACHE_DIR"], "subscriptions.json")
+    env["NO_PROXY"] = env["no_proxy"] = "127.0.0.1,localhost"
+    return env
+
+
+def spawn(server, mode, importtime=False):
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + [os.path.abspath(__file__), "--child", mode]
+    start = time.perf_counter()
+    result = subprocess.run(command, env=child_env(server, mode), capture_output=True, text=True, timeout=300)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} startup failed:\n{result.stderr}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = wall_ms
+    return timings, result.stderr
+
+
+def parse_importtime(stderr):
+    """Split ``-X importtime`` output into (startup, first use) lists of (cumulative us, self us, depth, module)."""
+    phases = ([], [])
+    phase = 0
+    for line in stderr.splitlines():
+        if line == FIRST_USE_MARKER:
+            phase = 1
+            continue
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            phases[phase].append((int(cumulative_us), int(self_us), len(indent) // 2, module))
+    return phases
+
+
+def print_imports(title, imports, top):
+    # Only top-level imports add up to the phase's total
+    total_ms = sum(cumulative for cumulative, _, depth, _ in imports if depth == 0) / 1000
+    print(f"\n{title}: {len(imports)} modules, {total_ms:,.1f} ms")
+    print(f"{'cumulative ms':>14}{'self ms':>9}  module")
+    for cumulative, self_us, depth, module in sorted(imports, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>14,.1f}{self_us / 1000:>9,.1f}  {'  ' * min(depth, 4)}{module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-r", "--runs", type=int, default=5, help="Fresh processes per loading mode")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports listed per phase")
+    parser.add_argument("--max-ready-ms", type=float, help="Fail if the lazy import + ready time (median) exceeds this")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    with BackgroundFixtureServer() as server:
+        results = {mode: [spawn(server, mode)[0] for _ in range(args.runs)] for mode in MODES}
+        _, importtime_stderr = spawn(server, "lazy", importtime=True)
+
+    print(f"Median of {args.runs} fresh processes per mode")
+    print(f"{'mode':<13}{'import ms':>11}{'ready ms':>10}{'import+ready':>14}{'first use ms':>14}{'process ms':>12}{'max RSS MiB':>13}{'commands':>10}{'aliases':>9}")
+    medians = {}
+    for mode, runs in results.items():
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        medians[mode] = median
+        print(
+            f"{mode:<13}{median['import_ms']:>11,.1f}{median['ready_ms']:>10,.1f}{median['import_ms'] + median['ready_ms']:>14,.1f}"
+            f"{median['first_use_ms']:>14,.1f}{median['process_ms']:>12,.1f}{median['max_rss_mib']:>13,.1f}"
+            f"{median['commands']:>10,.0f}{median['team_aliases']:>9,.0f}"
+        )
+
+    startup_imports, first_use_imports = parse_importtime(importtime_stderr)
+    print_imports("Imports before the bot is ready (lazy)", startup_imports, args.top)
+    print_imports("Imports on first use (lazy)", first_use_imports, args.top)
+
+    ready_ms = medians["lazy"]["import_ms"] + medians["lazy"]["ready_ms"]
+    if args.max_ready_ms is not None and ready_ms > args.max_ready_ms:
+        print(f"\nLazy startup took {ready_ms:,.1f} ms, over the {args.max_ready_ms:,.1f} ms limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Sticker Output Benchmark
+========================
+
+Compares requests per second for the two ways a score sticker can be handed to
+``send_sticker``: an in-memory WebP buffer, or a WebP file that is written to a
+spool directory, read back for upload and then deleted.
+
+Run from the ``sports-bot-telegram`` directory so the bundled assets resolve:
+
+    python benchmarks/bench_sticker_output.py [-n 200] [--spool-dir /dev/shm]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from bot.image_generator import score_card_compositor, img_to_webp_bytes, webp_to_sticker, delete_img
+
+SAMPLE_SCORES = MatchScores(
+    home_team="Lakers",
+    home_score=102,
+    home_team_record="30-12",
+    away_team="Celtics",
+    away_score=99,
+    away_team_record="33-9",
+    game_status="4th Qtr",
+    game_start_time="19:30 ET",
+    game_curr_time="02:31",
+)
+
+
+def generate_score_img(team_scores, spool_dir=None):
+    """Render a sticker as an in-memory WebP buffer, or spooled to a file in ``spool_dir``."""
+    img = score_card_compositor.render(team_scores)
+    return webp_to_sticker(img_to_webp_bytes(img), spool_dir)
+
+
+def run_in_memory(iterations):
+    for _ in range(iterations):
+        sticker = generate_score_img(SAMPLE_SCORES)
+        # Simulate the upload reading the payload
+        sticker.getvalue()
+
+
+def run_spooled(iterations, spool_dir):
+    for _ in range(iterations):
+        sticker = generate_score_img(SAMPLE_SCORES, spool_dir=spool_dir)
+        try:
+            with open(sticker, "rb") as sticker_file:
+                sticker_file.read()
+        finally:
+            delete_img(sticker)
+
+
+def measure(label, func, iterations, *args):
+    start = time.perf_counter()
+    func(iterations, *args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {iterations / elapsed:8.1f} req/s  ({elapsed * 1000 / iterations:.2f} ms/req)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("--spool-dir", default=None, help="Directory to spool to (defaults to a temp dir)")
+    args = parser.parse_args()
+
+    # Warm up fonts, logos and the WebP encoder
+    run_in_memory(5)
+
+    measure("in-memory buffer", run_in_memory, args.iterations)
+    if args.spool_dir:
+        measure(f"spool ({args.spool_dir})", run_spooled, args.iterations, args.spool_dir)
+    else:
+        with tempfile.TemporaryDirectory() as spool_dir:
+            measure("spool (temp dir)", run_spooled, args.iterations, spool_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Webhook Throughput Benchmark
+============================
+
+Load tests the webhook server by POSTing synthetic ``Update`` JSON (``/scores``
+messages) from concurrent keep-alive connections, the way Telegram delivers
+updates. Reports accepted updates per second and p50/p99 request latency.
+Updates are parsed and queued exactly as in production; a consumer task drains
+the queue without running the handlers, so the numbers cover the HTTP layer
+alone. Telegram itself never contacts this server, so no token is needed.
+
+Run from the ``sports-bot-telegram`` directory:
+
+    python benchmarks/bench_webhook.py [-c 16] [-n 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from telegram import Bot
+from bot.webhook import WebhookServer
+
+SECRET_TOKEN = "bench-secret"
+URL_PATH = "/telegram"
+
+
+def make_update(update_id):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": 1000 + update_id % 50, "type": "private", "first_name": "Bench"},
+            "from": {"id": 1000 + update_id % 50, "is_bot": False, "first_name": "Bench"},
+            "text": "/scores lakers",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 7}],
+        },
+    }
+
+
+def make_request(port, update_id):
+    body = json.dumps(make_update(update_id)).encode("utf-8")
+    head = (
+        f"POST {URL_PATH} HTTP/1.1\r\n"
+        f"Host: 127.0.0.1:{port}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"X-Telegram-Bot-Api-Secret-Token: {SECRET_TOKEN}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+    return status
+
+
+async def client(port, update_ids, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for update_id in update_ids:
+            request = make_request(port, update_id)
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def main_async(args):
+    update_queue = asyncio.Queue()
+    server = WebhookServer(Bot("123456:bench"), update_queue, listen="127.0.0.1", port=0, url_path=URL_PATH, secret_token=SECRET_TOKEN)
+    await server.start()
+
+    consumed = 0
+
+    async def consume():
+        nonlocal consumed
+        while True:
+            await update_queue.get()
+            consumed += 1
+
+    consumer = asyncio.create_task(consume())
+
+    latencies = []
+    statuses = {}
+    update_ids = list(range(args.requests))
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(server.port, update_ids[index::args.concurrency], latencies, statuses)
+        for index in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    await server.stop(drain_timeout=5)
+    consumer.cancel()
+
+    latencies.sort()
+    print(f"{args.requests} updates over {args.concurrency} connections in {elapsed:.2f}s")
+    print(f"  throughput: {args.requests / elapsed:,.0f} updates/s")
+    print(f"  latency p50: {statistics.median(latencies) * 1000:.2f}ms  p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}ms")
+    print(f"  responses: {statuses}  consumed: {consumed}  server: {server.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("-n", "--requests", type=int, default=20000, help="Total updates to send")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,13 @@ from PIL import ImageFont
 from PIL import ImageDraw
 import io
 import os
-from urllib.request import Request, urlopen
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List
+from sports_bot_telegram_plugin import span
 from sports_bot_telegram_plugin.types.MatchScores import MatchScores
-from rapidfuzz import process
+from .logo_registry import LogoRegistry, resize_width
 
 score_img_width = 1200
 score_img_height = 600
@@ -16,52 +20,191 @@ vertical_padding = 32
 horizontal_padding = 64
 text_padding = 48
 logo_img_width = 200
-proximaNovaFont = ImageFont.truetype("assets/fonts/proximanova-regular.ttf", font_size)
-
-def generate_score_img(team_scores: MatchScores):
-    img = Image.new(mode='RGBA', size=(score_img_width, score_img_height), color=(255, 255, 255, 255))
-    home_team_img = generate_team_image(
-        img,
-        team_scores.home_team,
-        f"({team_scores.home_team_record})" if team_scores.home_team_record else "",
-        logo_url=getattr(team_scores, "home_team_logo_url", None),
+score_font_size = 96
+score_padding = 32
+descender_padding = 6
+grid_gap = 16
+grid_background_color = (230, 230, 230)
+font_path = "assets/fonts/proximanova-regular.ttf"
+logo_registry = LogoRegistry("assets/img", logo_img_width)
+# Shared drawing context used only to measure text
+_measure_draw = ImageDraw.Draw(Image.new(mode='RGBA', size=(1, 1)))
+
+@lru_cache(maxsize=None)
+def get_font(size=font_size):
+    """Load the font at ``size`` on first use rather than at import, so startup doesn't pay for it."""
+    return ImageFont.truetype(font_path, size)
+
+def load_fonts():
+    """Load the fonts ahead of the first render."""
+    get_font(font_size)
+    get_font(score_font_size)
+
+def render_score_webp(team_scores: MatchScores, url_logos=None) -> bytes:
+    """
+    Render the score sticker for a match straight to WebP bytes.
+
+    This is the entry point used by the render executor. ``url_logos`` maps logo
+    URLs to already downloaded images, so worker processes (which don't share
+    the parent's logo registry) can render them too.
+    """
+    for logo_url, team_logo in (url_logos or {}).items():
+        if not logo_registry.has_url_logo(logo_url):
+            logo_registry.put_url_logo(logo_url, team_logo)
+    with span("image.compose"):
+        img = score_card_compositor.render(team_scores)
+    with span("image.encode", format="webp"):
+        return img_to_webp_bytes(img)
+
+
+def render_score_grid_jpeg(all_team_scores: List[MatchScores], url_logos=None, columns: int = 2, scale: float = 0.5) -> bytes:
+    """
+    Render several matches as one tiled image, encoded as JPEG for ``send_photo``.
+
+    Each match is the regular score card scaled by ``scale``, laid out
+    ``columns`` per row on a grey backdrop. Like ``render_score_webp``, this
+    runs on the render executor and ``url_logos`` carries pre-downloaded logos.
+    """
+    for logo_url, team_logo in (url_logos or {}).items():
+        if not logo_registry.has_url_logo(logo_url):
+            logo_registry.put_url_logo(logo_url, team_logo)
+
+    columns = max(1, min(columns, len(all_team_scores)))
+    rows = (len(all_team_scores) + columns - 1) // columns
+    tile_width = int(score_img_width * scale)
+    tile_height = int(score_img_height * scale)
+
+    grid = Image.new(
+        mode='RGB',
+        size=(columns * tile_width + (columns + 1) * grid_gap, rows * tile_height + (rows + 1) * grid_gap),
+        color=grid_background_color,
     )
-    away_team_img = generate_team_image(
-        img,
-        team_scores.away_team,
-        f"({team_scores.away_team_record})" if team_scores.away_team_record else "",
-        True,
-        logo_url=getattr(team_scores, "away_team_logo_url", None),
-    )
-    team_score_img = generate_team_score_img(
-        img,
-        team_scores.home_score,
-        team_scores.away_score,
-    )
-    img.paste(home_team_img, box=(horizontal_padding, get_img_half_coord(score_img_height, home_team_img.size[1])))
-    img.paste(away_team_img, box=(img.size[0] - away_team_img.size[0] - horizontal_padding, get_img_half_coord(score_img_height, away_team_img.size[1])))
-    img.paste(
-        team_score_img,
-        box=(
-            get_img_half_coord(score_img_width, team_score_img.size[0]),
-            get_img_half_coord(score_img_height, int(team_score_img.size[1])) - font_size + int(text_padding / 2)
+    with span("image.compose_grid"):
+        for index, team_scores in enumerate(all_team_scores):
+            tile = score_card_compositor.render(team_scores).resize((tile_width, tile_height), Image.LANCZOS)
+            row, column = divmod(index, columns)
+            grid.paste(tile, box=(grid_gap + column * (tile_width + grid_gap), grid_gap + row * (tile_height + grid_gap)))
+
+    with span("image.encode", format="jpeg"):
+        img_byte_arr = io.BytesIO()
+        grid.save(img_byte_arr, format='JPEG', quality=90)
+        return img_byte_arr.getvalue()
+
+
+def score_grid_to_photo(payload: bytes):
+    """Wrap an encoded score grid in a buffer ``send_photo`` accepts."""
+    img_buffer = io.BytesIO(payload)
+    img_buffer.name = "scores.jpg"
+    return img_buffer
+
+
+class ScoreCardCompositor:
+    """
+    Renders score cards from cached static layers.
+
+    The white background with both team panels (logo, name and record) is
+    built once per matchup and kept in a bounded LRU. Each render copies that
+    background and only draws the parts that change during a game: the score,
+    the clock and the game status. Output is pixel-identical to the from-scratch
+    renderer in ``benchmarks/score_card_reference.py``.
+    """
+
+    def __init__(self, max_matchups: int = 64):
+        self.max_matchups = max_matchups
+        self._backgrounds: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, team_scores: MatchScores):
+        img = self._get_background(team_scores).copy()
+        draw = ImageDraw.Draw(img)
+        self._draw_team_scores(draw, team_scores.home_score, team_scores.away_score)
+        self._draw_game_status(draw, team_scores.game_status.strip(), team_scores.game_curr_time.strip())
+        return img
+
+    def stats(self) -> dict:
+        return {"matchups": len(self._backgrounds), "hits": self.hits, "misses": self.misses}
+
+    def _get_background(self, team_scores: MatchScores):
+        home_logo_url = getattr(team_scores, "home_team_logo_url", None)
+        away_logo_url = getattr(team_scores, "away_team_logo_url", None)
+        key = (
+            team_scores.home_team,
+            team_scores.home_team_record,
+            home_logo_url if home_logo_url and logo_registry.has_url_logo(home_logo_url) else None,
+            team_scores.away_team,
+            team_scores.away_team_record,
+            away_logo_url if away_logo_url and logo_registry.has_url_logo(away_logo_url) else None,
         )
-    )
 
-    game_stats_img = generate_game_status(img, team_scores.game_status.strip(), team_scores.game_curr_time.strip())
-    img.paste(
-        game_stats_img,
-        box=(
-            get_img_half_coord(score_img_width, game_stats_img.size[0]),
-            int((score_img_height * 0.75) - (game_stats_img.size[1] / 2))
+        with self._lock:
+            background = self._backgrounds.get(key)
+            if background is not None:
+                self._backgrounds.move_to_end(key)
+                self.hits += 1
+                return background
+
+        background = Image.new(mode='RGBA', size=(score_img_width, score_img_height), color=(255, 255, 255, 255))
+        home_team_img = generate_team_image(
+            background,
+            team_scores.home_team,
+            f"({team_scores.home_team_record})" if team_scores.home_team_record else "",
+            logo_url=home_logo_url,
         )
-    )
-    return save_img_as_webp(img)
-
-
-def add_text_to_image(img, text, coord, font = proximaNovaFont):
+        away_team_img = generate_team_image(
+            background,
+            team_scores.away_team,
+            f"({team_scores.away_team_record})" if team_scores.away_team_record else "",
+            True,
+            logo_url=away_logo_url,
+        )
+        background.paste(home_team_img, box=(horizontal_padding, get_img_half_coord(score_img_height, home_team_img.size[1])))
+        background.paste(away_team_img, box=(score_img_width - away_team_img.size[0] - horizontal_padding, get_img_half_coord(score_img_height, away_team_img.size[1])))
+
+        with self._lock:
+            self.misses += 1
+            self._backgrounds[key] = background
+            while len(self._backgrounds) > self.max_matchups:
+                self._backgrounds.popitem(last=False)
+        return background
+
+    @staticmethod
+    def _draw_team_scores(draw, home_score, away_score):
+        game_has_started = home_score is not None and away_score is not None or home_score == -1 or away_score == -1
+        if not game_has_started:
+            return
+
+        away_score_width = measure_text(str(away_score), get_font(score_font_size))
+        width = int(score_img_width - (horizontal_padding + logo_img_width) * 2) - score_padding
+        height = font_size + text_padding + font_size
+        x = get_img_half_coord(score_img_width, width)
+        y = get_img_half_coord(score_img_height, height) - font_size + int(text_padding / 2)
+
+        draw.rectangle((x, y, x + width - 1, y + height - 1), fill=(255, 255, 255, 255))
+        draw.text((x + score_padding, y), str(home_score), (0, 0, 0), font=get_font(score_font_size))
+        draw.text((x + int(width - away_score_width - score_padding), y), str(away_score), (0, 0, 0), font=get_font(score_font_size))
+
+    @staticmethod
+    def _draw_game_status(draw, game_status, live_pc_time):
+        game_status_width = measure_text(game_status)
+        live_pc_time_width = measure_text(live_pc_time)
+        width = int(max(game_status_width, live_pc_time_width))
+        height = font_size * 2 + descender_padding
+        x = get_img_half_coord(score_img_width, width)
+        y = int((score_img_height * 0.75) - (height / 2))
+
+        draw.rectangle((x, y, x + width - 1, y + height - 1), fill=(255, 255, 255, 255))
+        draw.text((x + get_img_half_coord(width, live_pc_time_width), y), live_pc_time, (0, 0, 0), font=get_font())
+        draw.text((x, y + font_size), game_status, (0, 0, 0), font=get_font())
+
+
+score_card_compositor = ScoreCardCompositor()
+
+
+def add_text_to_image(img, text, coord, font = None):
     draw = ImageDraw.Draw(img)
-    draw.text(coord, text, (0, 0, 0), font=font)
+    draw.text(coord, text, (0, 0, 0), font=font or get_font())
     return img
 
 
@@ -92,111 +235,59 @@ def generate_team_image(refImg, team_name, team_record, align_text_end = False,
     return img
 
 
-def generate_game_status(refImg, game_status, live_pc_time):
-    game_status_width = get_text_width(refImg, game_status)
-    live_pc_time_width = get_text_width(refImg, live_pc_time)
-    descender_padding = 6
-    img_width = int(max(game_status_width, live_pc_time_width))
-    img = Image.new(mode='RGBA', size=(img_width, font_size * 2 + descender_padding), color=(255, 255, 255, 255))
-    add_text_to_image(img, live_pc_time, (get_img_half_coord(img_width, live_pc_time_width), 0))
-    add_text_to_image(img, game_status, (0, font_size))
-    return img
-
-
-def generate_team_score_img(refImg, home_score, away_score):
-    score_font = ImageFont.truetype("assets/fonts/proximanova-regular.ttf", 96)
-    score_padding = 32
-    img_height = font_size
-    home_score_width = 0
-    away_score_width = 0
-    game_has_started = home_score is not None and away_score is not None or home_score == -1 or away_score == -1
-
-    if not game_has_started:
-        return Image.new(mode='RGBA', size=(0,0), color=(0,0,0,0))
-
-    home_score_width = get_text_width(refImg, str(home_score), score_font)
-    away_score_width = get_text_width(refImg, str(away_score), score_font)
-    img_height += text_padding + font_size
-
-    img_width = int(score_img_width - (horizontal_padding + logo_img_width) * 2) - score_padding
+def img_to_webp_bytes(img) -> bytes:
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format='WebP')
+    return img_byte_arr.getvalue()
 
-    img = Image.new(mode='RGBA', size=(img_width, img_height), color=(255, 255, 255, 255))
-    add_text_to_image(img, str(home_score), (score_padding, 0), score_font)
-    add_text_to_image(img, str(away_score), (int(img_width - away_score_width - score_padding), 0), score_font)
 
-    return img
+def webp_to_sticker(payload: bytes, spool_dir=None):
+    """
+    Wrap an encoded WebP payload in something ``send_sticker`` accepts.
 
+    Returns an in-memory buffer, or the path of a file written to ``spool_dir``
+    when one is given. Spooled files must be removed with ``delete_img``.
+    """
+    if spool_dir:
+        img_name = os.path.join(spool_dir, f"{uuid.uuid4()}.webp")
+        with open(img_name, "wb") as img_file:
+            img_file.write(payload)
+        return img_name
 
-def save_img_as_webp(img):
-    img_name = f"{uuid.uuid4()}.webp"
-    img.save(img_name, format='WebP')
-    return img_name
+    img_buffer = io.BytesIO(payload)
+    # Telegram needs a file name to infer the upload type
+    img_buffer.name = "scores.webp"
+    return img_buffer
 
 
 def delete_img(img_path):
     os.remove(img_path)
 
-def get_text_width(img, text, font=proximaNovaFont):
+def get_text_width(img, text, font=None):
     draw = ImageDraw.Draw(img)
-    return draw.textlength(text, font)
+    return draw.textlength(text, font or get_font())
 
-def find_team_image(team_name):
-    folder = "assets/img"
-    min_confidence = 0.25
-
-    image_files = [f for f in os.listdir(folder) if f.lower().endswith(".png")]
-    if not image_files:
-        raise FileNotFoundError(f"No PNG images found in {folder}")
-
-    # Create a list of candidate names (without extension)
-    candidates = [os.path.splitext(f)[0] for f in image_files]
-
-    # Fuzzy match team_name to available image names
-    match, score, _ = process.extractOne(team_name, candidates)
-
-    if score < min_confidence:
-        raise ValueError(f"No close match found for '{team_name}' (best match: '{match}', score: {score})")
-
-    # Load the matched logo
-    logo_path = os.path.join(folder, f"{match}.png")
-    team_logo = Image.open(logo_path)
-    return team_logo
-
-def _load_team_logo_from_url(logo_url):
-    if not logo_url or not logo_url.startswith(("http://", "https://")):
-        return None
+def measure_text(text, font=None):
+    return _measure_draw.textlength(text, font or get_font())
 
+def add_url_logo(logo_url, payload):
+    """Decode a downloaded logo and store it for ``load_team_logo``. Returns False if it is not an image."""
     try:
-        req = Request(logo_url, headers={"User-Agent": "sports-bot-telegram"})
-        with urlopen(req, timeout=5) as response:
-            payload = response.read()
-        return Image.open(io.BytesIO(payload)).convert("RGBA")
+        team_logo = Image.open(io.BytesIO(payload))
+        team_logo.load()
     except Exception:
-        return None
+        return False
+    logo_registry.put_url_logo(logo_url, team_logo)
+    return True
 
 
-def load_team_logo(team_name, width=200, logo_url=None):
-    team_logo = _load_team_logo_from_url(logo_url)
+def load_team_logo(team_name, width=logo_img_width, logo_url=None):
+    # URL logos are fetched ahead of rendering (see add_url_logo); fall back to
+    # the bundled assets when one isn't available
+    team_logo = logo_registry.get_url_logo(logo_url) if logo_url else None
     if team_logo is None:
-        team_logo = find_team_image(team_name.lower().replace(" ", "_"))
-    team_logo = resize_width(team_logo, width)
-    return team_logo
+        team_logo = logo_registry.get_team_logo(team_name.lower().replace(" ", "_"))
 
-
-def img_to_byte_array(img: Image) -> bytes:
-    img_byte_arr = io.BytesIO()
-    img.save(img_byte_arr, format='PNG')
-    img_byte_arr = img_byte_arr.getvalue()
-    return img_byte_arr
-
-
-def resize_width(img, width):
-    (w, h) = img.size
-    ratio = w/h
-    return img.resize((width, int(width * ratio)))
-
-
-def resize_height(img, height):
-    (w, h) = img.size
-    ratio = w/h
-    return img.resize((int(height * ratio), height))
+    if team_logo.size[0] != width:
+        team_logo = resize_width(team_logo, width)
+    return team_logo
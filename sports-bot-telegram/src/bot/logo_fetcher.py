@@ -0,0 +1,138 @@
+"""
+Logo Fetcher
+============
+
+Async downloader for team logos that plugins provide as URLs.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from sports_bot_telegram_plugin import HttpClient, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class LogoFetcher:
+    """
+    Fetches logo images without blocking the event loop.
+
+    All downloads go through the shared pooled ``HttpClient``. Responses are
+    kept in ``cache_dir`` together with their ``ETag``/``Last-Modified``
+    validators so a restart only needs a conditional request; the cache files
+    are read and written off the event loop. Concurrent fetches of the same URL
+    share one request. URLs that fail, or that turn out not to be an image (see
+    ``mark_invalid``), are not retried until ``negative_ttl`` seconds have passed.
+    """
+
+    def __init__(self, http_client: HttpClient, cache_dir: Optional[str] = None, timeout: float = 5.0, negative_ttl: float = 600):
+        self.http_client = http_client
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self._failed_urls: Dict[str, float] = {}
+        self._fetches = SingleFlight()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    async def fetch_all(self, *logo_urls: Optional[str]) -> List[Optional[bytes]]:
+        """Fetch several logos concurrently. Missing or failed logos are returned as None."""
+        return await asyncio.gather(*(self.fetch(logo_url) for logo_url in logo_urls))
+
+    async def fetch(self, logo_url: Optional[str]) -> Optional[bytes]:
+        """
+        Fetch the raw image bytes for ``logo_url``.
+
+        Returns:
+            The image payload, or None if the URL is invalid or the fetch failed.
+        """
+        if not logo_url or not logo_url.startswith(("http://", "https://")):
+            return None
+
+        retry_at = self._failed_urls.get(logo_url)
+        if retry_at is not None:
+            if time.monotonic() < retry_at:
+                return None
+            del self._failed_urls[logo_url]
+
+        return await self._fetches.do(logo_url, lambda: self._fetch(logo_url))
+
+    async def mark_invalid(self, logo_url: str) -> None:
+        """Treat a fetched logo that couldn't be decoded like a failed fetch, and drop its cached copy."""
+        self._failed_urls[logo_url] = time.monotonic() + self.negative_ttl
+        await asyncio.to_thread(self._remove_cached, logo_url)
+
+    async def _fetch(self, logo_url):
+        cached_payload, validators = await asyncio.to_thread(self._read_cached, logo_url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        headers["User-Agent"] = "sports-bot-telegram"
+
+        try:
+            response = await self.http_client.get(logo_url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached_payload is not None:
+                return cached_payload
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if cached_payload is not None:
+                return cached_payload
+            logger.warning(f"Failed to fetch logo {logo_url}: {str(e)}")
+            self._failed_urls[logo_url] = time.monotonic() + self.negative_ttl
+            return None
+
+        payload = response.content
+        await asyncio.to_thread(self._write_cached, logo_url, payload, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return payload
+
+    def _cache_paths(self, logo_url):
+        digest = hashlib.sha256(logo_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.img"), os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _read_cached(self, logo_url):
+        if not self.cache_dir:
+            return None, {}
+
+        payload_path, meta_path = self._cache_paths(logo_url)
+        try:
+            with open(payload_path, "rb") as payload_file:
+                payload = payload_file.read()
+            with open(meta_path, "r") as meta_file:
+                validators = json.load(meta_file)
+        except (OSError, ValueError):
+            return None, {}
+        return payload, validators
+
+    def _write_cached(self, logo_url, payload, etag, last_modified):
+        if not self.cache_dir:
+            return
+
+        payload_path, meta_path = self._cache_paths(logo_url)
+        try:
+            with open(payload_path, "wb") as payload_file:
+                payload_file.write(payload)
+            with open(meta_path, "w") as meta_file:
+                json.dump({"etag": etag, "last_modified": last_modified}, meta_file)
+        except OSError as e:
+            logger.warning(f"Failed to cache logo {logo_url}: {str(e)}")
+
+    def _remove_cached(self, logo_url):
+        if not self.cache_dir:
+            return
+
+        for path in self._cache_paths(logo_url):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove cached logo {logo_url}: {str(e)}")
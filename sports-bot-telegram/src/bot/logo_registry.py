@@ -0,0 +1,121 @@
+"""
+Logo Registry
+=============
+
+In-memory store of pre-resized team logos used by the image generator.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from PIL import Image
+from rapidfuzz import process
+
+logger = logging.getLogger(__name__)
+
+
+class LogoRegistry:
+    """
+    Team logos loaded once and kept resized in memory.
+
+    The bundled PNG assets are indexed by file name and resized to ``width`` up
+    front, so looking up a logo never touches the disk. Logos downloaded from a
+    URL are kept in a bounded LRU. Returned images are shared and must not be
+    modified by callers.
+    """
+
+    def __init__(self, folder: str, width: int, max_url_logos: int = 64, min_confidence: float = 0.25):
+        self.folder = folder
+        self.width = width
+        self.max_url_logos = max_url_logos
+        self.min_confidence = min_confidence
+        self._logos: Dict[str, Image.Image] = {}
+        self._choices: List[str] = []
+        self._resolved_names: Dict[str, str] = {}
+        self._url_logos: OrderedDict[str, Image.Image] = OrderedDict()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.url_hits = 0
+        self.url_misses = 0
+
+    def load(self) -> None:
+        """Index and resize every PNG in ``folder``. Safe to call more than once."""
+        if self._loaded:
+            return
+
+        image_files = [f for f in os.listdir(self.folder) if f.lower().endswith(".png")]
+        if not image_files:
+            raise FileNotFoundError(f"No PNG images found in {self.folder}")
+
+        for image_file in image_files:
+            name = os.path.splitext(image_file)[0]
+            with Image.open(os.path.join(self.folder, image_file)) as logo:
+                self._logos[name] = resize_width(logo.convert("RGBA"), self.width)
+
+        self._choices = list(self._logos.keys())
+        self._loaded = True
+        logger.info(f"Loaded {len(self._logos)} team logos from {self.folder}")
+
+    def get_team_logo(self, team_name: str) -> Image.Image:
+        """
+        Get the bundled logo that best matches ``team_name``.
+
+        Raises:
+            ValueError: If no logo matches closely enough.
+        """
+        self.load()
+
+        match = self._resolved_names.get(team_name)
+        if match is not None:
+            self.hits += 1
+            return self._logos[match]
+
+        self.misses += 1
+        match, score, _ = process.extractOne(team_name, self._choices)
+        if score < self.min_confidence:
+            raise ValueError(f"No close match found for '{team_name}' (best match: '{match}', score: {score})")
+
+        self._resolved_names[team_name] = match
+        return self._logos[match]
+
+    def has_url_logo(self, logo_url: str) -> bool:
+        return logo_url in self._url_logos
+
+    def get_url_logo(self, logo_url: str) -> Optional[Image.Image]:
+        """Get a previously stored URL-sourced logo, or None if it is not cached."""
+        team_logo = self._url_logos.get(logo_url)
+        if team_logo is None:
+            self.url_misses += 1
+            return None
+
+        self._url_logos.move_to_end(logo_url)
+        self.url_hits += 1
+        return team_logo
+
+    def put_url_logo(self, logo_url: str, team_logo: Image.Image) -> Image.Image:
+        """Resize and store a URL-sourced logo, returning the stored image."""
+        team_logo = resize_width(team_logo.convert("RGBA"), self.width)
+        self._url_logos[logo_url] = team_logo
+        self._url_logos.move_to_end(logo_url)
+        while len(self._url_logos) > self.max_url_logos:
+            self._url_logos.popitem(last=False)
+        return team_logo
+
+    def stats(self) -> dict:
+        return {
+            "logos": len(self._logos),
+            "url_logos": len(self._url_logos),
+            "hits": self.hits,
+            "misses": self.misses,
+            "url_hits": self.url_hits,
+            "url_misses": self.url_misses,
+        }
+
+
+def resize_width(img, width):
+    (w, h) = img.size
+    ratio = w/h
+    return img.resize((width, int(width * ratio)))
@@ -9,12 +9,52 @@ from telegram.ext import CommandHandler, ApplicationBuilder, MessageHandler
 from telegram.ext import InlineQueryHandler
 from telegram.ext import CallbackQueryHandler
 
-from .settings import TELEGRAM_TOKEN
-from .image_generator import generate_score_img, delete_img
+from .settings import (
+    TELEGRAM_TOKEN,
+    STICKER_SPOOL_DIR,
+    STICKER_CACHE_SIZE,
+    STICKER_CACHE_DIR,
+    LOGO_CACHE_DIR,
+    RENDER_BACKEND,
+    RENDER_WORKERS,
+    RENDER_MAX_PENDING,
+    PLUGIN_PROBE_MODE,
+    PLUGIN_PROBE_TIMEOUT,
+    PLUGIN_LOADING,
+    PLUGIN_WARMUP,
+    FOLLOW_STORE_PATH,
+    FOLLOW_POLL_INTERVAL,
+    BOT_MODE,
+    WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET_TOKEN,
+    WEBHOOK_DRAIN_TIMEOUT,
+    SPORTS_BOT_CACHE_URL,
+    TELEGRAM_SEND_RATE,
+    TELEGRAM_CHAT_SEND_RATE,
+    TELEGRAM_GROUP_SENDS_PER_MINUTE,
+    TELEGRAM_SEND_MAX_RETRIES,
+    METRICS_PORT,
+    METRICS_LISTEN,
+    OTEL_EXPORTER_OTLP_ENDPOINT,
+)
+from .image_generator import render_score_webp, webp_to_sticker, delete_img, logo_registry, add_url_logo, render_score_grid_jpeg, score_grid_to_photo, load_fonts
+from .sticker_cache import StickerCache
+from .logo_fetcher import LogoFetcher
+from .render_executor import RenderExecutor, RenderQueueFullError
 from .plugin_management import PluginManager
+from .rate_limit import TelegramRateLimiter, PRIORITY_PUSH
+from .subscriptions import SubscriptionStore, FollowManager
+from .webhook import run_webhook
+from .metrics_server import MetricsServer
+from sports_bot_telegram_plugin import HttpClient, create_cache_backend, metrics, span, traced
 from importlib.metadata import version, PackageNotFoundError
 import re
 import asyncio
+import time
+from functools import partial
 
 # setup logging
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -27,6 +67,27 @@ try:
 except PackageNotFoundError:
     BOT_VERSION = "1.2.0"
 
+# Cache shared with plugins and, for disk or Redis, with other processes or replicas
+cache_backend = create_cache_backend(SPORTS_BOT_CACHE_URL) if SPORTS_BOT_CACHE_URL else None
+sticker_cache = StickerCache(
+    max_entries=STICKER_CACHE_SIZE,
+    spill_dir=STICKER_CACHE_DIR,
+    shared_backend=cache_backend if cache_backend is not None and cache_backend.shared else None,
+)
+# Pooled HTTP client shared by the bot and every plugin for the lifetime of the application
+http_client = HttpClient()
+logo_fetcher = LogoFetcher(http_client, cache_dir=LOGO_CACHE_DIR)
+render_executor = RenderExecutor(backend=RENDER_BACKEND, max_workers=RENDER_WORKERS, max_pending=RENDER_MAX_PENDING)
+# Paces every outbound Telegram request; command replies go ahead of pushed updates
+telegram_rate_limiter = TelegramRateLimiter(
+    global_rate=TELEGRAM_SEND_RATE,
+    chat_rate=TELEGRAM_CHAT_SEND_RATE,
+    group_rate=TELEGRAM_GROUP_SENDS_PER_MINUTE / 60,
+    max_retries=TELEGRAM_SEND_MAX_RETRIES,
+)
+# Batch /scores replies are split into several images beyond this many games
+MAX_GAMES_PER_GRID = 16
+
 async def start(update, context):
     # This is the unicode for a cowboy :)
     await context.bot.send_message(chat_id=update.message.chat_id, text=u'\U0001F920')
@@ -138,6 +199,7 @@ async def version_command_handler(update, context):
         text=f"Bot version: {BOT_VERSION}"
     )
 
+@traced("handler.scores")
 async def scores_command_handler(update, context):
     raw_args = get_formatted_input_message(update.message.text)
     team, params = parse_command_args(raw_args)
@@ -153,10 +215,17 @@ async def scores_command_handler(update, context):
     plugin_common_name = params.pop('plugin', None)
     extra_params = params  # everything else is passed through to the plugin
 
+    # "/scores lakers, celtics" or "/scores all" shows several games in one image
+    if ',' in team or team.strip().lower() == 'all':
+        await batch_scores_command_handler(update, context, team, raw_date, plugin_common_name, extra_params)
+        return
+
+    request_context = None
     if plugin_common_name:
         plugin = PluginManager.find_plugin_by_common_name(plugin_common_name)
     else:
-        plugin = await PluginManager.find_plugin_for_team(team)
+        route = await PluginManager.route_team(team)
+        plugin, request_context = route if route else (None, None)
 
     if not plugin:
         await context.bot.send_message(
@@ -167,7 +236,7 @@ async def scores_command_handler(update, context):
 
     try:
         game_date_obj = parse_date_param(raw_date)
-        team_scores = await plugin.get_live_scores(team, game_date_obj, extra_params)
+        team_scores = await plugin.get_live_scores(team, game_date_obj, extra_params, **get_request_context_kwargs(request_context))
 
         if not team_scores:
             await context.bot.send_message(
@@ -176,9 +245,13 @@ async def scores_command_handler(update, context):
             )
             return
 
-        scores_sticker = generate_score_img(team_scores)
-        await context.bot.send_sticker(chat_id=update.message.chat_id, sticker=scores_sticker)
-        delete_img(scores_sticker)
+        await send_score_sticker(context.bot, update.message.chat_id, team_scores)
+    except RenderQueueFullError:
+        logger.warning("Render queue full, rejecting /scores request")
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Sorry, I'm busy right now. Please try again in a moment"
+        )
     except Exception as e:
         logger.error(f"Error getting scores: {str(e)}")
         await context.bot.send_message(
@@ -186,17 +259,273 @@ async def scores_command_handler(update, context):
             text="Sorry, there was an error getting the scores"
         )
 
+@traced("handler.batch_scores")
+async def batch_scores_command_handler(update, context, team, raw_date, plugin_common_name, extra_params):
+    """
+    Reply with the scores of several teams, or every game, as one tiled image.
+
+    Teams are grouped by plugin so each plugin fetches its scoreboard once.
+    """
+    teams = None if team.strip().lower() == 'all' else [name.strip() for name in team.split(',') if name.strip()]
+
+    if plugin_common_name:
+        plugin = PluginManager.find_plugin_by_common_name(plugin_common_name)
+        teams_by_plugin = {plugin: teams} if plugin else {}
+        unknown_teams = []
+    elif teams is None:
+        teams_by_plugin = {plugin: None for plugin in PluginManager.get_all_plugins()}
+        unknown_teams = []
+    else:
+        routes = await asyncio.gather(*(PluginManager.route_team(name) for name in teams))
+        teams_by_plugin = {}
+        unknown_teams = []
+        for name, route in zip(teams, routes):
+            if route:
+                teams_by_plugin.setdefault(route[0], []).append(name)
+            else:
+                unknown_teams.append(name)
+
+    if unknown_teams:
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text=f"Sorry, I couldn't find a supported team named {', '.join(unknown_teams)}"
+        )
+    if not teams_by_plugin:
+        if not unknown_teams:
+            await context.bot.send_message(chat_id=update.message.chat_id, text="Sorry, I couldn't find a supported team with that name")
+        return
+
+    try:
+        game_date_obj = parse_date_param(raw_date)
+        results = await asyncio.gather(
+            *(plugin.get_live_scores_batch(plugin_teams, game_date_obj, extra_params) for plugin, plugin_teams in teams_by_plugin.items()),
+            return_exceptions=True,
+        )
+        all_team_scores = []
+        for plugin, result in zip(teams_by_plugin, results):
+            if isinstance(result, Exception):
+                logger.error(f"Plugin {plugin.get_plugin_name()} failed to get batch scores: {str(result)}")
+                continue
+            all_team_scores.extend(result)
+
+        if not all_team_scores:
+            await context.bot.send_message(
+                chat_id=update.message.chat_id,
+                text="No games found" + (f" on {raw_date}" if raw_date else "")
+            )
+            return
+
+        for start in range(0, len(all_team_scores), MAX_GAMES_PER_GRID):
+            await send_score_grid(context.bot, update.message.chat_id, all_team_scores[start:start + MAX_GAMES_PER_GRID])
+    except RenderQueueFullError:
+        logger.warning("Render queue full, rejecting batch /scores request")
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Sorry, I'm busy right now. Please try again in a moment"
+        )
+    except Exception as e:
+        logger.error(f"Error getting batch scores: {str(e)}")
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Sorry, there was an error getting the scores"
+        )
+
+async def send_score_grid(bot, chat_id, all_team_scores):
+    """Render several matches into one image and send it as a photo."""
+    all_url_logos = await asyncio.gather(*(prefetch_team_logos(team_scores) for team_scores in all_team_scores))
+    url_logos = {}
+    for match_url_logos in all_url_logos:
+        url_logos.update(match_url_logos)
+
+    with span("render.score_grid"):
+        payload = await render_executor.submit(render_score_grid_jpeg, all_team_scores, url_logos)
+    with span("telegram.send", method="send_photo"):
+        return await bot.send_photo(chat_id=chat_id, photo=score_grid_to_photo(payload))
+
+async def prefetch_team_logos(team_scores):
+    """
+    Download both teams' logo URLs concurrently so rendering never waits on the network.
+
+    Returns:
+        Dict mapping each available logo URL to its image, for handing to the renderer.
+    """
+    logo_urls = [
+        logo_url for logo_url in (team_scores.home_team_logo_url, team_scores.away_team_logo_url)
+        if logo_url
+    ]
+    missing_urls = [logo_url for logo_url in logo_urls if not logo_registry.has_url_logo(logo_url)]
+
+    if missing_urls:
+        payloads = await logo_fetcher.fetch_all(*missing_urls)
+        for logo_url, payload in zip(missing_urls, payloads):
+            if payload and not add_url_logo(logo_url, payload):
+                logger.warning(f"Logo at {logo_url} is not a valid image")
+                await logo_fetcher.mark_invalid(logo_url)
+
+    url_logos = {}
+    for logo_url in logo_urls:
+        team_logo = logo_registry.get_url_logo(logo_url)
+        if team_logo is not None:
+            url_logos[logo_url] = team_logo
+    return url_logos
+
+async def send_score_sticker(bot, chat_id, team_scores, rate_limit_args=None):
+    """
+    Send the score sticker for ``team_scores``, reusing earlier work when possible.
+
+    A sticker already uploaded for the same game state is re-sent by its Telegram
+    ``file_id``; otherwise the cached WebP is uploaded, rendering it only on a miss.
+    ``rate_limit_args`` picks the rate limiter lane, e.g. ``PRIORITY_PUSH``.
+    """
+    cache_key = StickerCache.key_for(team_scores)
+
+    file_id = sticker_cache.get_file_id(cache_key) or await sticker_cache.get_shared_file_id(cache_key)
+    if file_id:
+        try:
+            with span("telegram.send", method="send_sticker"):
+                return await bot.send_sticker(chat_id=chat_id, sticker=file_id, rate_limit_args=rate_limit_args)
+        except telegram.error.BadRequest as e:
+            logger.warning(f"Cached sticker file_id rejected, re-uploading: {str(e)}")
+            sticker_cache.forget_file_id(cache_key)
+
+    async def render():
+        with span("logos.prefetch"):
+            url_logos = await prefetch_team_logos(team_scores)
+        # Includes time queued behind other renders
+        with span("render.score_sticker"):
+            return await render_executor.submit(render_score_webp, team_scores, url_logos)
+
+    payload = await sticker_cache.get_or_render(cache_key, render)
+
+    scores_sticker = webp_to_sticker(payload, STICKER_SPOOL_DIR)
+    try:
+        with span("telegram.send", method="send_sticker"):
+            message = await bot.send_sticker(chat_id=chat_id, sticker=scores_sticker, rate_limit_args=rate_limit_args)
+    finally:
+        # Spooled stickers are written to disk and must not be left behind
+        if isinstance(scores_sticker, str):
+            delete_img(scores_sticker)
+
+    if message and message.sticker:
+        await sticker_cache.publish_file_id(cache_key, message.sticker.file_id)
+    return message
+
+# Pushes score updates of followed teams; see /follow
+follow_manager = FollowManager(
+    SubscriptionStore(FOLLOW_STORE_PATH),
+    partial(send_score_sticker, rate_limit_args=PRIORITY_PUSH),
+    interval=FOLLOW_POLL_INTERVAL,
+)
+# Prometheus scrape endpoint; see METRICS_PORT
+metrics_server = MetricsServer(METRICS_LISTEN, METRICS_PORT) if METRICS_PORT is not None else None
+# Background load of plugins and fonts; see PLUGIN_WARMUP
+warm_up_task = None
+
+def register_metrics_gauges():
+    """Export queue depths and cache sizes alongside the span histograms."""
+    metrics.register_gauge(
+        "sports_bot_telegram_send_queued",
+        "Outbound Telegram requests waiting for the rate limiter, by lane",
+        lambda: [({"lane": lane}, lane_stats["waiting"]) for lane, lane_stats in telegram_rate_limiter.stats()["lanes"].items()],
+    )
+    metrics.register_gauge(
+        "sports_bot_telegram_send_paused_seconds",
+        "Seconds left of a flood-limit pause on all sends",
+        lambda: telegram_rate_limiter.stats()["paused_for_s"],
+    )
+    metrics.register_gauge("sports_bot_render_pending", "Renders queued or running", lambda: render_executor.pending)
+    metrics.register_gauge(
+        "sports_bot_sticker_cache_entries",
+        "Rendered stickers and uploaded file_ids held in memory",
+        lambda: [({"kind": "payload"}, sticker_cache.stats()["entries"]), ({"kind": "file_id"}, sticker_cache.stats()["file_ids"])],
+    )
+    metrics.register_gauge("sports_bot_followed_games", "Live games polled for /follow pushes", lambda: follow_manager.stats()["followed_games"])
+
+@traced("handler.follow")
+async def follow_command_handler(update, context):
+    raw_args = get_formatted_input_message(update.message.text)
+    team, params = parse_command_args(raw_args)
+
+    if not team:
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Please provide a team name. Usage: /follow <team> [-plugin <name>]"
+        )
+        return
+
+    request_context = None
+    plugin_common_name = params.get('plugin')
+    if plugin_common_name:
+        plugin = PluginManager.find_plugin_by_common_name(plugin_common_name)
+    else:
+        route = await PluginManager.route_team(team)
+        plugin, request_context = route if route else (None, None)
+
+    if not plugin:
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Sorry, I couldn't find a supported team with that name"
+        )
+        return
+
+    team_id = request_context.team_id if request_context else None
+    if follow_manager.follow(update.message.chat_id, plugin, team, team_id):
+        text = f"Following {team}. I'll send the score whenever it or the game status changes"
+    else:
+        text = f"This chat already follows {team}"
+    await context.bot.send_message(chat_id=update.message.chat_id, text=text)
+
+@traced("handler.unfollow")
+async def unfollow_command_handler(update, context):
+    team = get_formatted_input_message(update.message.text).strip()
+
+    if not team:
+        await context.bot.send_message(
+            chat_id=update.message.chat_id,
+            text="Please provide a team name. Usage: /unfollow <team|all>"
+        )
+        return
+
+    if team.lower() == 'all':
+        removed = follow_manager.unfollow(update.message.chat_id)
+    else:
+        # Routing lets any of the team's aliases match the one it was followed by
+        route = await PluginManager.route_team(team)
+        plugin, request_context = route if route else (None, None)
+        team_id = request_context.team_id if request_context else None
+        removed = follow_manager.unfollow(update.message.chat_id, team, plugin, team_id)
+    if removed:
+        text = f"Stopped following {', '.join(follow['team'] for follow in removed)}"
+    else:
+        text = f"This chat doesn't follow {team}"
+    await context.bot.send_message(chat_id=update.message.chat_id, text=text)
+
+@traced("handler.following")
+async def following_command_handler(update, context):
+    follows = follow_manager.store.get(update.message.chat_id)
+    if follows:
+        text = "Following: " + ", ".join(follow['team'] for follow in follows)
+    else:
+        text = "This chat doesn't follow any teams. Use /follow <team> to get score updates"
+    await context.bot.send_message(chat_id=update.message.chat_id, text=text)
+
+def get_request_context_kwargs(request_context):
+    # Only plugins that resolved the query themselves understand a request context
+    return {"request_context": request_context} if request_context is not None else {}
+
+@traced("handler.stats")
 async def current_stats_command_handler(update, context, player_id=-1):
     formatted_message = get_formatted_input_message(update.message.text) if player_id == -1 else player_id
     
     # Try each registered plugin until we find player stats
-    plugin = await PluginManager.find_plugin_for_player(formatted_message)
+    route = await PluginManager.route_player(formatted_message)
 
-    if not plugin:
+    if not route:
         return
 
+    plugin, request_context = route
     try:
-        player_stats_msg = await plugin.get_player_live_stats(formatted_message, update, context)
+        player_stats_msg = await plugin.get_player_live_stats(formatted_message, update, context, **get_request_context_kwargs(request_context))
         if player_stats_msg:
             await context.bot.send_message(chat_id=update.message.chat_id, text=player_stats_msg)
             return
@@ -208,15 +537,17 @@ async def current_stats_command_handler(update, context, player_id=-1):
     
     await send_player_not_found_message(update, context)
 
+@traced("handler.seasonstats")
 async def season_stats_command_handler(update, context, player_id = -1, start_year=-1, end_year=-1):
     player_name, start_year, end_year = get_player_name_and_years(update.message, player_id, start_year, end_year)
     # Try each registered plugin until we find player stats
-    plugin = await PluginManager.find_plugin_for_player(player_name)
-    if not plugin:
+    route = await PluginManager.route_player(player_name)
+    if not route:
         await send_player_not_found_message(update, context)
         return
+    plugin, request_context = route
     try:
-        player_stats_msg = await plugin.get_player_season_stats(player_name, update, context, start_year, end_year)
+        player_stats_msg = await plugin.get_player_season_stats(player_name, update, context, start_year, end_year, **get_request_context_kwargs(request_context))
         if player_stats_msg:
             await context.bot.send_message(chat_id=update.message.chat_id, text=player_stats_msg)
             return
@@ -224,6 +555,7 @@ async def season_stats_command_handler(update, context, player_id = -1, start_ye
         logger.debug(f"Plugin failed to get player season stats: {str(e)}")
         await send_player_not_found_message(update, context)
 
+@traced("handler.callback_query")
 async def callback_query_handler(update, context):
     """
     Generic callback query handler that routes to the appropriate plugin.
@@ -300,14 +632,16 @@ async def _handle_predefined_callback(update, context, player_id, handler, year)
         await season_stats_command_handler(update.callback_query, context, player_id)
 
 
+@traced("handler.careerstats")
 async def career_stats_command_handler(update, context, player_id=-1):
     player_name, _, _ = get_player_name_and_years(update.message, player_id)
-    plugin = await PluginManager.find_plugin_for_player(player_name)
-    if not plugin:
+    route = await PluginManager.route_player(player_name)
+    if not route:
         await send_player_not_found_message(update, context)
         return
+    plugin, request_context = route
     try:
-        player_stats_msg = await plugin.get_player_career_stats(player_name, update, context)
+        player_stats_msg = await plugin.get_player_career_stats(player_name, update, context, **get_request_context_kwargs(request_context))
         if player_stats_msg:
             await context.bot.send_message(chat_id=update.message.chat_id, text=player_stats_msg)
             return
@@ -324,6 +658,9 @@ async def set_commands(application):
         BotCommand("stats", "Get current player stats"),
         BotCommand("seasonstats", "Get player season stats"),
         BotCommand("careerstats", "Get player career stats"),
+        BotCommand("follow", "Get score updates for a team"),
+        BotCommand("unfollow", "Stop score updates for a team"),
+        BotCommand("following", "List the teams this chat follows"),
     ]
 
     plugins = PluginManager.get_all_plugins()
@@ -333,12 +670,64 @@ async def set_commands(application):
 
     await application.bot.set_my_commands(commands)
 
+async def warm_up():
+    """Load lazy plugins, index their teams and load logos and fonts before the first command needs them."""
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(PluginManager.load_plugins(), asyncio.to_thread(logo_registry.load), asyncio.to_thread(load_fonts))
+    except Exception as e:
+        logger.error(f"Warm-up failed: {str(e)}")
+        return
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
 async def post_init(application):
+    global warm_up_task
+    PluginManager.configure_probing(PLUGIN_PROBE_MODE, PLUGIN_PROBE_TIMEOUT)
+    PluginManager.set_http_client(http_client)
+    if cache_backend is not None:
+        PluginManager.set_cache_backend(cache_backend)
     await set_commands(application)
+    if not PLUGIN_WARMUP:
+        # Keep logo loading out of the /scores hot path
+        logo_registry.load()
+    await PluginManager.build_team_index()
+    await PluginManager.start()
+    follow_manager.start(application.bot)
+    if PLUGIN_WARMUP:
+        # In the background, so the bot starts taking updates right away
+        warm_up_task = asyncio.create_task(warm_up())
+    if OTEL_EXPORTER_OTLP_ENDPOINT:
+        # The exporter reads OTEL_EXPORTER_OTLP_* itself, and appends /v1/traces to the endpoint
+        metrics.enable_opentelemetry()
+    if metrics_server is not None:
+        register_metrics_gauges()
+        await metrics_server.start()
+
+
+async def post_shutdown(application):
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await follow_manager.stop()
+    if metrics_server is not None:
+        await metrics_server.stop()
+    await PluginManager.shutdown()
+    await http_client.aclose()
+    await sticker_cache.wait_spilled()
+    if cache_backend is not None:
+        await cache_backend.aclose()
+    render_executor.shutdown()
 
 
 def main():
-    application = ApplicationBuilder().token(TELEGRAM_TOKEN).post_init(post_init).build()
+    PluginManager.configure_loading(PLUGIN_LOADING)
+    application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .rate_limiter(telegram_rate_limiter)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     # Register core handlers
     start_handler = CommandHandler('start', start)
@@ -359,6 +748,15 @@ def main():
     career_stats_handler = CommandHandler('careerstats', career_stats_command_handler)
     application.add_handler(career_stats_handler)
 
+    follow_handler = CommandHandler('follow', follow_command_handler)
+    application.add_handler(follow_handler)
+
+    unfollow_handler = CommandHandler('unfollow', unfollow_command_handler)
+    application.add_handler(unfollow_handler)
+
+    following_handler = CommandHandler('following', following_command_handler)
+    application.add_handler(following_handler)
+
     # Add callback query handler
     callback_query_handler_instance = CallbackQueryHandler(callback_query_handler)
     application.add_handler(callback_query_handler_instance)
@@ -369,8 +767,24 @@ def main():
     unknown_handler = MessageHandler(telegram.ext.filters.COMMAND, unknown)
     application.add_handler(unknown_handler)
 
-    logger.info("Starting bot...")
-    application.run_polling() 
+    if BOT_MODE == "webhook":
+        if not WEBHOOK_URL:
+            raise ValueError("WEBHOOK_URL must be set when BOT_MODE is webhook")
+        logger.info("Starting bot in webhook mode...")
+        asyncio.run(run_webhook(
+            application,
+            WEBHOOK_URL,
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET_TOKEN,
+            drain_timeout=WEBHOOK_DRAIN_TIMEOUT,
+        ))
+    elif BOT_MODE == "polling":
+        logger.info("Starting bot...")
+        application.run_polling()
+    else:
+        raise ValueError(f"Unknown BOT_MODE {BOT_MODE!r}, expected polling or webhook")
 
 
 if __name__ == '__main__':
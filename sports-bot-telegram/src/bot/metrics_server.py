@@ -0,0 +1,67 @@
+"""
+Metrics Server
+==============
+
+Minimal asyncio HTTP server exposing span histograms and gauges for Prometheus.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sports_bot_telegram_plugin import Metrics, metrics as default_metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """
+    Serves ``GET /metrics`` in the Prometheus text format.
+
+    Each scrape renders ``metrics`` fresh, so gauges are read at scrape time.
+    One request per connection; scrapes are infrequent.
+    """
+
+    def __init__(self, listen: str = "0.0.0.0", port: int = 9090, metrics: Metrics = default_metrics):
+        self.listen = listen
+        self.port = port
+        self.metrics = metrics
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.listen, self.port)
+        # Port 0 binds a free port; report the one actually in use
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics server listening on {self.listen}:{self.port}{METRICS_PATH}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            method, path, _ = head.decode("latin-1").split("\r\n", 1)[0].split(" ", 2)
+            if path.split("?", 1)[0] != METRICS_PATH:
+                status, payload = "404 Not Found", b""
+            elif method != "GET":
+                status, payload = "405 Method Not Allowed", b""
+            else:
+                status, payload = "200 OK", self.metrics.render_prometheus().encode("utf-8")
+
+            writer.write((
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Connection: close\r\n\r\n"
+            ).encode("latin-1") + payload)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
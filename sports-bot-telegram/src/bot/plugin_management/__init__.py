@@ -6,5 +6,9 @@ Handles plugin discovery, loading, and management.
 """
 
 from .discovery import PluginManager
+from .lazy import LazyPlugin
 
-__all__ = ["PluginManager"] 
\ No newline at end of file
+__all__ = [
+    "PluginManager",
+    "LazyPlugin",
+] 
\ No newline at end of file
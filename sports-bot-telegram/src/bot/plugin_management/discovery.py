@@ -1,8 +1,13 @@
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+import asyncio
 from telegram.ext import Application
 import importlib.metadata
 import logging
-from sports_bot_telegram_plugin import SportsBotPlugin
+from sports_bot_telegram_plugin import SportsBotPlugin, HttpClient, CacheBackend, SingleFlight, traced
+from sports_bot_telegram_plugin.types.RequestContext import RequestContext
+from .team_index import TeamIndex
+from .probing import PluginProber
+from .lazy import LazyPlugin, read_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +16,33 @@ class PluginManager:
     Manages plugin discovery and lifecycle.
     
     This class handles:
-    - Loading plugins via entry points
+    - Loading plugins via entry points, lazily for plugins that ship a manifest
     - Managing plugin instances
     - Routing requests to appropriate plugins
     - Registering plugin-specific handlers
     """
     
     _plugin_instances: Dict[str, SportsBotPlugin] = {}
+    _team_index: TeamIndex = TeamIndex()
+    _prober: PluginProber = PluginProber()
     _initialized: bool = False
+    _lazy_loading: bool = True
+    _all_loaded: bool = False
+    # A command routed while the warm-up loads the plugins waits for that load
+    _loading: SingleFlight = SingleFlight()
+
+    @classmethod
+    def configure_loading(cls, mode: str) -> None:
+        """
+        Set how entry-point plugins are loaded. Must be called before the plugins are first used.
+
+        Args:
+            mode: ``"lazy"`` to import plugins that ship a manifest on first
+                use, or ``"eager"`` to import every plugin at startup
+        """
+        if mode not in ("lazy", "eager"):
+            raise ValueError(f"Unknown plugin loading mode {mode!r}, expected 'lazy' or 'eager'")
+        cls._lazy_loading = mode == "lazy"
 
     @classmethod
     def _initialize(cls) -> None:
@@ -33,19 +57,147 @@ class PluginManager:
         else:
             plugin_entry_points = entry_points.get("sports_bot_telegram_plugins", [])
 
+        cls._initialized = True
         for entry_point in plugin_entry_points:
-            try:
-                register_func = entry_point.load()
-                plugin_class = register_func()
-                cls._plugin_instances[entry_point.name] = plugin_class()
-                logger.info(f"Loaded plugin: {entry_point.name} version {cls._plugin_instances[entry_point.name].version}")
-            except Exception as e:
-                logger.error(f"Failed to load plugin {entry_point.name}: {str(e)}")
+            cls.register_entry_point(entry_point)
 
         if not cls._plugin_instances:
             logger.warning("No plugins were found. Install plugins to enable sports functionality.")
-        
-        cls._initialized = True
+
+    @classmethod
+    def register_entry_point(cls, entry_point) -> None:
+        """
+        Add a plugin from its entry point. With lazy loading, a plugin that
+        ships a manifest is registered as a ``LazyPlugin`` and imported on
+        first use; otherwise it is imported and instantiated now.
+
+        Args:
+            entry_point: Entry point whose value returns the plugin class
+        """
+        cls._initialize()
+        manifest = None
+        if cls._lazy_loading:
+            try:
+                manifest = read_manifest(entry_point)
+            except Exception as e:
+                logger.warning(f"Failed to read the manifest of plugin {entry_point.name}, loading it now: {str(e)}")
+
+        if manifest is not None:
+            cls._plugin_instances[entry_point.name] = LazyPlugin(entry_point, manifest)
+            cls._all_loaded = False
+            logger.info(f"Found plugin: {entry_point.name} version {manifest.get('version', '')}, loading it on first use")
+            return
+
+        try:
+            register_func = entry_point.load()
+            plugin_class = register_func()
+            cls._plugin_instances[entry_point.name] = plugin_class()
+            logger.info(f"Loaded plugin: {entry_point.name} version {cls._plugin_instances[entry_point.name].version}")
+        except Exception as e:
+            logger.error(f"Failed to load plugin {entry_point.name}: {str(e)}")
+
+    @classmethod
+    def register_plugin(cls, name: str, plugin: SportsBotPlugin) -> None:
+        """
+        Add a plugin instance that isn't installed as an entry point, e.g. one
+        loaded from a source checkout by the benchmarks.
+
+        Args:
+            name: Name the plugin is registered under, like an entry point name
+            plugin: The plugin instance
+        """
+        cls._initialize()
+        cls._plugin_instances[name] = plugin
+        logger.info(f"Registered plugin: {name} version {plugin.version}")
+
+    @classmethod
+    def configure_probing(cls, mode: str, timeout: float) -> None:
+        """
+        Set how plugins are asked whether they support a team or player.
+
+        Args:
+            mode: ``"sequential"`` or ``"parallel"``
+            timeout: Seconds each plugin gets to answer in parallel mode
+        """
+        cls._prober = PluginProber(mode=mode, timeout=timeout)
+
+    @classmethod
+    def get_probe_stats(cls) -> Dict[str, Dict[str, Dict]]:
+        """Get per-plugin probe counts and latency, grouped by probe kind"""
+        return cls._prober.stats()
+
+    @classmethod
+    async def load_plugins(cls) -> None:
+        """
+        Load and start every lazy plugin that hasn't been yet, and add their
+        teams to the index. Plugins that fail to load are logged and dropped.
+        Called before routing a query, since any plugin may support it, and
+        by the warm-up at startup. Concurrent calls share one load.
+        """
+        cls._initialize()
+        if cls._all_loaded:
+            return
+        await cls._loading.do("plugins", cls._load_plugins)
+
+    @classmethod
+    async def _load_plugins(cls) -> None:
+        lazy_plugins = {name: plugin for name, plugin in cls._plugin_instances.items() if isinstance(plugin, LazyPlugin)}
+        if lazy_plugins:
+            # Some may have been started already by a direct call, e.g. /scores -plugin nba
+            results = await asyncio.gather(*(plugin.ensure_started() for plugin in lazy_plugins.values()), return_exceptions=True)
+            for (name, plugin), result in zip(lazy_plugins.items(), results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to load plugin {name}: {str(result)}")
+                    if cls._plugin_instances.get(name) is plugin:
+                        del cls._plugin_instances[name]
+            await cls.build_team_index()
+        cls._all_loaded = True
+
+    @classmethod
+    async def build_team_index(cls) -> None:
+        """
+        Index the team aliases of every plugin so team queries can be routed
+        without asking each plugin in turn. Plugins whose aliases can't be
+        loaded are still reachable through ``is_team_supported``. Lazy plugins
+        are indexed once ``load_plugins`` has started them.
+        """
+        cls._initialize()
+        team_index = TeamIndex()
+        for plugin in cls._plugin_instances.values():
+            if isinstance(plugin, LazyPlugin) and not plugin.is_started:
+                continue
+            try:
+                aliases = await plugin.get_team_aliases()
+            except Exception as e:
+                logger.error(f"Failed to load team aliases from plugin {plugin.get_plugin_name()}: {str(e)}")
+                continue
+            team_index.add_plugin(plugin, aliases)
+        cls._team_index = team_index
+        logger.info(f"Indexed {len(team_index)} team aliases")
+
+    @classmethod
+    @traced("plugin_manager.route_team")
+    async def route_team(cls, team: str) -> Optional[Tuple[SportsBotPlugin, Optional[RequestContext]]]:
+        """
+        Find the plugin that supports the given team, and resolve the team's id in that plugin.
+
+        Args:
+            team: Team name or identifier to find a plugin for
+
+        Returns:
+            Tuple of the plugin and a request context carrying the resolved team
+            id, or None if no plugin supports the team. The context is None if
+            the plugin was found by asking each plugin rather than through the
+            alias index.
+        """
+        await cls.load_plugins()
+        route = cls._team_index.lookup(team)
+        if route is not None:
+            plugin, team_id = route
+            return plugin, RequestContext(query=team, entity_id=team_id, team_id=team_id)
+
+        plugin = await cls._prober.find_first("team", list(cls._plugin_instances.values()), lambda plugin: plugin.is_team_supported(team))
+        return (plugin, None) if plugin else None
 
     @classmethod
     async def find_plugin_for_team(cls, team: str) -> Optional[SportsBotPlugin]:
@@ -58,11 +210,8 @@ class PluginManager:
         Returns:
             Plugin instance that supports the team, or None if no plugin found
         """
-        cls._initialize()
-        for plugin in cls._plugin_instances.values():
-            if await plugin.is_team_supported(team):
-                return plugin
-        return None
+        route = await cls.route_team(team)
+        return route[0] if route else None
     
     @classmethod
     async def find_plugin_for_player(cls, player_name: str) -> Optional[SportsBotPlugin]:
@@ -75,11 +224,38 @@ class PluginManager:
         Returns:
             Plugin instance that supports the player, or None if no plugin found
         """
-        cls._initialize()
-        for plugin in cls._plugin_instances.values():
-            if await plugin.is_player_supported(player_name):
-                return plugin
-        return None
+        route = await cls.route_player(player_name)
+        return route[0] if route else None
+
+    @classmethod
+    @traced("plugin_manager.route_player")
+    async def route_player(cls, player_name: str) -> Optional[Tuple[SportsBotPlugin, Optional[RequestContext]]]:
+        """
+        Find the plugin that supports the given player, keeping what it resolved.
+
+        Args:
+            player_name: Player name to find a plugin for
+
+        Returns:
+            Tuple of the plugin and the request context it filled in
+            ``resolve_player``, or None if no plugin supports the player. The
+            context is None if the plugin didn't resolve anything.
+        """
+        await cls.load_plugins()
+        # Each plugin gets its own context since they may be probed concurrently
+        request_contexts: Dict[str, RequestContext] = {}
+
+        def resolve(plugin):
+            request_context = RequestContext(query=player_name)
+            request_contexts[plugin.get_plugin_name()] = request_context
+            return plugin.resolve_player(player_name, request_context)
+
+        plugin = await cls._prober.find_first("player", list(cls._plugin_instances.values()), resolve)
+        if not plugin:
+            return None
+
+        request_context = request_contexts[plugin.get_plugin_name()]
+        return plugin, request_context if request_context.is_resolved else None
 
     @classmethod
     def find_plugin_by_name(cls, plugin_name: str) -> Optional[SportsBotPlugin]:
@@ -139,4 +315,47 @@ class PluginManager:
             for handler in handlers:
                 application.add_handler(handler)
             if handlers:
-                logger.info(f"Registered {len(handlers)} handlers from plugin {plugin.get_plugin_name()}") 
\ No newline at end of file
+                logger.info(f"Registered {len(handlers)} handlers from plugin {plugin.get_plugin_name()}")
+
+    @classmethod
+    def set_http_client(cls, http_client: HttpClient) -> None:
+        """
+        Share the application-wide pooled HTTP client with every plugin.
+
+        Args:
+            http_client: Client created at startup and closed on shutdown
+        """
+        cls._initialize()
+        for plugin in cls._plugin_instances.values():
+            plugin.set_http_client(http_client)
+
+    @classmethod
+    def set_cache_backend(cls, cache_backend: CacheBackend) -> None:
+        """
+        Share the configured cache backend with every plugin.
+
+        Args:
+            cache_backend: Backend created at startup and closed on shutdown
+        """
+        cls._initialize()
+        for plugin in cls._plugin_instances.values():
+            plugin.set_cache_backend(cache_backend)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Let every plugin start its background work (e.g. scoreboard pollers). Lazy plugins start when loaded."""
+        cls._initialize()
+        for plugin in cls._plugin_instances.values():
+            try:
+                await plugin.start()
+            except Exception as e:
+                logger.error(f"Failed to start plugin {plugin.get_plugin_name()}: {str(e)}")
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Give every plugin a chance to release its resources"""
+        for plugin in cls._plugin_instances.values():
+            try:
+                await plugin.shutdown()
+            except Exception as e:
+                logger.error(f"Failed to shut down plugin {plugin.get_plugin_name()}: {str(e)}")
@@ -0,0 +1,198 @@
+import asyncio
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from functools import partial, wraps
+from typing import Any, Dict, List, Optional, Sequence
+from telegram import BotCommand
+from telegram.ext import BaseHandler, CommandHandler
+from sports_bot_telegram_plugin import SportsBotPlugin, HttpClient, CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Shipped next to the plugin's modules, e.g. nba_plugin/plugin.json
+MANIFEST_FILE = "plugin.json"
+
+
+def read_manifest(entry_point) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest shipped in an entry point's package, without importing the package.
+
+    Args:
+        entry_point: Entry point of the ``sports_bot_telegram_plugins`` group
+
+    Returns:
+        The manifest, or None if the package doesn't ship one
+
+    Raises:
+        ValueError: If the manifest isn't valid JSON or has no ``plugin_name``
+    """
+    package = entry_point.module.split(".")[0]
+    try:
+        # Finding a top-level package doesn't execute its __init__
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+
+    for location in spec.submodule_search_locations:
+        path = os.path.join(location, MANIFEST_FILE)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+            if not isinstance(manifest, dict) or not manifest.get("plugin_name"):
+                raise ValueError(f"{path} has no plugin name")
+            return manifest
+    return None
+
+
+class LazyPlugin:
+    """
+    Stands in for an entry-point plugin until the plugin is first used.
+
+    The plugin's name, metadata and commands come from its manifest, so the
+    bot can register its commands and handlers without importing it (and its
+    dependencies). The plugin is imported, instantiated and started the first
+    time one of its methods is called, or when ``PluginManager.load_plugins``
+    warms it up. Its coroutine methods are wrapped so the import runs in a
+    worker thread instead of blocking the event loop. Its other attributes
+    can only be proxied by importing the plugin in place, so on the event
+    loop they should be read after ``ensure_started`` (or the warm-up).
+    """
+
+    def __init__(self, entry_point, manifest: Dict[str, Any]):
+        self.entry_point = entry_point
+        # What the plugin's get_plugin_name() returns (its class name, unless
+        # overridden), which e.g. followed teams are stored under
+        self.plugin_name = manifest["plugin_name"]
+        self.name = manifest.get("name", "")
+        self.common_name = manifest.get("common_name", "")
+        self.description = manifest.get("description", "")
+        self.version = manifest.get("version", "")
+        self.commands: List[BotCommand] = [
+            BotCommand(command["command"], command["description"]) for command in manifest.get("commands", [])
+        ]
+        self.load_seconds: Optional[float] = None
+        self._plugin: Optional[SportsBotPlugin] = None
+        self._load_lock = threading.Lock()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._http_client: Optional[HttpClient] = None
+        self._cache_backend: Optional[CacheBackend] = None
+        self._handlers: Optional[Sequence[BaseHandler]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._plugin is not None
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    def load(self) -> SportsBotPlugin:
+        """
+        Import and instantiate the plugin, once. Safe to call from any thread.
+
+        Returns:
+            The plugin instance, with the bot's HTTP client and cache backend
+        """
+        with self._load_lock:
+            if self._plugin is None:
+                start = time.perf_counter()
+                plugin_class = self.entry_point.load()()
+                plugin = plugin_class()
+                if self._http_client is not None:
+                    plugin.set_http_client(self._http_client)
+                if self._cache_backend is not None:
+                    plugin.set_cache_backend(self._cache_backend)
+                self.load_seconds = time.perf_counter() - start
+                logger.info(f"Loaded plugin: {self.entry_point.name} version {plugin.version} in {self.load_seconds:.2f}s")
+                self._check_manifest(plugin)
+                self._plugin = plugin
+        return self._plugin
+
+    def _check_manifest(self, plugin: SportsBotPlugin) -> None:
+        manifest_commands = [(command.command, command.description) for command in self.commands]
+        plugin_commands = [(command.command, command.description) for command in plugin.commands]
+        if plugin.get_plugin_name() != self.plugin_name or plugin.name != self.name or plugin_commands != manifest_commands:
+            logger.warning(f"The {MANIFEST_FILE} of plugin {self.entry_point.name} doesn't match the plugin's name or commands")
+
+    async def ensure_started(self) -> SportsBotPlugin:
+        """Load the plugin off the event loop and start it, once."""
+        plugin = self._plugin
+        if plugin is None:
+            plugin = await asyncio.to_thread(self.load)
+        if not self._started:
+            async with self._start_lock:
+                if not self._started:
+                    try:
+                        await plugin.start()
+                    except Exception as e:
+                        logger.error(f"Failed to start plugin {self.name}: {str(e)}")
+                    self._started = True
+        return plugin
+
+    def get_plugin_name(self) -> str:
+        return self.plugin_name
+
+    def get_handlers(self) -> Sequence[BaseHandler]:
+        """Handlers for the manifest's commands, which load the plugin and pass the update on to its own handlers."""
+        return [CommandHandler(command.command, partial(self._dispatch_command, command.command)) for command in self.commands]
+
+    async def _dispatch_command(self, command, update, context):
+        plugin = await self.ensure_started()
+        if self._handlers is None:
+            self._handlers = plugin.get_handlers()
+        for handler in self._handlers:
+            if isinstance(handler, CommandHandler) and command in handler.commands:
+                # Let the plugin's handler apply its own filters and argument checks
+                check_result = handler.check_update(update)
+                if check_result is None or check_result is False:
+                    return None
+                return await handler.handle_update(update, context.application, check_result, context)
+        logger.warning(f"Plugin {self.name} has no handler for /{command}, which its {MANIFEST_FILE} lists")
+
+    def set_http_client(self, http_client: HttpClient) -> None:
+        self._http_client = http_client
+        if self._plugin is not None:
+            self._plugin.set_http_client(http_client)
+
+    def set_cache_backend(self, cache_backend: CacheBackend) -> None:
+        self._cache_backend = cache_backend
+        if self._plugin is not None:
+            self._plugin.set_cache_backend(cache_backend)
+
+    async def start(self) -> None:
+        """Start the plugin if it is already loaded; otherwise it starts when first used."""
+        if self._plugin is not None:
+            await self.ensure_started()
+
+    async def shutdown(self) -> None:
+        if self._plugin is not None:
+            await self._plugin.shutdown()
+
+    def __getattr__(self, name):
+        # Only called for attributes the proxy doesn't define itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if inspect.iscoroutinefunction(getattr(SportsBotPlugin, name, None)):
+            @wraps(getattr(SportsBotPlugin, name))
+            async def call_plugin(*args, **kwargs):
+                plugin = await self.ensure_started()
+                return await getattr(plugin, name)(*args, **kwargs)
+            return call_plugin
+
+        if self._plugin is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                logger.warning(f"Plugin {self.name} is being imported on the event loop to read its {name!r} attribute")
+        return getattr(self.load(), name)
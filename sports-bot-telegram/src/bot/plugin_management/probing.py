@@ -0,0 +1,138 @@
+"""
+Plugin Probing
+==============
+
+Asks plugins whether they support a team or player, either one after another
+or all at once.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sports_bot_telegram_plugin import SportsBotPlugin
+
+logger = logging.getLogger(__name__)
+
+PROBE_MODES = ("sequential", "parallel")
+
+
+class ProbeStats:
+    def __init__(self):
+        self.probes = 0
+        self.matches = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+
+    def record(self, seconds):
+        self.probes += 1
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+
+    def as_dict(self):
+        return {
+            "probes": self.probes,
+            "matches": self.matches,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "avg_ms": round(self.seconds_total / self.probes * 1000, 1) if self.probes else 0.0,
+            "max_ms": round(self.seconds_max * 1000, 1),
+        }
+
+
+class PluginProber:
+    """
+    Finds the first plugin, in priority order, whose check returns True.
+
+    In ``sequential`` mode plugins are checked one after another. In
+    ``parallel`` mode every check starts at once, each bounded by ``timeout``
+    seconds; the result is still the highest-priority match, and the remaining
+    checks are cancelled as soon as it is known. A check that times out or
+    raises counts as "not supported". Latency is recorded per probe kind and
+    plugin.
+    """
+
+    def __init__(self, mode: str = "sequential", timeout: float = 5.0):
+        if mode not in PROBE_MODES:
+            raise ValueError(f"Unknown plugin probe mode {mode!r}, expected one of {PROBE_MODES}")
+        self.mode = mode
+        self.timeout = timeout
+        self._stats: Dict[str, Dict[str, ProbeStats]] = {}
+
+    def _get_stats(self, kind, plugin) -> ProbeStats:
+        plugin_stats = self._stats.setdefault(kind, {})
+        stats = plugin_stats.get(plugin.get_plugin_name())
+        if stats is None:
+            stats = ProbeStats()
+            plugin_stats[plugin.get_plugin_name()] = stats
+        return stats
+
+    async def _check(self, kind, plugin, check, timeout) -> bool:
+        stats = self._get_stats(kind, plugin)
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                supported = await check(plugin)
+            else:
+                supported = await asyncio.wait_for(check(plugin), timeout)
+        except asyncio.CancelledError:
+            # A higher-priority plugin already matched
+            stats.cancelled += 1
+            raise
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"Plugin {plugin.get_plugin_name()} timed out checking {kind} support")
+            supported = False
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Plugin {plugin.get_plugin_name()} failed checking {kind} support: {str(e)}")
+            supported = False
+
+        stats.record(time.perf_counter() - start)
+        if supported:
+            stats.matches += 1
+        return bool(supported)
+
+    async def find_first(
+        self,
+        kind: str,
+        plugins: List[SportsBotPlugin],
+        check: Callable[[SportsBotPlugin], Awaitable[bool]],
+    ) -> Optional[SportsBotPlugin]:
+        """
+        Find the first plugin in ``plugins`` for which ``check`` returns True.
+
+        Args:
+            kind: What is being probed (e.g. ``"team"``), used to group stats
+            plugins: Plugins in priority order
+            check: Coroutine function asking one plugin whether it supports the query
+
+        Returns:
+            The highest-priority supporting plugin, or None
+        """
+        if self.mode == "sequential":
+            for plugin in plugins:
+                if await self._check(kind, plugin, check, None):
+                    return plugin
+            return None
+
+        tasks = [asyncio.ensure_future(self._check(kind, plugin, check, self.timeout)) for plugin in plugins]
+        try:
+            for plugin, task in zip(plugins, tasks):
+                if await task:
+                    return plugin
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, Dict]]:
+        return {
+            kind: {plugin_name: stats.as_dict() for plugin_name, stats in plugin_stats.items()}
+            for kind, plugin_stats in self._stats.items()
+        }
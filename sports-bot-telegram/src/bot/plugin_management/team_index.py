@@ -0,0 +1,82 @@
+"""
+Team Index
+==========
+
+Alias index used to route team queries to the plugin that covers them.
+"""
+
+import logging
+import re
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from rapidfuzz import process
+from sports_bot_telegram_plugin import SportsBotPlugin
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_alias(value: str) -> str:
+    normalized = re.sub(r"[^a-z0-9\s]", " ", (value or "").lower())
+    return " ".join(normalized.split())
+
+
+class TeamIndex:
+    """
+    Maps every team alias of every plugin to ``(plugin, team_id)``.
+
+    Exact matches on the normalized alias are a dict lookup. Anything else is
+    scored with rapidfuzz against a prebuilt choice list and only accepted at or
+    above ``min_score``. When several plugins share an alias, the plugin loaded
+    first wins.
+    """
+
+    def __init__(self, min_score: float = 85):
+        self.min_score = min_score
+        self._aliases: Dict[str, Tuple[SportsBotPlugin, Hashable]] = {}
+        self._choices: List[str] = []
+        self._resolved: Dict[str, Optional[Tuple[SportsBotPlugin, Hashable]]] = {}
+
+    def add_plugin(self, plugin: SportsBotPlugin, aliases: Dict[str, Hashable]) -> None:
+        """
+        Index a plugin's team aliases.
+
+        Args:
+            plugin: Plugin the aliases route to
+            aliases: Mapping of team alias (name, nickname, code, ...) to the plugin's team id
+        """
+        for alias, team_id in aliases.items():
+            normalized = normalize_alias(alias)
+            if normalized and normalized not in self._aliases:
+                self._aliases[normalized] = (plugin, team_id)
+
+        self._choices = list(self._aliases.keys())
+        self._resolved.clear()
+
+    def lookup(self, team: str) -> Optional[Tuple[SportsBotPlugin, Hashable]]:
+        """
+        Resolve a user's team query.
+
+        Returns:
+            Tuple of the plugin and its team id, or None if no alias matches closely enough
+        """
+        query = normalize_alias(team)
+        if not query:
+            return None
+
+        match = self._aliases.get(query)
+        if match is not None:
+            return match
+
+        if query in self._resolved:
+            return self._resolved[query]
+
+        best = process.extractOne(query, self._choices, score_cutoff=self.min_score) if self._choices else None
+        match = self._aliases[best[0]] if best else None
+        # Queries are user input, so keep the memo of fuzzy results bounded
+        if len(self._resolved) >= 4096:
+            self._resolved.clear()
+        self._resolved[query] = match
+        return match
+
+    def __len__(self) -> int:
+        return len(self._aliases)
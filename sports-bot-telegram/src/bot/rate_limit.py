@@ -0,0 +1,271 @@
+"""
+Rate Limiting
+=============
+
+Token buckets and the bot's outbound rate limiter, which keep outgoing messages
+within Telegram's send limits.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import statistics
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes for outbound requests, passed as ``rate_limit_args``. Lower goes first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PUSH = 1
+PRIORITY_LANES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_PUSH: "push"}
+
+# Endpoints that post a message to the chat and so count towards its send limit
+MESSAGE_ENDPOINTS = ("copyMessage", "copyMessages", "forwardMessage", "forwardMessages")
+
+
+def is_message_endpoint(endpoint: str) -> bool:
+    """Whether a Bot API ``endpoint`` posts a message, e.g. ``sendSticker`` but not ``deleteMessage``."""
+    # A chat action ("typing...") isn't a message
+    return (endpoint.startswith("send") and endpoint != "sendChatAction") or endpoint in MESSAGE_ENDPOINTS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second, holding at most ``capacity``.
+
+    ``reserve`` always takes a token, letting the balance go negative, and
+    returns how long the caller has to wait for it. Waiters are therefore
+    served in the order they reserved.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token. Returns the number of seconds to wait before using it."""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def is_idle(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SendRateLimiter:
+    """
+    Paces sends to stay within Telegram's limits.
+
+    Telegram allows about 30 messages per second overall, one per second to the
+    same private chat and 20 per minute to the same group. Each send waits for
+    a token from the global bucket and from its chat's bucket. Group chats are
+    recognised by their negative ids.
+    """
+
+    def __init__(self, global_rate: float = 30, chat_rate: float = 1, group_rate: float = 20 / 60, max_chats: int = 10000):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.max_chats = max_chats
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+
+    def _get_chat_bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_chats:
+                self._prune()
+            # Group ids are negative, channels may be addressed by @username
+            is_group = str(chat_id).startswith(("-", "@"))
+            bucket = TokenBucket(self.group_rate, 3) if is_group else TokenBucket(self.chat_rate, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune(self):
+        # Full buckets hold no state worth keeping
+        for chat_id in [chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.is_idle()]:
+            del self._chat_buckets[chat_id]
+
+    async def acquire(self, chat_id) -> None:
+        """Wait until a message may be sent to ``chat_id``."""
+        wait = max(self._get_chat_bucket(chat_id).reserve(), self.global_bucket.reserve())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def acquire_chat(self, chat_id) -> None:
+        """Wait for ``chat_id``'s bucket only, leaving the global bucket to the caller."""
+        await self._get_chat_bucket(chat_id).acquire()
+
+
+class LaneStats:
+    def __init__(self, max_samples: int = 1000):
+        self.sent = 0
+        self.waiting = 0
+        self.retries = 0
+        self._latencies = deque(maxlen=max_samples)
+
+    def record(self, seconds):
+        self.sent += 1
+        self._latencies.append(seconds)
+
+    def as_dict(self):
+        latencies = sorted(self._latencies)
+        return {
+            "sent": self.sent,
+            "waiting": self.waiting,
+            "retries": self.retries,
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else 0.0,
+            "latency_p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1) if latencies else 0.0,
+        }
+
+
+class TelegramRateLimiter(BaseRateLimiter[int]):
+    """
+    Outbound rate limiter for every Telegram API request the bot makes.
+
+    Requests that post a message (``send*``, ``copyMessage``, ``forwardMessage``)
+    first wait for their chat's token bucket (one per second for private chats,
+    20 per minute for groups), so a busy chat only delays itself. Deletes,
+    edits and lookups skip it. Every request then queues for the global bucket in its priority lane:
+    ``rate_limit_args`` of ``PRIORITY_INTERACTIVE`` (the default, replies to
+    commands) is served ahead of ``PRIORITY_PUSH`` (follow updates). When
+    Telegram answers with ``RetryAfter``, all sends pause for the requested time
+    and the request is retried up to ``max_retries`` times.
+
+    Queue depth, send counts, retries and send latency (including time spent
+    waiting) are reported per lane by ``stats``.
+    """
+
+    def __init__(self, global_rate: float = 30, chat_rate: float = 1, group_rate: float = 20 / 60, max_retries: int = 2):
+        self.chat_limiter = SendRateLimiter(global_rate=global_rate, chat_rate=chat_rate, group_rate=group_rate)
+        self.max_retries = max_retries
+        self._queue = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self._lanes: Dict[int, LaneStats] = {}
+        self.retry_after_count = 0
+
+    async def initialize(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def shutdown(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        # Let anything still queued go out rather than hang
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+
+    def _get_lane(self, priority) -> LaneStats:
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = LaneStats()
+            self._lanes[priority] = lane
+        return lane
+
+    async def _dispatch(self):
+        global_bucket = self.chat_limiter.global_bucket
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            await global_bucket.acquire()
+            # Hand the token to the highest-priority request waiting now
+            while self._queue:
+                _, _, future = heapq.heappop(self._queue)
+                if not future.done():
+                    future.set_result(None)
+                    break
+            else:
+                global_bucket.tokens += 1
+
+    async def _acquire_global(self, priority):
+        if self._dispatcher is None:
+            # Not initialized (e.g. the bot is used outside an application)
+            await self.chat_limiter.global_bucket.acquire()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self._wakeup.set()
+        await future
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ):
+        priority = rate_limit_args if rate_limit_args is not None else PRIORITY_INTERACTIVE
+        chat_id = data.get("chat_id") if is_message_endpoint(endpoint) else None
+        lane = self._get_lane(priority)
+        start = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            lane.waiting += 1
+            try:
+                if chat_id is not None:
+                    await self.chat_limiter.acquire_chat(chat_id)
+                await self._acquire_global(priority)
+            finally:
+                lane.waiting -= 1
+
+            try:
+                result = await callback(*args, **kwargs)
+            except RetryAfter as e:
+                retry_after = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else float(e.retry_after)
+                self.retry_after_count += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                logger.warning(f"Telegram flood limit hit on {endpoint}, pausing sends for {retry_after}s")
+                if attempt == self.max_retries:
+                    raise
+                lane.retries += 1
+                continue
+
+            lane.record(time.perf_counter() - start)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lanes": {PRIORITY_LANES.get(priority, str(priority)): lane.as_dict() for priority, lane in sorted(self._lanes.items())},
+            "queued": sum(lane.waiting for lane in self._lanes.values()),
+            "retry_after": self.retry_after_count,
+            "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
@@ -0,0 +1,86 @@
+"""
+Render Executor
+===============
+
+Runs CPU-bound image rendering off the event loop.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueFullError(Exception):
+    """Raised when a render could not be queued before the queue timeout."""
+
+
+class RenderExecutor:
+    """
+    Bounded worker pool for rendering.
+
+    ``backend`` is either ``"thread"`` or ``"process"``. At most ``max_pending``
+    renders may be queued or running at once; further callers wait for a slot,
+    and give up with ``RenderQueueFullError`` after ``queue_timeout`` seconds.
+    Functions submitted to the process backend and their arguments must be
+    picklable.
+    """
+
+    def __init__(self, backend: str = "thread", max_workers: int = 2, max_pending: int = 32, queue_timeout: float = 10.0):
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown render backend '{backend}', expected 'thread' or 'process'")
+
+        self.backend = backend
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(max_pending)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="render")
+        return self._executor
+
+    async def submit(self, func: Callable, *args):
+        """
+        Run ``func(*args)`` on the worker pool and await its result.
+
+        Raises:
+            RenderQueueFullError: If no queue slot frees up within ``queue_timeout``.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RenderQueueFullError(f"Render queue is full ({self.max_pending} pending)")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
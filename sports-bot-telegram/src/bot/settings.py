@@ -10,3 +10,74 @@ from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
+
+# Optional directory (ideally a tmpfs mount) to spool score stickers to instead
+# of rendering them in memory
+STICKER_SPOOL_DIR = os.getenv("STICKER_SPOOL_DIR")
+
+# Number of rendered score stickers kept in memory, and an optional directory
+# that evicted stickers are spilled to
+STICKER_CACHE_SIZE = int(os.getenv("STICKER_CACHE_SIZE", "256"))
+STICKER_CACHE_DIR = os.getenv("STICKER_CACHE_DIR")
+
+# Directory used to cache team logos downloaded from plugin-provided URLs
+LOGO_CACHE_DIR = os.getenv("LOGO_CACHE_DIR", "logo-cache")
+
+# Worker pool used to render score stickers off the event loop. The backend is
+# either "thread" or "process"; renders beyond RENDER_MAX_PENDING wait for a slot
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "thread")
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_MAX_PENDING = int(os.getenv("RENDER_MAX_PENDING", "32"))
+
+# How plugins are asked whether they support a team or player: "sequential"
+# (one after another) or "parallel" (all at once, each bounded by
+# PLUGIN_PROBE_TIMEOUT seconds, first match in plugin order wins)
+PLUGIN_PROBE_MODE = os.getenv("PLUGIN_PROBE_MODE", "sequential")
+PLUGIN_PROBE_TIMEOUT = float(os.getenv("PLUGIN_PROBE_TIMEOUT", "5"))
+
+# How plugins are loaded: "lazy" (plugins that ship a plugin.json manifest are
+# imported when first used) or "eager" (all at startup). With PLUGIN_WARMUP on
+# (the default), lazy plugins, team logos and fonts are loaded in the background
+# right after startup instead of before it (logos) or by the first command that
+# needs them, which would otherwise wait for every plugin to import
+PLUGIN_LOADING = os.getenv("PLUGIN_LOADING", "lazy")
+PLUGIN_WARMUP = os.getenv("PLUGIN_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# JSON file holding the teams each chat follows with /follow, and how often (in
+# seconds) followed games are polled for score and status changes
+FOLLOW_STORE_PATH = os.getenv("FOLLOW_STORE_PATH", "subscriptions.json")
+FOLLOW_POLL_INTERVAL = float(os.getenv("FOLLOW_POLL_INTERVAL", "30"))
+
+# How updates are received: "polling" (default) or "webhook". In webhook mode
+# Telegram POSTs updates to WEBHOOK_URL + WEBHOOK_PATH, which should reach the
+# server listening on WEBHOOK_LISTEN:WEBHOOK_PORT (e.g. through a TLS proxy).
+# Updates must carry WEBHOOK_SECRET_TOKEN, and pending updates get up to
+# WEBHOOK_DRAIN_TIMEOUT seconds on shutdown
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN")
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "10"))
+
+# Cache shared by the bot and its plugins: memory://, disk://<dir>, redis://...
+# (requires the redis package) or fakeredis:// for local testing. With a shared
+# store, replicas reuse each other's upstream responses and rendered stickers.
+# Unset keeps each plugin's own default cache
+SPORTS_BOT_CACHE_URL = os.getenv("SPORTS_BOT_CACHE_URL")
+
+# Outbound Telegram send limits: requests per second overall and per private
+# chat, requests per minute per group, and retries after a flood-limit error
+TELEGRAM_SEND_RATE = float(os.getenv("TELEGRAM_SEND_RATE", "30"))
+TELEGRAM_CHAT_SEND_RATE = float(os.getenv("TELEGRAM_CHAT_SEND_RATE", "1"))
+TELEGRAM_GROUP_SENDS_PER_MINUTE = float(os.getenv("TELEGRAM_GROUP_SENDS_PER_MINUTE", "20"))
+TELEGRAM_SEND_MAX_RETRIES = int(os.getenv("TELEGRAM_SEND_MAX_RETRIES", "2"))
+
+# Port of the Prometheus /metrics endpoint (stage latency histograms and queue
+# gauges), unset to disable it. With OTEL_EXPORTER_OTLP_ENDPOINT set, spans are
+# also exported to that OpenTelemetry collector over OTLP/HTTP (requires the
+# opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http packages)
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+METRICS_LISTEN = os.getenv("METRICS_LISTEN", "0.0.0.0")
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
@@ -0,0 +1,236 @@
+"""
+Sticker Cache
+=============
+
+Content-addressed cache for rendered score stickers.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from sports_bot_telegram_plugin import CacheBackend, SingleFlight
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+
+logger = logging.getLogger(__name__)
+
+# The MatchScores fields the score card renderer draws; game_start_time isn't one
+RENDERED_FIELDS = (
+    "home_team",
+    "home_team_record",
+    "home_score",
+    "home_team_logo_url",
+    "away_team",
+    "away_team_record",
+    "away_score",
+    "away_team_logo_url",
+    "game_status",
+    "game_curr_time",
+)
+
+
+class StickerCache:
+    """
+    Bounded LRU of rendered WebP stickers keyed on the ``MatchScores`` they show.
+
+    Entries evicted from memory are optionally spilled to ``spill_dir`` and
+    promoted back on the next hit. Spill files are written and read in worker
+    threads, and the directory is pruned down to ``max_spill_entries`` every
+    ``spill_prune_interval`` spills. The cache also remembers the Telegram
+    ``file_id`` of each uploaded sticker so repeat requests for the same game
+    state can skip both rendering and upload. Concurrent misses for the same
+    key render the sticker once.
+
+    With a ``shared_backend`` (e.g. Redis), rendered stickers and file ids are
+    also published there, so a sticker rendered or uploaded by one replica is
+    reused by the others, and only one replica renders a given game state.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        spill_dir: Optional[str] = None,
+        max_spill_entries: int = 2048,
+        spill_prune_interval: int = 64,
+        shared_backend: Optional[CacheBackend] = None,
+        shared_ttl: float = 3600,
+    ):
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self.max_spill_entries = max_spill_entries
+        self.spill_prune_interval = spill_prune_interval
+        self.shared_backend = shared_backend
+        self.shared_ttl = shared_ttl
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._file_ids: OrderedDict[str, str] = OrderedDict()
+        self._renders = SingleFlight()
+        # Evicted payloads whose spill file isn't written yet
+        self._unspilled: Dict[str, bytes] = {}
+        self._spill_tasks: Set[asyncio.Task] = set()
+        self._spill_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.file_id_hits = 0
+        self.shared_file_id_hits = 0
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(team_scores: MatchScores) -> str:
+        """Build a canonical hash of every field that affects the rendered sticker."""
+        fields = {name: getattr(team_scores, name, None) for name in RENDERED_FIELDS}
+        canonical = json.dumps(fields, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached WebP payload for ``key``, or None on a miss."""
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+        payload = self._unspilled.get(key)
+        if payload is None and self.spill_dir:
+            payload = await asyncio.to_thread(self._read_spilled, key)
+        if payload is not None:
+            self.hits += 1
+            self.put(key, payload)
+            return payload
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, payload: bytes) -> None:
+        """Cache ``payload`` under ``key``. Called from the event loop, which spills evicted entries in the background."""
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted_payload = self._entries.popitem(last=False)
+            if self.spill_dir:
+                self._start_spill(evicted_key, evicted_payload)
+
+    async def wait_spilled(self) -> None:
+        """Wait until every evicted sticker has been written to the spill directory."""
+        while self._spill_tasks:
+            await asyncio.gather(*self._spill_tasks, return_exceptions=True)
+
+    def get_file_id(self, key: str) -> Optional[str]:
+        """Return the Telegram ``file_id`` of a previously uploaded sticker."""
+        file_id = self._file_ids.get(key)
+        if file_id is not None:
+            self._file_ids.move_to_end(key)
+            self.file_id_hits += 1
+        return file_id
+
+    def set_file_id(self, key: str, file_id: str) -> None:
+        self._file_ids[key] = file_id
+        self._file_ids.move_to_end(key)
+        while len(self._file_ids) > self.max_entries:
+            self._file_ids.popitem(last=False)
+
+    def forget_file_id(self, key: str) -> None:
+        self._file_ids.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every payload and file id held in memory (spilled stickers stay on disk)."""
+        self._entries.clear()
+        self._file_ids.clear()
+
+    async def get_shared_file_id(self, key: str) -> Optional[str]:
+        """Return a ``file_id`` another replica uploaded for ``key``, remembering it locally."""
+        if self.shared_backend is None:
+            return None
+        file_id = await self.shared_backend.get(f"sticker:file_id:{key}")
+        if file_id is not None:
+            self.set_file_id(key, file_id)
+            self.shared_file_id_hits += 1
+        return file_id
+
+    async def publish_file_id(self, key: str, file_id: str) -> None:
+        """Remember an uploaded sticker's ``file_id``, and share it with other replicas."""
+        self.set_file_id(key, file_id)
+        if self.shared_backend is not None:
+            await self.shared_backend.set(f"sticker:file_id:{key}", file_id, self.shared_ttl)
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Return the WebP payload for ``key``, rendering it on a miss.
+
+        Concurrent misses for the same key share one render. With a shared
+        backend, a sticker another replica rendered is reused, and concurrent
+        misses across replicas render it once.
+        """
+        payload = await self.get(key)
+        if payload is not None:
+            return payload
+
+        async def render_and_store():
+            if self.shared_backend is not None:
+                payload = await self.shared_backend.get_or_fetch(f"sticker:webp:{key}", render, self.shared_ttl)
+            else:
+                payload = await render()
+            self.put(key, payload)
+            return payload
+
+        return await self._renders.do(key, render_and_store)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "file_ids": len(self._file_ids),
+            "hits": self.hits,
+            "misses": self.misses,
+            "file_id_hits": self.file_id_hits,
+            "shared_file_id_hits": self.shared_file_id_hits,
+            "deduplicated_renders": self._renders.deduplicated,
+        }
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.webp")
+
+    def _start_spill(self, key: str, payload: bytes) -> None:
+        self._unspilled[key] = payload
+        self._spill_count += 1
+        prune = self._spill_count % self.spill_prune_interval == 0
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._spill, key, payload, prune))
+        self._spill_tasks.add(task)
+        task.add_done_callback(lambda task: self._finish_spill(key, payload, task))
+
+    def _finish_spill(self, key: str, payload: bytes, task: asyncio.Task) -> None:
+        self._spill_tasks.discard(task)
+        # Unless it was evicted again since, with a newer spill under way
+        if self._unspilled.get(key) is payload:
+            del self._unspilled[key]
+
+    def _spill(self, key: str, payload: bytes, prune: bool) -> None:
+        try:
+            with open(self._spill_path(key), "wb") as spill_file:
+                spill_file.write(payload)
+            if prune:
+                self._prune_spill_dir()
+        except OSError as e:
+            logger.warning(f"Failed to spill sticker {key}: {e}")
+
+    def _read_spilled(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._spill_path(key), "rb") as spill_file:
+                return spill_file.read()
+        except OSError:
+            return None
+
+    def _prune_spill_dir(self) -> None:
+        spilled = [entry for entry in os.scandir(self.spill_dir) if entry.name.endswith(".webp")]
+        if len(spilled) <= self.max_spill_entries:
+            return
+        spilled.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in spilled[:len(spilled) - self.max_spill_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,300 @@
+"""
+Subscriptions
+=============
+
+Persistent team follows and the poll loop that pushes score updates to them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import telegram
+from sports_bot_telegram_plugin import SportsBotPlugin
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from sports_bot_telegram_plugin.types.RequestContext import RequestContext
+
+from .plugin_management import PluginManager
+from .plugin_management.team_index import normalize_alias
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionStore:
+    """
+    Team follows per chat, persisted as a JSON file.
+
+    Each follow records the plugin that covers the team (by plugin name), the
+    team query to ask it for and, when routing resolved one, the plugin's team
+    id. The file is rewritten atomically on every change.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._follows: Dict[int, List[Dict]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._follows = {int(chat_id): follows for chat_id, follows in data.items()}
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read subscriptions from {self.path}: {str(e)}")
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({str(chat_id): follows for chat_id, follows in self._follows.items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not write subscriptions to {self.path}: {str(e)}")
+
+    @staticmethod
+    def follow_key(follow: Dict) -> Tuple[str, Hashable]:
+        """Identify the followed team independently of how the user spelled it."""
+        team_id = follow.get("team_id")
+        return follow["plugin"], team_id if team_id is not None else normalize_alias(follow["team"])
+
+    def add(self, chat_id: int, plugin_name: str, team: str, team_id: Optional[Hashable] = None) -> bool:
+        """
+        Follow a team in a chat.
+
+        Returns:
+            False if the chat already follows the team
+        """
+        follow = {"plugin": plugin_name, "team": team, "team_id": team_id}
+        follows = self._follows.setdefault(chat_id, [])
+        if any(self.follow_key(existing) == self.follow_key(follow) for existing in follows):
+            return False
+        follows.append(follow)
+        self._save()
+        return True
+
+    def remove(self, chat_id: int, team: Optional[str] = None, plugin_name: Optional[str] = None, team_id: Optional[Hashable] = None) -> List[Dict]:
+        """
+        Stop following a team in a chat, or every team if ``team`` is None.
+
+        Args:
+            chat_id: Chat to remove the follows of
+            team: Team as the user typed it
+            plugin_name: Plugin the team was routed to, if it was
+            team_id: The plugin's id for the team, if routing resolved one
+
+        A follow matches on its ``follow_key`` when the team was routed, so any
+        alias of the team works, and otherwise on its normalized name (the way
+        it was followed, as listed by ``/following``).
+
+        Returns:
+            The follows that were removed
+        """
+        follows = self._follows.get(chat_id, [])
+        if team is None:
+            removed, kept = follows, []
+        else:
+            query = normalize_alias(team)
+            key = self.follow_key({"plugin": plugin_name, "team": team, "team_id": team_id}) if plugin_name else None
+
+            def matches(follow):
+                return normalize_alias(follow["team"]) == query or (key is not None and self.follow_key(follow) == key)
+
+            removed = [follow for follow in follows if matches(follow)]
+            kept = [follow for follow in follows if not matches(follow)]
+
+        if removed:
+            if kept:
+                self._follows[chat_id] = kept
+            else:
+                self._follows.pop(chat_id, None)
+            self._save()
+        return removed
+
+    def get(self, chat_id: int) -> List[Dict]:
+        return list(self._follows.get(chat_id, []))
+
+    def get_followed_teams(self, plugin_name: str) -> Dict[Tuple[str, Hashable], Tuple[Dict, Set[int]]]:
+        """
+        Group every follow of a plugin's teams.
+
+        Returns:
+            Mapping of follow key to one representative follow and the chats following it
+        """
+        followed = {}
+        for chat_id, follows in self._follows.items():
+            for follow in follows:
+                if follow["plugin"] != plugin_name:
+                    continue
+                key = self.follow_key(follow)
+                if key not in followed:
+                    followed[key] = (follow, set())
+                followed[key][1].add(chat_id)
+        return followed
+
+    def get_plugin_names(self) -> Set[str]:
+        return {follow["plugin"] for follows in self._follows.values() for follow in follows}
+
+
+class FollowManager:
+    """
+    Pushes a score sticker to every chat following a team whenever its game changes.
+
+    One poll loop runs per plugin with followed teams. Each round asks the
+    plugin for every followed team's current game and groups the answers by
+    game, so two chats following opposite sides of the same game share it. A
+    game is pushed when its score or status (period, half time, final, ...)
+    differs from the previous round; the first sighting of a game only records
+    its state. A game whose fetch failed keeps its state from the last round
+    it was seen in. The update is sent to one chat first, so it is rendered and
+    uploaded once, and then fanned out to the remaining chats, which reuse the
+    uploaded sticker. ``send`` is expected to go through the bot's rate limiter,
+    which paces the fan-out within Telegram's limits.
+    """
+
+    def __init__(
+        self,
+        store: SubscriptionStore,
+        send: Callable[[telegram.Bot, int, MatchScores], Awaitable],
+        interval: float = 30,
+    ):
+        self.store = store
+        self.send = send
+        self.bot: Optional[telegram.Bot] = None
+        self.interval = interval
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._game_states: Dict[str, Dict[Tuple, Tuple]] = {}
+        # The game each followed team was last seen in, per plugin
+        self._followed_games: Dict[str, Dict[Tuple[str, Hashable], Tuple]] = {}
+        self.pushes = 0
+        self.send_errors = 0
+
+    @staticmethod
+    def _find_plugin(plugin_name: str) -> Optional[SportsBotPlugin]:
+        for plugin in PluginManager.get_all_plugins():
+            if plugin.get_plugin_name() == plugin_name:
+                return plugin
+        return None
+
+    def start(self, bot: telegram.Bot) -> None:
+        """Start polling for every plugin that already has followers, pushing updates through ``bot``."""
+        self.bot = bot
+        for plugin_name in self.store.get_plugin_names():
+            self._ensure_poller(plugin_name)
+
+    async def stop(self) -> None:
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for task in pollers:
+            task.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+
+    def follow(self, chat_id: int, plugin: SportsBotPlugin, team: str, team_id: Optional[Hashable] = None) -> bool:
+        added = self.store.add(chat_id, plugin.get_plugin_name(), team, team_id)
+        if added:
+            self._ensure_poller(plugin.get_plugin_name())
+        return added
+
+    def unfollow(self, chat_id: int, team: Optional[str] = None, plugin: Optional[SportsBotPlugin] = None, team_id: Optional[Hashable] = None) -> List[Dict]:
+        # Poll loops exit by themselves once their plugin has no followers left
+        return self.store.remove(chat_id, team, plugin.get_plugin_name() if plugin else None, team_id)
+
+    def _ensure_poller(self, plugin_name: str) -> None:
+        task = self._pollers.get(plugin_name)
+        if self.bot is not None and (task is None or task.done()):
+            self._pollers[plugin_name] = asyncio.create_task(self._run(plugin_name))
+
+    async def _run(self, plugin_name: str):
+        try:
+            while True:
+                followed = self.store.get_followed_teams(plugin_name)
+                plugin = self._find_plugin(plugin_name)
+                if not followed or plugin is None:
+                    break
+                try:
+                    await self._poll(plugin, followed)
+                except Exception as e:
+                    logger.error(f"Polling followed teams of {plugin_name} failed: {str(e)}")
+                await asyncio.sleep(self.interval)
+        finally:
+            if self._pollers.get(plugin_name) is asyncio.current_task():
+                del self._pollers[plugin_name]
+            self._game_states.pop(plugin_name, None)
+            self._followed_games.pop(plugin_name, None)
+
+    async def _get_scores(self, plugin: SportsBotPlugin, follow: Dict) -> Optional[MatchScores]:
+        if follow.get("team_id") is None:
+            return await plugin.get_live_scores(follow["team"])
+        request_context = RequestContext(follow["team"], entity_id=follow["team_id"], team_id=follow["team_id"])
+        return await plugin.get_live_scores(follow["team"], request_context=request_context)
+
+    async def _poll(self, plugin: SportsBotPlugin, followed: Dict[Tuple[str, Hashable], Tuple[Dict, Set[int]]]):
+        plugin_name = plugin.get_plugin_name()
+        results = await asyncio.gather(*(self._get_scores(plugin, follow) for follow, _ in followed.values()), return_exceptions=True)
+        previous_states = self._game_states.get(plugin_name, {})
+        previous_games = self._followed_games.get(plugin_name, {})
+
+        games: Dict[Tuple, Tuple[MatchScores, Set[int]]] = {}
+        followed_games: Dict[Tuple[str, Hashable], Tuple] = {}
+        for (follow_key, (follow, chat_ids)), team_scores in zip(followed.items(), results):
+            if isinstance(team_scores, Exception):
+                logger.warning(f"Could not get scores for followed team {follow['team']}: {str(team_scores)}")
+                # Remember its game, or the next round would take it for a first sighting
+                if follow_key in previous_games:
+                    followed_games[follow_key] = previous_games[follow_key]
+                continue
+            if not isinstance(team_scores, MatchScores):
+                continue
+            # The start time is not part of the key since some plugins swap it for the status before tip-off
+            game_key = (team_scores.home_team, team_scores.away_team)
+            followed_games[follow_key] = game_key
+            if game_key not in games:
+                games[game_key] = (team_scores, set())
+            games[game_key][1].update(chat_ids)
+
+        # Only games still followed are kept, so finished games drop out
+        states = {game_key: previous_states[game_key] for game_key in followed_games.values() if game_key in previous_states}
+        states.update({
+            game_key: (team_scores.home_score, team_scores.away_score, team_scores.game_status)
+            for game_key, (team_scores, _) in games.items()
+        })
+        self._game_states[plugin_name] = states
+        self._followed_games[plugin_name] = followed_games
+
+        for game_key, (team_scores, chat_ids) in games.items():
+            previous_state = previous_states.get(game_key)
+            if previous_state is None or previous_state == states[game_key]:
+                continue
+            await self._fan_out(team_scores, chat_ids)
+
+    async def _fan_out(self, team_scores: MatchScores, chat_ids: Set[int]):
+        self.pushes += 1
+        chat_ids = sorted(chat_ids)
+        # The first send renders and uploads the sticker, the rest reuse its file_id
+        await self._send(chat_ids[0], team_scores)
+        await asyncio.gather(*(self._send(chat_id, team_scores) for chat_id in chat_ids[1:]))
+
+    async def _send(self, chat_id: int, team_scores: MatchScores):
+        try:
+            await self.send(self.bot, chat_id, team_scores)
+        except telegram.error.Forbidden:
+            # The bot was blocked or removed from the chat
+            logger.info(f"Chat {chat_id} is no longer reachable, removing its follows")
+            self.store.remove(chat_id)
+        except telegram.error.RetryAfter as e:
+            self.send_errors += 1
+            logger.warning(f"Rate limited by Telegram for {e.retry_after}s while pushing to chat {chat_id}")
+        except Exception as e:
+            self.send_errors += 1
+            logger.error(f"Failed to push score update to chat {chat_id}: {str(e)}")
+
+    def stats(self) -> Dict:
+        return {
+            "pollers": sorted(self._pollers),
+            "followed_games": sum(len(states) for states in self._game_states.values()),
+            "pushes": self.pushes,
+            "send_errors": self.send_errors,
+        }
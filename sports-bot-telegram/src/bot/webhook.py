@@ -0,0 +1,292 @@
+"""
+Webhook Server
+==============
+
+Minimal asyncio HTTP server that receives Telegram updates by webhook.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import signal
+from typing import Dict, Optional, Set
+
+from telegram import Bot, Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+SECRET_TOKEN_HEADER = "x-telegram-bot-api-secret-token"
+HEALTH_PATH = "/healthz"
+# Seconds stop() waits for closed connections to finish closing
+CLOSE_TIMEOUT = 5
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class WebhookStats:
+    def __init__(self):
+        self.received = 0
+        self.rejected = 0
+        self.invalid = 0
+
+    def as_dict(self):
+        return {
+            "received": self.received,
+            "rejected": self.rejected,
+            "invalid": self.invalid,
+        }
+
+
+class WebhookServer:
+    """
+    Accepts Telegram updates POSTed to ``url_path`` and puts them on ``update_queue``.
+
+    Requests must carry ``secret_token`` in the ``X-Telegram-Bot-Api-Secret-Token``
+    header when one is set. ``GET /healthz`` answers 200 while the server accepts
+    updates and 503 once it is draining, so a load balancer stops routing to it.
+    Connections are kept alive between requests, and closed when idle for
+    ``idle_timeout`` seconds.
+
+    ``stop`` drains gracefully: it stops accepting connections, turns away new
+    updates with 503 (Telegram retries them, possibly on another replica),
+    waits for in-flight requests and the update queue to finish and then closes
+    the connections still waiting for their next request.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        update_queue: asyncio.Queue,
+        listen: str = "0.0.0.0",
+        port: int = 8443,
+        url_path: str = "/telegram",
+        secret_token: Optional[str] = None,
+        max_body_size: int = 1024 * 1024,
+        idle_timeout: float = 60,
+    ):
+        self.bot = bot
+        self.update_queue = update_queue
+        self.listen = listen
+        self.port = port
+        self.url_path = "/" + url_path.lstrip("/")
+        self.secret_token = secret_token
+        self.max_body_size = max_body_size
+        self.idle_timeout = idle_timeout
+        self.draining = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # Writers of the connections waiting for their next request
+        self._idle_connections: Set[asyncio.StreamWriter] = set()
+        self._stats = WebhookStats()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.listen, self.port)
+        # Port 0 binds a free port; report the one actually in use
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Webhook server listening on {self.listen}:{self.port}{self.url_path}")
+
+    async def stop(self, drain_timeout: float = 10) -> None:
+        """Stop accepting updates and wait up to ``drain_timeout`` seconds for pending ones."""
+        self.draining = True
+        if self._server is not None:
+            self._server.close()
+
+        try:
+            await asyncio.wait_for(self._drain(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Webhook drain timed out with {self._in_flight} requests in flight and {self.update_queue.qsize()} updates queued")
+
+        # Keep-alive connections would otherwise wait for a next request that
+        # never comes, and wait_closed() waits for every connection
+        for writer in list(self._idle_connections):
+            writer.close()
+
+        if self._server is not None:
+            try:
+                await asyncio.wait_for(self._server.wait_closed(), CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Webhook server timed out waiting for its connections to close")
+            self._server = None
+
+    async def _drain(self):
+        await self._idle.wait()
+        while not self.update_queue.empty():
+            await asyncio.sleep(0.05)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                self._idle_connections.add(writer)
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.idle_timeout)
+                finally:
+                    self._idle_connections.discard(writer)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                if body is None:
+                    self._write_response(writer, 413, b"", keep_alive=False)
+                    await writer.drain()
+                    break
+
+                self._in_flight += 1
+                self._idle.clear()
+                try:
+                    status, payload = await self._handle_request(method, path, headers, body)
+                finally:
+                    self._in_flight -= 1
+                    if not self._in_flight:
+                        self._idle.set()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and not self.draining
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except ValueError as e:
+            logger.debug(f"Malformed webhook request: {str(e)}")
+            self._write_response(writer, 400, b"", keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                # The client closed an idle keep-alive connection
+                return None
+            raise
+
+        lines = head.decode("latin-1").split("\r\n")
+        method, path, _ = lines[0].split(" ", 2)
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        content_length = int(headers.get("content-length", "0"))
+        if content_length > self.max_body_size:
+            # Not worth reading, the connection is closed after the 413
+            return method, path, headers, None
+        body = await reader.readexactly(content_length) if content_length else b""
+        return method, path.split("?", 1)[0], headers, body
+
+    async def _handle_request(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        if path == HEALTH_PATH:
+            if self.draining:
+                return 503, b"draining"
+            return 200, b"ok"
+
+        if path != self.url_path:
+            return 404, b""
+        if method != "POST":
+            return 405, b""
+
+        if self.secret_token and not hmac.compare_digest(headers.get(SECRET_TOKEN_HEADER, ""), self.secret_token):
+            self._stats.rejected += 1
+            return 403, b""
+
+        if self.draining:
+            self._stats.rejected += 1
+            return 503, b""
+
+        try:
+            update = Update.de_json(json.loads(body), self.bot)
+        except Exception as e:
+            self._stats.invalid += 1
+            logger.warning(f"Could not parse webhook update: {str(e)}")
+            return 400, b""
+
+        self._stats.received += 1
+        await self.update_queue.put(update)
+        return 200, b""
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool):
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Content-Type: text/plain\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+
+    def stats(self) -> Dict:
+        return {**self._stats.as_dict(), "in_flight": self._in_flight, "queued": self.update_queue.qsize(), "draining": self.draining}
+
+
+async def run_webhook(
+    application: Application,
+    webhook_url: str,
+    listen: str = "0.0.0.0",
+    port: int = 8443,
+    url_path: str = "/telegram",
+    secret_token: Optional[str] = None,
+    drain_timeout: float = 10,
+) -> None:
+    """
+    Run ``application`` behind a ``WebhookServer`` until SIGINT or SIGTERM.
+
+    Mirrors ``Application.run_polling``'s lifecycle, including the ``post_init``
+    and ``post_shutdown`` hooks, and registers ``webhook_url`` plus the url path
+    with Telegram. On shutdown the server drains before the application stops.
+
+    Args:
+        application: The bot application
+        webhook_url: Public base URL Telegram reaches this server at (e.g. ``https://bot.example.com``)
+        listen: Address to bind
+        port: Port to bind
+        url_path: Path updates are POSTed to
+        secret_token: Token Telegram sends with every update; requests without it are rejected
+        drain_timeout: Seconds to wait for pending updates on shutdown
+    """
+    if not secret_token:
+        logger.warning("WEBHOOK_SECRET_TOKEN is not set, anyone who finds the webhook URL can send updates")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(stop_signal, stop_event.set)
+        except NotImplementedError:
+            pass
+
+    server = WebhookServer(application.bot, application.update_queue, listen, port, url_path, secret_token)
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+        await application.start()
+        await server.start()
+        await application.bot.set_webhook(
+            url=webhook_url.rstrip("/") + server.url_path,
+            secret_token=secret_token,
+            allowed_updates=Update.ALL_TYPES,
+        )
+        await stop_event.wait()
+        logger.info("Stop signal received, draining webhook server")
+    finally:
+        await server.stop(drain_timeout)
+        if application.running:
+            await application.stop()
+            if application.post_stop:
+                await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# The bot and the plugin interface, straight from the source tree
+sys.path.insert(0, os.path.join(PROJECT_DIR, "src"))
+sys.path.append(os.path.join(PROJECT_DIR, "..", "sports-bot-telegram-plugin", "src"))
+
+
+@pytest.fixture(autouse=True)
+def project_dir(monkeypatch):
+    # The bundled fonts and logos are looked up relative to the project directory
+    monkeypatch.chdir(PROJECT_DIR)
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+from telegram import BotCommand, Chat, Message, MessageEntity, Update
+from telegram.ext import CommandHandler, filters
+
+from sports_bot_telegram_plugin import SportsBotPlugin
+
+from bot.plugin_management import LazyPlugin
+
+MANIFEST = {
+    "plugin_name": "StubPlugin",
+    "name": "Stub",
+    "commands": [{"command": "stats", "description": "Player stats"}],
+}
+
+
+class StubPlugin(SportsBotPlugin):
+    def __init__(self):
+        super().__init__()
+        self.name = "Stub"
+        self.commands = [BotCommand("stats", "Player stats")]
+        self.calls = []
+
+    async def get_live_scores(self, team, game_date=None, extra_params=None, request_context=None):
+        return None
+
+    async def is_team_supported(self, team):
+        return False
+
+    async def stats(self, update, context):
+        self.calls.append(list(context.args))
+
+    def get_handlers(self):
+        # Only private chats, and exactly one argument
+        return [CommandHandler("stats", self.stats, filters=filters.ChatType.PRIVATE, has_args=1)]
+
+
+class StubEntryPoint:
+    name = "stub"
+    module = "stub_plugin"
+
+    def load(self):
+        return lambda: StubPlugin
+
+
+def command_update(text, chat_type=Chat.PRIVATE):
+    command_length = len(text.split()[0])
+    message = Message(
+        message_id=1,
+        date=None,
+        chat=Chat(id=1, type=chat_type),
+        text=text,
+        entities=[MessageEntity(MessageEntity.BOT_COMMAND, 0, command_length)],
+    )
+    message.set_bot(SimpleNamespace(username="sports_bot"))
+    return Update(update_id=1, message=message)
+
+
+def dispatch(plugin, text, chat_type=Chat.PRIVATE):
+    handler = plugin.get_handlers()[0]
+    context = SimpleNamespace(application=None, args=None)
+    asyncio.run(handler.callback(command_update(text, chat_type), context))
+    return plugin.load().calls
+
+
+def test_dispatch_passes_args_to_plugin_handler():
+    plugin = LazyPlugin(StubEntryPoint(), MANIFEST)
+    assert not plugin.is_loaded
+
+    assert dispatch(plugin, "/stats lebron") == [["lebron"]]
+    assert plugin.is_started
+
+
+def test_dispatch_applies_plugin_handler_filters():
+    plugin = LazyPlugin(StubEntryPoint(), MANIFEST)
+
+    assert dispatch(plugin, "/stats lebron", chat_type=Chat.GROUP) == []
+
+
+def test_dispatch_applies_plugin_handler_arg_checks():
+    plugin = LazyPlugin(StubEntryPoint(), MANIFEST)
+
+    assert dispatch(plugin, "/stats") == []
+    assert dispatch(plugin, "/stats lebron james") == []
+
+
+def test_sync_attribute_on_event_loop_is_logged(caplog):
+    plugin = LazyPlugin(StubEntryPoint(), MANIFEST)
+
+    async def main():
+        return plugin.calls
+
+    assert asyncio.run(main()) == []
+    assert "imported on the event loop" in caplog.text
@@ -0,0 +1,50 @@
+import asyncio
+
+from sports_bot_telegram_plugin import Metrics
+
+from bot.metrics_server import CONTENT_TYPE, MetricsServer
+
+
+async def request(port, method, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    # One request per connection, the server closes it after responding
+    response = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines)}
+    return int(status_line.split(" ")[1]), headers, body
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    metrics = Metrics()
+    scrapes = []
+    metrics.register_gauge("sports_bot_scrapes", "Times the gauge was read", lambda: scrapes.append(None) or len(scrapes))
+    with metrics.span("handler.scores"):
+        pass
+
+    async def main():
+        server = MetricsServer(listen="127.0.0.1", port=0, metrics=metrics)
+        await server.start()
+        try:
+            responses = [await request(server.port, "GET", "/metrics?name[]=x") for _ in range(2)]
+            not_found = await request(server.port, "GET", "/")
+            not_allowed = await request(server.port, "POST", "/metrics")
+        finally:
+            await server.stop()
+        return responses, not_found, not_allowed
+
+    responses, not_found, not_allowed = asyncio.run(main())
+    for scrape, (status, headers, body) in enumerate(responses, 1):
+        assert status == 200
+        assert headers["content-type"] == CONTENT_TYPE
+        assert int(headers["content-length"]) == len(body)
+        text = body.decode("utf-8")
+        assert text.startswith("# HELP sports_bot_span_seconds Duration of instrumented stages\n")
+        assert 'sports_bot_span_seconds_count{span="handler.scores"} 1\n' in text
+        # Gauges are read on every scrape
+        assert f"sports_bot_scrapes {scrape}\n" in text
+    assert not_found[0] == 404 and not_found[2] == b""
+    assert not_allowed[0] == 405
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from bot.plugin_management.probing import PluginProber
+
+
+class StubPlugin:
+    """Answers ``supported`` after ``delay`` seconds and records whether its check was cancelled."""
+
+    def __init__(self, name, supported, delay=0.0):
+        self.name = name
+        self.supported = supported
+        self.delay = delay
+        self.finished = False
+        self.cancelled = False
+
+    def get_plugin_name(self):
+        return self.name
+
+    async def is_team_supported(self, team):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.finished = True
+        if isinstance(self.supported, Exception):
+            raise self.supported
+        return self.supported
+
+
+def find_first(prober, plugins):
+    async def main():
+        found = await prober.find_first("team", plugins, lambda plugin: plugin.is_team_supported("Lakers"))
+        # Let the cancelled checks unwind
+        await asyncio.sleep(0)
+        return found
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("mode", ["sequential", "parallel"])
+def test_priority_order_wins_over_fastest_answer(mode):
+    high = StubPlugin("High", True, delay=0.05)
+    low = StubPlugin("Low", True)
+
+    assert find_first(PluginProber(mode=mode), [high, low]) is high
+
+
+def test_parallel_falls_through_to_lower_priority():
+    high = StubPlugin("High", False, delay=0.02)
+    low = StubPlugin("Low", True)
+
+    assert find_first(PluginProber(mode="parallel"), [high, low]) is low
+
+
+def test_parallel_cancels_remaining_probes():
+    high = StubPlugin("High", True)
+    low = StubPlugin("Low", True, delay=10)
+    prober = PluginProber(mode="parallel")
+
+    assert find_first(prober, [high, low]) is high
+    assert low.cancelled and not low.finished
+    assert prober.stats()["team"]["Low"]["cancelled"] == 1
+    assert prober.stats()["team"]["High"]["matches"] == 1
+
+
+def test_parallel_timeout_counts_as_unsupported():
+    slow = StubPlugin("Slow", True, delay=10)
+    fallback = StubPlugin("Fallback", True)
+    prober = PluginProber(mode="parallel", timeout=0.05)
+
+    assert find_first(prober, [slow, fallback]) is fallback
+    assert slow.cancelled
+    assert prober.stats()["team"]["Slow"]["timeouts"] == 1
+    assert prober.stats()["team"]["Slow"]["matches"] == 0
+
+
+def test_parallel_error_counts_as_unsupported():
+    broken = StubPlugin("Broken", RuntimeError("upstream down"))
+    prober = PluginProber(mode="parallel")
+
+    assert find_first(prober, [broken]) is None
+    assert prober.stats()["team"]["Broken"]["errors"] == 1
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        PluginProber(mode="random")
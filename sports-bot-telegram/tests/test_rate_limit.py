@@ -0,0 +1,154 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from telegram.error import RetryAfter
+
+from bot import rate_limit
+from bot.rate_limit import PRIORITY_INTERACTIVE, PRIORITY_PUSH, TelegramRateLimiter, TokenBucket, is_message_endpoint
+
+
+class FakeBot:
+    """Stands in for the Bot API: records when each request went out, optionally failing the first ones."""
+
+    def __init__(self, failures=()):
+        self.calls = []
+        self.failures = list(failures)
+
+    def request(self, limiter, endpoint, chat_id=None, priority=None, name=None):
+        async def callback(*args, **kwargs):
+            self.calls.append((name or endpoint, time.monotonic()))
+            if self.failures:
+                raise self.failures.pop(0)
+            return name or endpoint
+        data = {"chat_id": chat_id} if chat_id is not None else {}
+        return limiter.process_request(callback, (), {}, endpoint, data, priority)
+
+
+def test_token_bucket(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert not bucket.is_idle()
+    now[0] += 1.5
+    # 3 tokens refilled, one still owed
+    assert bucket.reserve() == 0.0
+    now[0] += 10
+    # Refilling stops at capacity
+    assert bucket.is_idle()
+    assert bucket.tokens == 2
+
+
+def test_message_endpoints():
+    for endpoint in ("sendMessage", "sendSticker", "copyMessage", "forwardMessage"):
+        assert is_message_endpoint(endpoint)
+    for endpoint in ("deleteMessage", "editMessageText", "getChat", "answerCallbackQuery", "sendChatAction"):
+        assert not is_message_endpoint(endpoint)
+
+
+def test_only_messages_draw_chat_tokens():
+    async def main():
+        limiter = TelegramRateLimiter(chat_rate=1, group_rate=1)
+        await limiter.initialize()
+        bot = FakeBot()
+        start = time.monotonic()
+        # Three chooser clicks in a group: delete the chooser, send the sticker
+        for _ in range(3):
+            await bot.request(limiter, "deleteMessage", chat_id=-100)
+            await bot.request(limiter, "sendSticker", chat_id=-100)
+        elapsed = time.monotonic() - start
+        await limiter.shutdown()
+        return elapsed
+
+    # The group bucket holds 3 tokens, exactly the 3 stickers
+    assert asyncio.run(main()) < 0.5
+
+
+def test_messages_to_a_chat_are_paced():
+    async def main():
+        limiter = TelegramRateLimiter(chat_rate=10)
+        await limiter.initialize()
+        bot = FakeBot()
+        await asyncio.gather(*(bot.request(limiter, "sendMessage", chat_id=42) for _ in range(3)), bot.request(limiter, "sendMessage", chat_id=43))
+        await limiter.shutdown()
+        return bot.calls
+
+    calls = asyncio.run(main())
+    times = [sent_at for _, sent_at in calls]
+    # The other chat isn't held up, the three messages to chat 42 go out 0.1s apart
+    assert max(times) - min(times) >= 0.18
+    assert sorted(times)[1] - min(times) < 0.05
+
+
+def test_interactive_requests_go_ahead_of_push():
+    async def main():
+        limiter = TelegramRateLimiter(global_rate=10)
+        await limiter.initialize()
+        # Empty the global bucket so requests have to queue
+        limiter.chat_limiter.global_bucket.tokens = 0
+        bot = FakeBot()
+        await asyncio.gather(
+            bot.request(limiter, "getMe", priority=PRIORITY_PUSH, name="push 1"),
+            bot.request(limiter, "getMe", priority=PRIORITY_PUSH, name="push 2"),
+            bot.request(limiter, "getMe", priority=PRIORITY_INTERACTIVE, name="interactive"),
+        )
+        stats = limiter.stats()
+        await limiter.shutdown()
+        return [name for name, _ in bot.calls], stats
+
+    order, stats = asyncio.run(main())
+    assert order == ["interactive", "push 1", "push 2"]
+    assert stats["lanes"]["interactive"]["sent"] == 1
+    assert stats["lanes"]["push"]["sent"] == 2
+    assert stats["queued"] == 0
+
+
+def test_retry_after_pauses_and_retries():
+    async def main():
+        limiter = TelegramRateLimiter(chat_rate=100)
+        await limiter.initialize()
+        bot = FakeBot(failures=[RetryAfter(timedelta(seconds=0.2))])
+        result = await bot.request(limiter, "sendMessage", chat_id=42)
+        stats = limiter.stats()
+        await limiter.shutdown()
+        return result, bot.calls, stats
+
+    result, calls, stats = asyncio.run(main())
+    assert result == "sendMessage"
+    assert len(calls) == 2
+    assert calls[1][1] - calls[0][1] >= 0.2
+    assert stats["retry_after"] == 1
+    assert stats["lanes"]["interactive"]["retries"] == 1
+
+
+def test_retry_after_is_raised_once_retries_run_out():
+    async def main():
+        limiter = TelegramRateLimiter(chat_rate=100, max_retries=1)
+        await limiter.initialize()
+        bot = FakeBot(failures=[RetryAfter(timedelta(seconds=0.01))] * 2)
+        try:
+            with pytest.raises(RetryAfter):
+                await bot.request(limiter, "sendMessage", chat_id=42)
+        finally:
+            await limiter.shutdown()
+        return bot.calls
+
+    assert len(asyncio.run(main())) == 2
+
+
+def test_shutdown_releases_queued_requests():
+    async def main():
+        limiter = TelegramRateLimiter(global_rate=10)
+        await limiter.initialize()
+        # The next token is 10s away
+        limiter.chat_limiter.global_bucket.tokens = -100
+        bot = FakeBot()
+        requests = [asyncio.create_task(bot.request(limiter, "getMe", name=str(index))) for index in range(2)]
+        await asyncio.sleep(0.05)
+        assert not bot.calls
+        await limiter.shutdown()
+        return await asyncio.wait_for(asyncio.gather(*requests), 1)
+
+    assert asyncio.run(main()) == ["0", "1"]
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+from PIL import ImageChops
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+from bot.image_generator import ScoreCardCompositor
+
+LIVE = MatchScores(
+    home_team="Lakers",
+    home_score=102,
+    home_team_record="30-12",
+    away_team="Celtics",
+    away_score=99,
+    away_team_record="33-9",
+    game_status="4th Qtr",
+    game_start_time="19:30 ET",
+    game_curr_time="02:31",
+)
+PRE_GAME = MatchScores(
+    home_team="Heat",
+    home_score=None,
+    home_team_record="20-20",
+    away_team="Knicks",
+    away_score=None,
+    away_team_record="",
+    game_status="7:30 pm ET",
+    game_start_time="19:30 ET",
+    game_curr_time="",
+)
+LONG_NAMES = MatchScores(
+    home_team="Portland Trail Blazers",
+    home_score=7,
+    home_team_record="10-31",
+    away_team="Minnesota Timberwolves",
+    away_score=0,
+    away_team_record="28-14",
+    game_status="1st Qtr",
+    game_start_time="20:00 ET",
+    game_curr_time="10:04",
+)
+
+
+@pytest.fixture
+def render_score_img():
+    # Loads its font from the project directory when imported
+    from score_card_reference import render_score_img
+    return render_score_img
+
+
+def assert_same_image(actual, expected):
+    assert actual.size == expected.size
+    assert actual.mode == expected.mode
+    assert ImageChops.difference(actual, expected).getbbox() is None
+
+
+@pytest.mark.parametrize("team_scores", [LIVE, PRE_GAME, LONG_NAMES], ids=["live", "pre_game", "long_names"])
+def test_compositor_matches_reference_renderer(team_scores, render_score_img):
+    assert_same_image(ScoreCardCompositor().render(team_scores), render_score_img(team_scores))
+
+
+def test_compositor_matches_reference_renderer_on_cached_background(render_score_img):
+    compositor = ScoreCardCompositor()
+    compositor.render(PRE_GAME)
+    # Same matchup once the game is on, drawn over the cached background
+    live = MatchScores(**{**PRE_GAME.__dict__, "home_score": 12, "away_score": 9, "game_status": "1st Qtr", "game_curr_time": "05:12"})
+
+    assert_same_image(compositor.render(live), render_score_img(live))
+    assert compositor.stats()["hits"] == 1
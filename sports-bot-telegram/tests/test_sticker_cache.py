@@ -0,0 +1,119 @@
+import asyncio
+import dataclasses
+import os
+
+from sports_bot_telegram_plugin import MemoryCacheBackend
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+
+from bot.sticker_cache import StickerCache
+
+SCORES = MatchScores(
+    home_team="Lakers",
+    home_score=102,
+    home_team_record="30-12",
+    away_team="Celtics",
+    away_score=99,
+    away_team_record="33-9",
+    game_status="4th Qtr",
+    game_start_time="19:30 ET",
+    game_curr_time="02:31",
+)
+
+
+class Renderer:
+    def __init__(self):
+        self.renders = 0
+
+    async def __call__(self):
+        self.renders += 1
+        await asyncio.sleep(0.01)
+        return f"webp {self.renders}".encode()
+
+
+def test_key_covers_only_rendered_fields():
+    key = StickerCache.key_for(SCORES)
+    assert StickerCache.key_for(dataclasses.replace(SCORES)) == key
+    # Not drawn on the card
+    assert StickerCache.key_for(dataclasses.replace(SCORES, game_start_time="20:00 ET")) == key
+    for changed in (dict(home_score=104), dict(game_status="Final"), dict(game_curr_time="02:30"), dict(away_team_logo_url="https://example.com/bos.png")):
+        assert StickerCache.key_for(dataclasses.replace(SCORES, **changed)) != key
+
+
+def test_miss_renders_once_then_hits():
+    cache = StickerCache()
+    render = Renderer()
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_render("key", render) for _ in range(3)))
+        return results + [await cache.get_or_render("key", render)]
+
+    assert asyncio.run(main()) == [b"webp 1"] * 4
+    assert render.renders == 1
+    stats = cache.stats()
+    assert stats["misses"] == 3
+    assert stats["hits"] == 1
+    assert stats["deduplicated_renders"] == 2
+    assert stats["entries"] == 1
+
+
+def test_file_ids_are_reused_and_shared():
+    backend = MemoryCacheBackend()
+    replica_a = StickerCache(shared_backend=backend)
+    replica_b = StickerCache(shared_backend=backend)
+
+    async def main():
+        assert replica_a.get_file_id("key") is None
+        await replica_a.publish_file_id("key", "file-1")
+        assert replica_a.get_file_id("key") == "file-1"
+        # Replica B picks up the file id A uploaded, and keeps it locally
+        assert replica_b.get_file_id("key") is None
+        assert await replica_b.get_shared_file_id("key") == "file-1"
+        assert replica_b.get_file_id("key") == "file-1"
+        # A file id Telegram no longer accepts is dropped
+        replica_a.forget_file_id("key")
+        assert replica_a.get_file_id("key") is None
+
+    asyncio.run(main())
+    assert replica_a.stats()["file_id_hits"] == 1
+    assert replica_b.stats()["file_id_hits"] == 1
+    assert replica_b.stats()["shared_file_id_hits"] == 1
+
+
+def test_evicted_stickers_spill_to_disk_and_come_back(tmp_path):
+    cache = StickerCache(max_entries=1, spill_dir=str(tmp_path))
+
+    async def main():
+        cache.put("a", b"payload a")
+        cache.put("b", b"payload b")
+        # Evicted, and readable while its file is being written
+        assert await cache.get("a") == b"payload a"
+        await cache.wait_spilled()
+        assert sorted(os.listdir(tmp_path)) == ["a.webp", "b.webp"]
+
+        cache.clear()
+        assert await cache.get("b") == b"payload b"
+        assert await cache.get("missing") is None
+
+    asyncio.run(main())
+    assert (tmp_path / "a.webp").read_bytes() == b"payload a"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_spill_dir_is_pruned_periodically(tmp_path):
+    cache = StickerCache(max_entries=1, spill_dir=str(tmp_path), max_spill_entries=2, spill_prune_interval=4)
+
+    async def main():
+        cache.put("0", b"payload")
+        for index in range(1, 5):
+            # Evicts the previous sticker
+            cache.put(str(index), b"payload")
+            await cache.wait_spilled()
+            if index < 4:
+                # Not pruned until the fourth spill
+                assert len(os.listdir(tmp_path)) == index
+                os.utime(tmp_path / f"{index - 1}.webp", (index, index))
+
+    asyncio.run(main())
+    # The oldest go first
+    assert sorted(os.listdir(tmp_path)) == ["2.webp", "3.webp"]
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+from telegram.error import Forbidden
+
+from sports_bot_telegram_plugin.types.MatchScores import MatchScores
+
+from bot.subscriptions import FollowManager, SubscriptionStore
+
+PLUGIN_NAME = "NbaPlugin"
+
+
+def game(home_score, away_score, status="3rd Qtr", home_team="Lakers", away_team="Celtics"):
+    return MatchScores(
+        home_team=home_team,
+        home_score=home_score,
+        home_team_record="",
+        away_team=away_team,
+        away_score=away_score,
+        away_team_record="",
+        game_status=status,
+        game_start_time="19:30 ET",
+        game_curr_time="",
+    )
+
+
+class StubPlugin:
+    """Answers ``get_live_scores`` from ``games``, keyed by team id (or name); exceptions there are raised."""
+
+    def __init__(self):
+        self.games = {}
+
+    def get_plugin_name(self):
+        return PLUGIN_NAME
+
+    async def get_live_scores(self, team, request_context=None):
+        scores = self.games.get(request_context.team_id if request_context else team)
+        if isinstance(scores, Exception):
+            raise scores
+        return scores
+
+
+class StubSend:
+    def __init__(self):
+        self.sent = []
+        self.errors = {}
+
+    async def __call__(self, bot, chat_id, team_scores):
+        if chat_id in self.errors:
+            raise self.errors[chat_id]
+        self.sent.append((chat_id, team_scores.home_score, team_scores.away_score, team_scores.game_status))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SubscriptionStore(str(tmp_path / "subscriptions.json"))
+
+
+def poll(manager, plugin):
+    asyncio.run(manager._poll(plugin, manager.store.get_followed_teams(PLUGIN_NAME)))
+
+
+def test_follows_are_persisted_and_deduplicated(store, tmp_path):
+    assert store.add(1, PLUGIN_NAME, "lakers", team_id=1610612747)
+    assert not store.add(1, PLUGIN_NAME, "LAL", team_id=1610612747)
+    assert store.add(1, PLUGIN_NAME, "Celtics")
+    reloaded = SubscriptionStore(str(tmp_path / "subscriptions.json"))
+    assert [follow["team"] for follow in reloaded.get(1)] == ["lakers", "Celtics"]
+
+
+def test_unfollow_by_another_alias_of_a_routed_team(store):
+    store.add(1, PLUGIN_NAME, "lakers", team_id=1610612747)
+    store.add(1, PLUGIN_NAME, "Celtics")
+    # /unfollow LAL routes to the same team id
+    removed = store.remove(1, "LAL", PLUGIN_NAME, 1610612747)
+    assert [follow["team"] for follow in removed] == ["lakers"]
+    # Without a route, the name has to match
+    assert store.remove(1, "Boston") == []
+    assert [follow["team"] for follow in store.remove(1, " celtics ")] == ["Celtics"]
+    assert store.get(1) == []
+
+
+def test_changes_are_pushed_to_every_chat_following_the_game(store):
+    plugin, send = StubPlugin(), StubSend()
+    manager = FollowManager(store, send)
+    # Two chats follow opposite sides of the same game
+    store.add(2, PLUGIN_NAME, "Lakers", team_id=1)
+    store.add(1, PLUGIN_NAME, "Celtics", team_id=2)
+    store.add(3, PLUGIN_NAME, "Heat", team_id=3)
+    plugin.games = {1: game(50, 48), 2: game(50, 48), 3: game(10, 12, home_team="Heat", away_team="Knicks")}
+
+    # The first sighting only records the games
+    poll(manager, plugin)
+    assert send.sent == []
+    assert manager.stats()["followed_games"] == 2
+
+    poll(manager, plugin)
+    assert send.sent == []
+
+    plugin.games[1] = plugin.games[2] = game(52, 48)
+    poll(manager, plugin)
+    # Sent to the lowest chat id first, then fanned out
+    assert send.sent == [(1, 52, 48, "3rd Qtr"), (2, 52, 48, "3rd Qtr")]
+    assert manager.pushes == 1
+
+    plugin.games[1] = plugin.games[2] = game(52, 48, status="Final")
+    poll(manager, plugin)
+    assert send.sent[2:] == [(1, 52, 48, "Final"), (2, 52, 48, "Final")]
+
+
+def test_failed_fetch_keeps_the_game_state(store):
+    plugin, send = StubPlugin(), StubSend()
+    manager = FollowManager(store, send)
+    store.add(1, PLUGIN_NAME, "Lakers", team_id=1)
+    plugin.games = {1: game(50, 48)}
+    poll(manager, plugin)
+
+    plugin.games = {1: ConnectionError("upstream is down")}
+    poll(manager, plugin)
+    assert manager.stats()["followed_games"] == 1
+
+    plugin.games = {1: game(55, 48)}
+    poll(manager, plugin)
+    # Not taken for a first sighting
+    assert send.sent == [(1, 55, 48, "3rd Qtr")]
+
+
+def test_unreachable_chat_loses_its_follows(store):
+    plugin, send = StubPlugin(), StubSend()
+    manager = FollowManager(store, send)
+    store.add(1, PLUGIN_NAME, "Lakers", team_id=1)
+    store.add(1, PLUGIN_NAME, "Heat", team_id=3)
+    store.add(2, PLUGIN_NAME, "Lakers", team_id=1)
+    plugin.games = {1: game(50, 48), 3: game(10, 12, home_team="Heat", away_team="Knicks")}
+    poll(manager, plugin)
+
+    send.errors[1] = Forbidden("Forbidden: bot was blocked by the user")
+    send.errors[2] = RuntimeError("network")
+    plugin.games[1] = game(52, 48)
+    poll(manager, plugin)
+    assert store.get(1) == []
+    # Other errors are counted and the follows kept
+    assert len(store.get(2)) == 1
+    assert manager.send_errors == 1
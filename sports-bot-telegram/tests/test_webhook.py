@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from telegram import Bot
+
+from bot.webhook import WebhookServer
+
+URL_PATH = "/telegram"
+
+
+async def start_server(**kwargs):
+    server = WebhookServer(Bot("123456:test"), asyncio.Queue(), listen="127.0.0.1", port=0, url_path=URL_PATH, **kwargs)
+    await server.start()
+    return server
+
+
+async def get_health(reader, writer):
+    writer.write(b"GET /healthz HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    await reader.readexactly(length)
+    return head
+
+
+def test_stop_closes_idle_keep_alive_connections():
+    async def main():
+        server = await start_server()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        head = await get_health(reader, writer)
+        assert head.startswith(b"HTTP/1.1 200")
+        assert b"Connection: keep-alive" in head
+
+        # The connection now sits idle waiting for its next request
+        start = time.perf_counter()
+        await asyncio.wait_for(server.stop(drain_timeout=1), 3)
+        assert time.perf_counter() - start < 2
+        # The server closed it
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+        writer.close()
+
+    asyncio.run(main())
+
+
+def test_idle_connection_times_out():
+    async def main():
+        server = await start_server(idle_timeout=0.1)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        # A partial request head never completes
+        writer.write(b"GET /healthz HTTP/1.1\r\n")
+        await writer.drain()
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+        writer.close()
+        await server.stop(drain_timeout=1)
+
+    asyncio.run(main())